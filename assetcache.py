@@ -0,0 +1,280 @@
+import os, json, time, hashlib, threading
+import pygame
+from atlas import TextureAtlas
+
+# ---------------- ASSET CACHE ----------------
+class AssetCache:
+    # On-disk cache of decoded, scaled and tinted sprites. Each entry is one raw RGBA
+    # sprite sheet (frames stacked vertically) plus a manifest record with the source
+    # files' size/mtime and content hash. A warm start reads the raw bytes back in one
+    # go and skips PNG decoding and smoothscale; only entries whose sources changed
+    # are rebuilt. Sound effects are kept the same way as raw PCM in the mixer's
+    # format, so a warm start skips MP3/WAV decoding too.
+    VERSION = 1
+
+    def __init__(self, cache_dir=".asset_cache"):
+        self.dir = cache_dir
+        self.manifest_path = os.path.join(cache_dir, "manifest.json")
+        self.entries = {}
+        self.changed = False
+        self.hits = 0
+        self.misses = 0
+        self.sounds = {}  # key -> (load ms, cache hit, PCM bytes) for this launch
+        try:
+            with open(self.manifest_path) as f:
+                data = json.load(f)
+            if data.get("version") == self.VERSION:
+                self.entries = data["entries"]
+        except (OSError, ValueError, KeyError):
+            pass
+
+    def source_state(self, paths):
+        # Cheap freshness check; raises OSError when a source is missing
+        return [[os.path.getsize(p), os.path.getmtime(p)] for p in paths]
+
+    def source_hash(self, paths, key):
+        h = hashlib.sha1(key.encode())
+        for p in paths:
+            with open(p, "rb") as f:
+                h.update(f.read())
+        return h.hexdigest()
+
+    def folder_sources(self, key, folder, ext=".png"):
+        # Cached directory listing, rescanned only when the folder's mtime moves
+        entry = self.entries.get(key)
+        try:
+            mtime = os.path.getmtime(folder)
+        except OSError:
+            return []
+        if entry and entry.get("folder_mtime") == mtime:
+            return entry["sources"]
+        return [os.path.join(folder, fn) for fn in sorted(os.listdir(folder)) if fn.lower().endswith(ext)]
+
+    def lookup(self, key, paths):
+        entry = self.entries.get(key)
+        if entry is None or entry["sources"] != paths:
+            return None
+        try:
+            state = self.source_state(paths)
+        except OSError:
+            return None
+        if entry["state"] != state:
+            # Touched but maybe not edited (e.g. a fresh checkout): fall back to the content hash
+            if entry["hash"] != self.source_hash(paths, key):
+                return None
+            entry["state"] = state
+            self.changed = True
+        return entry
+
+    def read_sheet(self, entry, convert=True):
+        with open(os.path.join(self.dir, entry["file"]), "rb") as f:
+            data = f.read()
+        sheet = pygame.image.frombytes(data, tuple(entry["size"]), "RGBA")
+        if convert and pygame.display.get_surface():
+            sheet = sheet.convert_alpha()
+        if len(entry["frames"]) == 1:
+            return [sheet]
+        return [sheet.subsurface(r) for r in entry["frames"]]
+
+    def write_sheet(self, key, paths, frames, folder=None):
+        w = max(f.get_width() for f in frames)
+        h = sum(f.get_height() for f in frames)
+        sheet = pygame.Surface((w, h), pygame.SRCALPHA)
+        rects = []
+        y = 0
+        for f in frames:
+            sheet.blit(f, (0, y))
+            rects.append([0, y, f.get_width(), f.get_height()])
+            y += f.get_height()
+        entry = self.write_entry(key, paths, ".rgba", pygame.image.tobytes(sheet, "RGBA"), size=[w, h], frames=rects)
+        if folder is not None:
+            entry["folder_mtime"] = os.path.getmtime(folder)
+
+    def write_entry(self, key, paths, ext, data, **fields):
+        name = hashlib.sha1(key.encode()).hexdigest()[:16] + ext
+        os.makedirs(self.dir, exist_ok=True)
+        with open(os.path.join(self.dir, name), "wb") as f:
+            f.write(data)
+        entry = self.entries[key] = {"file": name, "sources": paths, "state": self.source_state(paths),
+                                     "hash": self.source_hash(paths, key), **fields}
+        self.changed = True
+        return entry
+
+    def load(self, key, paths, build, folder=None, convert=True):
+        # Frames for key from the cache, or build() them and store the result
+        entry = self.lookup(key, paths)
+        if entry is not None:
+            try:
+                frames = self.read_sheet(entry, convert)
+                self.hits += 1
+                return frames
+            except (OSError, ValueError, pygame.error):
+                pass
+        self.misses += 1
+        frames = build()
+        if frames:
+            try:
+                self.write_sheet(key, paths, frames, folder)
+            except (OSError, pygame.error):
+                pass
+        return frames
+
+    def load_atlas(self, key, paths, build, convert=True):
+        # TextureAtlas for key: one raw sheet read plus its stored layout, or build()
+        # it from the individual files and store it
+        entry = self.lookup(key, paths)
+        if entry is not None:
+            try:
+                with open(os.path.join(self.dir, entry["file"]), "rb") as f:
+                    sheet = pygame.image.frombytes(f.read(), tuple(entry["size"]), "RGBA")
+                self.hits += 1
+                atlas = TextureAtlas.from_layout(sheet, entry["layout"])
+                return atlas.convert() if convert else atlas
+            except (OSError, ValueError, KeyError, pygame.error):
+                pass
+        self.misses += 1
+        atlas = build()
+        try:
+            self.write_entry(key, paths, ".rgba", pygame.image.tobytes(atlas.sheet, "RGBA"),
+                             size=list(atlas.sheet.get_size()), layout=atlas.layout())
+        except (OSError, pygame.error):
+            pass
+        return atlas.convert() if convert else atlas
+
+    def load_sound(self, path):
+        # pygame.mixer.Sound for path: from cached PCM via Sound(buffer=...) when the
+        # source and mixer format match, else decoded from the file and stored.
+        # Raises like Sound(path) does when the file is missing or unreadable.
+        fmt = pygame.mixer.get_init()
+        key = f"sound:{path}:{fmt}"
+        t0 = time.perf_counter()
+        entry = self.lookup(key, [path])
+        if entry is not None:
+            try:
+                with open(os.path.join(self.dir, entry["file"]), "rb") as f:
+                    sound = pygame.mixer.Sound(buffer=f.read())
+                self.hits += 1
+                self.sounds[key] = ((time.perf_counter() - t0) * 1000.0, True, entry["bytes"])
+                return sound
+            except (OSError, pygame.error):
+                pass
+        self.misses += 1
+        sound = pygame.mixer.Sound(path)
+        raw = sound.get_raw()
+        decode_ms = (time.perf_counter() - t0) * 1000.0
+        try:
+            self.write_entry(key, [path], ".pcm", raw, bytes=len(raw), decode_ms=decode_ms)
+        except OSError:
+            pass
+        self.sounds[key] = (decode_ms, False, len(raw))
+        return sound
+
+    def sound_report(self):
+        lines = [f"{'sound':<48} {'load ms':>7} {'decode ms':>9} {'PCM KiB':>8}  source"]
+        saved = 0.0
+        for key, (ms, hit, size) in self.sounds.items():
+            decode_ms = self.entries.get(key, {}).get("decode_ms", ms)
+            if hit: saved += decode_ms - ms
+            lines.append(f"{key.split(':')[1][:48]:<48} {ms:>7.1f} {decode_ms:>9.1f} {size / 1024:>8.0f}  {'cache' if hit else 'decoded'}")
+        total = sum(size for _, _, size in self.sounds.values())
+        lines.append(f"{'total':<48} {sum(ms for ms, _, _ in self.sounds.values()):>7.1f} {'':>9} {total / 1024:>8.0f}  "
+                     f"decode time saved {saved:.1f} ms")
+        return "\n".join(lines)
+
+    def save(self):
+        if not self.changed: return
+        try:
+            os.makedirs(self.dir, exist_ok=True)
+            with open(self.manifest_path, "w") as f:
+                json.dump({"version": self.VERSION, "entries": self.entries}, f)
+            self.changed = False
+        except OSError:
+            pass
+
+# ---------------- ASSET MANAGER ----------------
+def convert_alpha_all(value):
+    # Display-format conversion for a Surface or list of Surfaces (main thread only)
+    if not pygame.display.get_surface(): return value
+    if isinstance(value, list): return [convert_alpha_all(v) for v in value]
+    if isinstance(value, pygame.Surface): return value.convert_alpha()
+    return value
+
+class AssetManager:
+    # Named assets. Eager ones load on add(); lazy ones are queued and loaded on a
+    # worker thread by start() while the menu runs. Their post() step (display
+    # conversion, starting music) runs on the main thread in poll()/wait(), and
+    # reading a lazy asset before it is ready blocks until the worker is done.
+    def __init__(self):
+        self.values = {}
+        self.timings = {}  # name -> (ms, "main" or "worker")
+        self.pending = []
+        self.eager = set()
+        self.posts = []
+        self.thread = None
+        self.done = threading.Event()
+        self.finished = False
+        self.ready_at = None
+
+    def add(self, name, loader, lazy=False, post=None):
+        if lazy:
+            self.pending.append((name, loader, post))
+        else:
+            self.run(name, loader, "main")
+            if post: self.values[name] = post(self.values[name])
+            self.eager.add(name)
+
+    def run(self, name, loader, where):
+        t0 = time.perf_counter()
+        self.values[name] = loader()
+        self.timings[name] = ((time.perf_counter() - t0) * 1000.0, where)
+
+    def start(self):
+        if self.thread or not self.pending: return
+        self.thread = threading.Thread(target=self.work, args=("worker",), name="asset-loader", daemon=True)
+        self.thread.start()
+
+    def work(self, where):
+        for name, loader, post in self.pending:
+            self.run(name, loader, where)
+            if post: self.posts.append((name, post))
+        self.done.set()
+
+    def poll(self):
+        # True once every lazy asset is loaded and finalized
+        if self.finished: return True
+        if self.pending and not self.done.is_set(): return False
+        self.finish()
+        return True
+
+    def wait(self):
+        if self.finished: return
+        if self.thread is None and not self.done.is_set():
+            self.work("main")  # nobody started the worker (e.g. headless runs)
+        self.done.wait()
+        self.finish()
+
+    def finish(self):
+        for name, post in self.posts:
+            self.values[name] = post(self.values[name])
+        self.posts = []
+        self.finished = True
+        self.ready_at = time.perf_counter()
+
+    def publish(self, name, value):
+        # Make a value derived from another asset (e.g. an atlas member) readable by name
+        self.values[name] = value
+        self.eager.add(name)
+
+    def __getitem__(self, name):
+        if not self.finished and name not in self.eager:
+            self.wait()
+        return self.values[name]
+
+    def report(self):
+        lines = [f"{'asset':<22} {'ms':>8}  thread"]
+        for name, (ms, where) in sorted(self.timings.items(), key=lambda kv: -kv[1][0]):
+            lines.append(f"{name:<22} {ms:>8.1f}  {where}")
+        total_main = sum(ms for ms, where in self.timings.values() if where == "main")
+        total_worker = sum(ms for ms, where in self.timings.values() if where == "worker")
+        lines.append(f"{'total':<22} {total_main:>8.1f}  main, {total_worker:.1f} worker")
+        return "\n".join(lines)
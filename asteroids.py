@@ -0,0 +1,240 @@
+import math, random
+import numpy as np
+import pygame
+
+# ---------------- ASTEROID SPRITES ----------------
+def slice_sheet(sheet, cols, rows, threshold=40, min_size=8):
+    # The asteroid sheet is a cols x rows grid of rocks on a flat background, and a
+    # JPEG (no alpha, noisy edges): each cell has the pixels near the corner colour
+    # made transparent and is trimmed to its largest blob. Empty cells are dropped.
+    bg = sheet.get_at((0, 0))
+    cw, ch = sheet.get_width() // cols, sheet.get_height() // rows
+    rocks = []
+    for i in range(cols * rows):
+        cell = sheet.subsurface(((i % cols) * cw, (i // cols) * ch, cw, ch))
+        mask = pygame.mask.from_threshold(cell, bg, (threshold, threshold, threshold, 255))
+        mask.invert()
+        boxes = mask.get_bounding_rects()
+        if not boxes: continue
+        box = max(boxes, key=lambda r: r.width * r.height)
+        if min(box.size) < min_size: continue
+        rock = pygame.Surface(box.size, pygame.SRCALPHA)
+        rock.blit(cell, (0, 0), box)
+        alpha = mask.to_surface(setcolor=(255, 255, 255, 255), unsetcolor=(255, 255, 255, 0))
+        rock.blit(alpha, (0, 0), box, special_flags=pygame.BLEND_RGBA_MULT)
+        rocks.append(rock)
+    return rocks
+
+def fallback_rocks(count, size=96, seed=7):
+    # Lumpy grey polygons for when the sheet is missing
+    rnd = random.Random(seed)
+    c = size / 2
+    rocks = []
+    for _ in range(count):
+        surf = pygame.Surface((size, size), pygame.SRCALPHA)
+        pts = [(c + math.cos(a) * r, c + math.sin(a) * r)
+               for a, r in ((2 * math.pi * i / 11, c * rnd.uniform(0.7, 0.98)) for i in range(11))]
+        shade = rnd.randint(90, 150)
+        pygame.draw.polygon(surf, (shade, shade - 10, shade - 25), pts)
+        pygame.draw.polygon(surf, (shade + 60, shade + 50, shade + 35), pts, 2)
+        rocks.append(surf)
+    return rocks
+
+def rotation_frames(image, diameter, count):
+    # image scaled so its longer side is diameter, then turned through count steps
+    # of a full revolution; built once so nothing is rotated while playing
+    w, h = image.get_size()
+    k = diameter / max(w, h)
+    base = pygame.transform.smoothscale(image, (max(1, round(w * k)), max(1, round(h * k))))
+    return [pygame.transform.rotozoom(base, -360.0 * i / count, 1.0) for i in range(count)]
+
+# ---------------- ASTEROID FIELD ----------------
+class AsteroidField:
+    # Movement and spin for the live asteroids, batched like EnemyManager: centres,
+    # velocities and angles sit in arrays (slot order = order added) and are advanced
+    # in one NumPy pass. The angle picks one of the precomputed rotation frames, whose
+    # sizes are kept in an array too, so the boxes of every asteroid come out of the
+    # arrays without touching the sprites (see boxes()/overlapping()).
+    #
+    # frames[size][variant] is the list of rotation frames for that sprite; every
+    # list has the same length. Asteroids are pooled, so the same object can be
+    # added again right after it was removed: add() drops the removed slots first,
+    # and hands out a new token each time so a caller holding an older reference
+    # can tell it is now a different rock.
+    def __init__(self, frames, bounds, margin=120, capacity=64):
+        self.frames = frames
+        self.bounds = bounds  # asteroids leaving this rect by more than margin are culled
+        self.margin = margin
+        self.sets = [s for per_size in frames for s in per_size]
+        self.set_index = {(size, v): k for k, (size, v) in
+                          enumerate((size, v) for size, per_size in enumerate(frames) for v in range(len(per_size)))}
+        self.angles = len(self.sets[0])
+        self.dims = np.array([[f.get_size() for f in s] for s in self.sets])  # set, frame -> (w, h)
+        self.asteroids = []
+        self.seq = 0
+        self.allocate(capacity)
+        self.clear()
+
+    ARRAYS = ("x", "y", "px", "py", "vx", "vy", "angle", "spin", "set", "frame")
+
+    def allocate(self, capacity):
+        old = len(self.asteroids)
+        for name in self.ARRAYS:
+            arr = np.zeros(capacity, dtype=np.intp if name in ("set", "frame") else float)
+            if old: arr[:old] = getattr(self, name)[:old]
+            setattr(self, name, arr)
+        self.capacity = capacity
+
+    def clear(self):
+        for a in self.asteroids: a.field = None
+        self.asteroids = []
+        self.dead = False
+        self.box = None
+
+    def __len__(self):
+        return len(self.asteroids)
+
+    def variants(self, size):
+        return len(self.frames[size])
+
+    def add(self, a, x, y, vx, vy, angle=0.0, spin=0.0):
+        # a.size and a.variant pick the frames; (x, y) is the centre
+        if self.dead: self.compact()
+        n = len(self.asteroids)
+        if n == self.capacity: self.allocate(self.capacity * 2)
+        a.field = self
+        a.slot = n
+        self.seq += 1
+        a.token = self.seq
+        self.asteroids.append(a)
+        self.x[n] = self.px[n] = x
+        self.y[n] = self.py[n] = y
+        self.vx[n] = vx; self.vy[n] = vy
+        self.angle[n] = angle % 360.0
+        self.spin[n] = spin
+        self.set[n] = self.set_index[(a.size, a.variant)]
+        self.frame[n] = int(self.angle[n] * self.angles / 360.0) % self.angles
+        self.place(a, n)
+        self.box = None
+
+    def remove(self, a):
+        # Dropped from the arrays at the next update/boxes()
+        a.field = None
+        self.dead = True
+        self.box = None
+
+    def compact(self):
+        keep = [i for i, a in enumerate(self.asteroids) if a.field is self]
+        k = len(keep)
+        for name in self.ARRAYS:
+            arr = getattr(self, name)
+            arr[:k] = arr[keep]
+        self.asteroids = [self.asteroids[i] for i in keep]
+        for i, a in enumerate(self.asteroids): a.slot = i
+        self.dead = False
+
+    def frame_index(self, n):
+        return (self.angle[:n] * (self.angles / 360.0)).astype(np.intp) % self.angles
+
+    def place(self, a, i):
+        # Image and rect of one asteroid from its slot
+        img = self.sets[self.set[i]][self.frame[i]]
+        w, h = img.get_size()
+        a.image = img
+        a.rect.update(int(self.x[i]) - w // 2, int(self.y[i]) - h // 2, w, h)
+
+    def update(self, dt):
+        # Move and spin everything; returns the asteroids that drifted out of bounds
+        # (the caller kills them)
+        if self.dead: self.compact()
+        n = len(self.asteroids)
+        if not n: return []
+        x, y, angle = self.x[:n], self.y[:n], self.angle[:n]
+        self.px[:n] = x; self.py[:n] = y
+        x += self.vx[:n] * dt
+        y += self.vy[:n] * dt
+        angle += self.spin[:n] * dt
+        angle %= 360.0
+        self.frame[:n] = self.frame_index(n)
+        self.sync()
+        b, m = self.bounds, self.margin
+        out = np.flatnonzero((x < b.left - m) | (x > b.right + m) | (y < b.top - m) | (y > b.bottom + m))
+        return [self.asteroids[i] for i in out.tolist()]
+
+    def layout(self):
+        # (left, top, right, bottom) of every asteroid's current frame, centred on its position
+        n = len(self.asteroids)
+        w, h = self.dims[self.set[:n], self.frame[:n]].T
+        left = self.x[:n].astype(np.intp) - w // 2
+        top = self.y[:n].astype(np.intp) - h // 2
+        self.box = np.stack((left, top, left + w, top + h), axis=1)
+        return self.box
+
+    def sync(self):
+        # Current frame and rect for every asteroid (collisions and masks read those)
+        n = len(self.asteroids)
+        box = self.layout().tolist()
+        table = self.sets
+        for a, s, f, (l, t, r, b) in zip(self.asteroids, self.set[:n].tolist(), self.frame[:n].tolist(), box):
+            a.image = table[s][f]
+            a.rect.update(l, t, r - l, b - t)
+
+    def boxes(self):
+        # The layout() array, in self.asteroids order, for BulletPool.collide, which
+        # runs it through the same broadphase as the enemies (the SpatialHash grid
+        # once bullets x asteroids pass its linear_max); kept until an asteroid is
+        # added or removed
+        if self.dead: self.compact()
+        return self.layout() if self.box is None else self.box
+
+    def overlapping(self, rect):
+        # Asteroids whose box overlaps rect
+        if not self.asteroids: return []
+        r = self.boxes()
+        hit = (r[:, 0] < rect.right) & (r[:, 2] > rect.left) & (r[:, 1] < rect.bottom) & (r[:, 3] > rect.top)
+        return [self.asteroids[i] for i in np.flatnonzero(hit).tolist()]
+
+    def blit_list(self, ox=0, oy=0, alpha=1.0):
+        # (image, pos) per asteroid, alpha < 1 drawn between the previous and current step
+        if self.dead: self.compact()
+        n = len(self.asteroids)
+        if not n: return []
+        k = 1.0 - alpha
+        dx = np.round((self.px[:n] - self.x[:n]) * k).astype(int) + ox
+        dy = np.round((self.py[:n] - self.y[:n]) * k).astype(int) + oy
+        return [(a.image, (a.rect.x + x, a.rect.y + y)) for a, x, y in zip(self.asteroids, dx.tolist(), dy.tolist())]
+
+    def state(self):
+        # Bytes of the movement state, for replay hashes
+        if self.dead: self.compact()
+        n = len(self.asteroids)
+        return b"".join(arr[:n].tobytes() for arr in (self.x, self.y, self.vx, self.vy, self.angle, self.set))
+
+# ---------------- SPAWNER ----------------
+class AsteroidSpawner:
+    # Token bucket: rate spawns per second, at most burst saved up, and never more
+    # than limit asteroids alive from this spawner's side (pieces of split asteroids
+    # count towards the limit but do not spend tokens)
+    def __init__(self, rate=0.0, limit=0, burst=1.0):
+        self.rate = rate
+        self.limit = limit
+        self.burst = burst
+        self.reset()
+
+    def reset(self):
+        self.tokens = 0.0
+        self.spawned = 0
+        self.throttled = 0  # steps a due spawn was held back by the limit
+
+    def update(self, dt, alive):
+        # How many to spawn this step
+        self.tokens = min(self.burst, self.tokens + self.rate * dt)
+        n = int(self.tokens)
+        if not n: return 0
+        room = max(0, self.limit - alive)
+        if n > room:
+            self.throttled += 1
+            n = room
+        self.tokens -= n
+        self.spawned += n
+        return n
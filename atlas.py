@@ -0,0 +1,85 @@
+import pygame
+
+# ---------------- TEXTURE ATLAS ----------------
+class FrameStrip:
+    # An animation's frames as areas of one atlas sheet. Animations blit
+    # (sheet, pos, area) and step through areas instead of swapping Surfaces;
+    # indexing still gives a per-frame subsurface for code that wants one.
+    def __init__(self, sheet, areas):
+        self.sheet = sheet
+        self.areas = areas
+        self.frames = None
+
+    def __len__(self):
+        return len(self.areas)
+
+    def __getitem__(self, i):
+        if self.frames is None:
+            self.frames = [self.sheet.subsurface(a) for a in self.areas]
+        return self.frames[i]
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+class TextureAtlas:
+    # Packs named images and frame lists into one SRCALPHA sheet (shelf packing,
+    # tallest first). Single images come back as subsurfaces of the sheet, frame
+    # lists as FrameStrips, so everything drawn from the atlas shares one pixel
+    # buffer and one display conversion.
+    def __init__(self, width=1024, padding=1):
+        self.width = width
+        self.padding = padding
+        self.sheet = None
+        self.areas = {}    # name -> [Rect per frame]
+        self.singles = set()
+
+    def pack(self, items):
+        # items: name -> Surface or list of Surfaces
+        parts = []
+        for name, value in items.items():
+            if isinstance(value, pygame.Surface):
+                self.singles.add(name)
+                value = [value]
+            self.areas[name] = [None] * len(value)
+            parts += [(name, i, s) for i, s in enumerate(value)]
+        parts.sort(key=lambda p: -p[2].get_height())
+        self.width = max([self.width] + [s.get_width() for _, _, s in parts])
+        pad = self.padding
+        x = y = shelf = 0
+        for name, i, s in parts:
+            w, h = s.get_size()
+            if x + w > self.width:
+                x = 0; y += shelf + pad; shelf = 0
+            self.areas[name][i] = pygame.Rect(x, y, w, h)
+            x += w + pad
+            shelf = max(shelf, h)
+        self.sheet = pygame.Surface((self.width, max(1, y + shelf)), pygame.SRCALPHA)
+        self.sheet.blits([(s, self.areas[name][i]) for name, i, s in parts], False)
+        return self
+
+    def layout(self):
+        # JSON-friendly {name: [single?, [[x, y, w, h], ...]]} for the asset cache
+        return {name: [name in self.singles, [list(r) for r in rects]] for name, rects in self.areas.items()}
+
+    @classmethod
+    def from_layout(cls, sheet, layout):
+        atlas = cls(sheet.get_width())
+        atlas.sheet = sheet
+        for name, (single, rects) in layout.items():
+            atlas.areas[name] = [pygame.Rect(r) for r in rects]
+            if single: atlas.singles.add(name)
+        return atlas
+
+    def convert(self):
+        if pygame.display.get_surface():
+            self.sheet = self.sheet.convert_alpha()
+        return self
+
+    def get(self, name):
+        # Subsurface for a single image, FrameStrip for a frame list
+        if name in self.singles:
+            return self.sheet.subsurface(self.areas[name][0])
+        return FrameStrip(self.sheet, self.areas[name])
+
+    def items(self):
+        return [(name, self.get(name)) for name in self.areas]
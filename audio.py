@@ -0,0 +1,108 @@
+import time
+import pygame
+
+# ---------------- AUDIO ----------------
+class SoundSpec:
+    __slots__ = ("assets", "priority", "max_voices", "window", "sound", "resolved", "channels", "last")
+    def __init__(self, assets, priority, max_voices, window):
+        self.assets = assets          # asset names to try in order; the first loaded one plays
+        self.priority = priority      # higher may take a voice from lower when the mixer is full
+        self.max_voices = max_voices  # at most this many copies at once
+        self.window = window          # repeats closer together than this (s) are merged
+        self.sound = None
+        self.resolved = False
+        self.channels = []
+        self.last = -1e9
+
+class AudioManager:
+    # Sound effects by event name. The simulation only calls play(), which records
+    # the request (repeats within a frame collapse into one); dispatch(), called
+    # once per rendered frame, makes the mixer calls: it merges repeats inside each
+    # sound's window and keeps to the per-sound and global voice budgets, taking
+    # voices from lower-priority sounds when the mixer is full.
+    def __init__(self, resolve, max_voices=12):
+        self.resolve = resolve  # asset name -> Sound or None
+        self.max_voices = max_voices
+        self.specs = {}
+        self.pending = {}  # event name -> requests since the last dispatch
+        self.channels_set = False
+        self.requested = self.played = self.coalesced = self.dropped = self.stolen = 0
+
+    def add(self, name, assets, priority=0, max_voices=2, window=0.05):
+        if isinstance(assets, str): assets = (assets,)
+        self.specs[name] = SoundSpec(assets, priority, max_voices, window)
+
+    def play(self, name):
+        self.requested += 1
+        self.pending[name] = self.pending.get(name, 0) + 1
+
+    def clear(self):
+        # Drop requests not dispatched yet and cut the effects still sounding, for a
+        # restart or a pause; music is not an effect and keeps playing
+        self.pending.clear()
+        for spec in self.specs.values():
+            if spec.channels and pygame.mixer.get_init():
+                for channel in self.voices(spec): channel.stop()
+            spec.channels = []
+            spec.last = -1e9
+
+    def sound(self, spec):
+        if not spec.resolved:
+            spec.sound = next((s for s in map(self.resolve, spec.assets) if s), None)
+            spec.resolved = True
+        return spec.sound
+
+    def voices(self, spec):
+        # Channels still playing this sound (a channel may have been reused since)
+        spec.channels = [c for c in spec.channels if c.get_busy() and c.get_sound() is spec.sound]
+        return spec.channels
+
+    def dispatch(self, now=None):
+        if not self.pending: return
+        if not pygame.mixer.get_init():
+            self.dropped += sum(self.pending.values())
+            self.pending.clear()
+            return
+        if not self.channels_set:
+            pygame.mixer.set_num_channels(max(self.max_voices, pygame.mixer.get_num_channels()))
+            self.channels_set = True
+        if now is None: now = time.perf_counter()
+        specs = self.specs
+        for name in sorted(self.pending, key=lambda n: -specs[n].priority):
+            spec = specs[name]
+            self.coalesced += self.pending[name] - 1
+            if now - spec.last < spec.window:
+                self.coalesced += 1
+                continue
+            sound = self.sound(spec)
+            if sound is None: continue
+            self.start(spec, sound, now)
+        self.pending.clear()
+
+    def start(self, spec, sound, now):
+        voices = self.voices(spec)
+        if len(voices) >= spec.max_voices:
+            # Retrigger: the newest copy replaces the oldest
+            voices.pop(0).stop()
+            self.stolen += 1
+        elif sum(len(self.voices(s)) for s in self.specs.values()) >= self.max_voices:
+            victims = [s for s in self.specs.values() if s.channels and s.priority < spec.priority]
+            if not victims:
+                self.dropped += 1
+                return
+            min(victims, key=lambda s: s.priority).channels.pop(0).stop()
+            self.stolen += 1
+        channel = sound.play()
+        if channel is None:
+            self.dropped += 1
+            return
+        spec.channels.append(channel)
+        spec.last = now
+        self.played += 1
+
+    def reset_stats(self):
+        self.requested = self.played = self.coalesced = self.dropped = self.stolen = 0
+
+    def stats(self):
+        return {"requested": self.requested, "played": self.played, "coalesced": self.coalesced,
+                "dropped": self.dropped, "stolen": self.stolen}
@@ -0,0 +1,122 @@
+import random
+import pygame
+
+# ---------------- BACKGROUND COMPOSITOR ----------------
+def build_star_stamps(w, h, density=90, alpha=(40,120)):
+    # A star layer as individual (stamp, x, y) dots instead of a full-screen SRCALPHA
+    # surface, so a frame blits a few hundred tiny surfaces rather than 1200x700 pixels twice
+    stars = []
+    for _ in range(density):
+        x = random.randint(0, w-2); y = random.randint(0, h-2)
+        color = (255,255,255, random.randint(*alpha)); r = random.randint(1,2)
+        stamp = pygame.Surface((2*r+1, 2*r+1), pygame.SRCALPHA)
+        pygame.draw.circle(stamp, color, (r, r), r)
+        if pygame.display.get_surface(): stamp = stamp.convert_alpha()
+        stars.append((stamp, x - r, y - r))
+    return stars
+
+def build_vignette(w, h):
+    vignette = pygame.Surface((w, h), pygame.SRCALPHA)
+    for i in range(220):
+        c = max(0, 160 - i)
+        pygame.draw.rect(vignette, (0,0,0, int(c*0.25)), (i, i, w-2*i, h-2*i), 2)
+    return vignette
+
+def frame_strips(surf):
+    # Split a border-only overlay into four edge strips around its fully transparent
+    # middle, so blitting it skips the (large) untouched interior
+    w, h = surf.get_size()
+    inset = 0
+    while inset < min(w, h) // 2 and surf.get_at((inset, h // 2)).a:
+        inset += 1
+    if inset * 2 >= min(w, h):
+        return [(surf, (0, 0))]
+    rects = [(0, 0, w, inset), (0, h - inset, w, inset), (0, inset, inset, h - 2*inset), (w - inset, inset, inset, h - 2*inset)]
+    return [(surf.subsurface(r).copy(), (r[0], r[1])) for r in rects]
+
+class Background:
+    # Pre-baked parallax background: opaque base, sparse star stamps for the two
+    # scrolling layers, the vignette as edge strips, and base+vignette composited
+    # once for the static pause/game-over screens.
+    def __init__(self, base, w, h):
+        self.w, self.h = w, h
+        if pygame.display.get_surface(): base = base.convert()
+        self.base = base
+        self.stars1 = build_star_stamps(w, h, 100, (40,120))
+        self.stars2 = build_star_stamps(w, h, 60, (20,80))
+        vignette = build_vignette(w, h)
+        self.vignette = frame_strips(vignette)
+        self.static = base.copy()
+        self.static.blit(vignette, (0, 0))
+        self.p1 = 0.0; self.p2 = 0.0
+        self.sky = None  # base + stars off screen for the dirty-rect renderer, see update_sky()
+        self.star_rects = []
+
+    def convert(self):
+        # Display-format copies of everything, for a background built before the window opened
+        if pygame.display.get_surface():
+            self.base = self.base.convert()
+            self.static = self.static.convert()
+            self.stars1 = [(stamp.convert_alpha(), x, y) for stamp, x, y in self.stars1]
+            self.stars2 = [(stamp.convert_alpha(), x, y) for stamp, x, y in self.stars2]
+            self.vignette = [(strip.convert_alpha(), pos) for strip, pos in self.vignette]
+            self.sky = None
+        return self
+
+    def scroll(self, dt):
+        self.p1 = (self.p1 - 18*dt) % self.w
+        self.p2 = (self.p2 - 45*dt) % self.w
+
+    def star_blits(self, stars, p, ox, oy):
+        # Same wrap as blitting the old layer at -p and -p + w
+        w = self.w
+        seq = []
+        for stamp, x, y in stars:
+            sx = (x - p) % w
+            seq.append((stamp, (sx + ox, y + oy)))
+            if sx > w - stamp.get_width():
+                seq.append((stamp, (sx - w + ox, y + oy)))
+        return seq
+
+    def draw(self, surf, ox=0, oy=0):
+        surf.blit(self.base, (ox//3, oy//3))
+        self.draw_stars(surf, ox, oy)
+
+    def draw_stars(self, surf, ox=0, oy=0, doreturn=False):
+        # With doreturn the rects of every stamp come back
+        rects1 = surf.blits(self.star_blits(self.stars1, self.p1, ox, oy), doreturn)
+        rects2 = surf.blits(self.star_blits(self.stars2, self.p2, ox, oy), doreturn)
+        return rects1 + rects2 if doreturn else None
+
+    def draw_vignette(self, surf):
+        surf.blits(self.vignette, False)
+
+    def update_sky(self):
+        # Moves the stars on the sky surface to the current scroll; returns the rects
+        # whose pixels changed (where a star left and where it arrived)
+        if self.sky is None:
+            self.sky = self.base.copy()
+            self.star_rects = []
+        old = self.star_rects
+        self.sky.blits([(self.base, r, r) for r in old], False)
+        new = self.star_rects = self.draw_stars(self.sky, doreturn=True)
+        # The layers move less than a pixel a frame, so often nothing changes
+        kept = set(map(tuple, old)) & set(map(tuple, new))
+        return [r for r in old + new if tuple(r) not in kept]
+
+    def restore(self, surf, rects):
+        # The live background (sky, then the vignette over it) back over rects. Each
+        # rect gets its sky and its vignette in turn, so overlapping rects never
+        # darken twice.
+        sky = self.sky
+        strips = [(strip, strip.get_rect(topleft=pos)) for strip, pos in self.vignette]
+        seq = []
+        for r in rects:
+            seq.append((sky, r, r))
+            for strip, area in strips:
+                c = area.clip(r)
+                if c: seq.append((strip, c, c.move(-area.x, -area.y)))
+        surf.blits(seq, False)
+
+    def draw_static(self, surf, vignette=True):
+        surf.blit(self.static if vignette else self.base, (0, 0))
@@ -0,0 +1,134 @@
+import os, sys, time, random
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+import main as game
+from bullets import BulletPool
+from asteroids import AsteroidField
+from spatial import SpatialHash
+
+class RotatingRock:
+    # A per-sprite asteroid turning its image with transform.rotate every step,
+    # kept here as the baseline for the precomputed rotation frames
+    def __init__(self, frames, size, variant, rnd):
+        self.size, self.variant = size, variant
+        self.base = frames[size][variant][0].copy()
+        self.base.set_alpha(255)  # without the frames' RLE, which rotate would have to undo
+        self.x, self.y = rnd.uniform(0, game.SCREEN_W), rnd.uniform(0, game.SCREEN_H)
+        self.vx, self.vy = rnd.uniform(-60, 60), rnd.uniform(40, 120)
+        self.angle, self.spin = rnd.uniform(0, 360), rnd.uniform(-90, 90)
+        self.update(0.0)
+    def update(self, dt):
+        self.x += self.vx * dt
+        self.y += self.vy * dt
+        self.angle = (self.angle + self.spin * dt) % 360
+        self.image = pygame.transform.rotate(self.base, -self.angle)
+        self.rect = self.image.get_rect(center=(self.x, self.y))
+
+class FieldRock:
+    # Just what AsteroidField needs from an asteroid
+    __slots__ = ("size", "variant", "image", "rect", "field", "slot", "token")
+    def __init__(self, size, variant):
+        self.size, self.variant = size, variant
+        self.rect = pygame.Rect(0, 0, 0, 0)
+
+def fire(bullets, rnd):
+    for _ in range(40):
+        bullets.spawn(rnd.uniform(0, game.SCREEN_W), rnd.uniform(0, game.SCREEN_H), game.assets["player_bullet_img"], vy=-880)
+
+def loop_step(rocks, bullets, player, screen, dt):
+    for r in rocks: r.update(dt)
+    bullets.hit_lists([r.rect for r in rocks], friendly=True)
+    player.collidelistall([r.rect for r in rocks])
+    screen.blits([(r.image, r.rect) for r in rocks], False)
+
+def field_step(field, bullets, player, screen, dt):
+    field.update(dt)
+    bullets.hit_lists(field.boxes(), friendly=True)
+    field.overlapping(player)
+    screen.blits(field.blit_list(), False)
+
+def timed(step, target, steps=300):
+    bullets = BulletPool(game.SCREEN_H)
+    rnd = random.Random(1)
+    player = pygame.Rect(560, 600, 84, 84)
+    start = time.perf_counter()
+    for _ in range(steps):
+        fire(bullets, rnd)
+        bullets.update(game.SIM_DT)
+        step(target, bullets, player, game.screen, game.SIM_DT)
+        bullets.clear()
+    return (time.perf_counter() - start) / steps * 1000.0
+
+def broadphase(field, n_bullets, steps=100):
+    # The bullet x asteroid test of GameSimulation.collide on the field's boxes,
+    # every pair against the grid; both must find the same hits
+    bullets = BulletPool(game.SCREEN_H)
+    rnd = random.Random(2)
+    for _ in range(n_bullets):
+        bullets.spawn(rnd.uniform(0, game.SCREEN_W), rnd.uniform(0, game.SCREEN_H), game.assets["player_bullet_img"], vy=-880)
+    bullets.update(game.SIM_DT)
+    boxes = field.boxes()
+    out = []
+    for grid in (SpatialHash(linear_max=float("inf")), SpatialHash(linear_max=0)):
+        bullets.grid = grid
+        start = time.perf_counter()
+        for _ in range(steps): hits = bullets.hit_lists(boxes, friendly=True)
+        out.append(((time.perf_counter() - start) / steps * 1000.0, hits))
+    (pairs_ms, pairs_hits), (grid_ms, grid_hits) = out
+    default = "grid" if n_bullets * len(boxes) > SpatialHash().linear_max else "all-pairs"
+    return pairs_ms, grid_ms, default, pairs_hits == grid_hits
+
+def recycling(steps=3000, seed=2):
+    # Shot rocks go back to the pool and come straight back as their own pieces:
+    # every step the field must hold exactly one slot per live asteroid (a stale
+    # slot is an invisible box that bullets and the player still hit)
+    from headless import autopilot
+    sim = game.GameSimulation(seed)
+    field = sim.asteroid_field
+    bad = 0
+    for i in range(steps):
+        sim.asteroid_spawner.rate, sim.asteroid_spawner.limit = 20.0, 60
+        sim.player.inv = 1.0
+        keys, shoot = autopilot(sim)
+        sim.step(game.SIM_DT, keys, shoot)
+        # Read the slots as the next update/boxes() would keep them, without compacting
+        live = [a for a in field.asteroids if a.field is field]
+        if len(live) != len(sim.asteroid_group) or set(live) != set(sim.asteroid_group) or len(set(live)) != len(live): bad += 1
+    print(f"{bad} of {steps} steps with slots out of step with the live asteroids ({game.asteroid_pool.reused} reused)")
+    sim.reset()  # hand the sprites back to the pools
+    return bad == 0
+
+def main():
+    game.open_window()
+    game.assets.wait()
+    ok = recycling()
+    frames = game.assets["asteroid_frames"]
+    bounds = pygame.Rect(0, 0, game.SCREEN_W, game.SCREEN_H)
+    print(f"{len(frames)} sizes x {len(frames[0])} rocks x {game.ASTEROID_ANGLES} rotation frames")
+    print(f"{'asteroids':>9} {'rotate ms':>10} {'field ms':>9}")
+    fields = {}
+    for n in (50, 200, 500):
+        rnd = random.Random(0)
+        rocks = []
+        for _ in range(n):
+            size = rnd.randrange(len(frames))
+            rocks.append(RotatingRock(frames, size, rnd.randrange(len(frames[size])), rnd))
+        # Same rocks, same paths; none are culled during the run
+        field = fields[n] = AsteroidField(frames, bounds, margin=10**6)
+        for r in rocks:
+            field.add(FieldRock(r.size, r.variant), r.x, r.y, r.vx, r.vy, r.angle, r.spin)
+        print(f"{n:>9} {timed(loop_step, rocks):>10.3f} {timed(field_step, field):>9.3f}")
+    print(f"{'asteroids':>9} {'bullets':>8} {'all-pairs ms':>13} {'grid ms':>8} {'speedup':>8}  default")
+    for n, field in fields.items():
+        for n_bullets in (40, 200, 1000):
+            pairs_ms, grid_ms, default, same = broadphase(field, n_bullets)
+            ok &= same
+            print(f"{n:>9} {n_bullets:>8} {pairs_ms:>13.3f} {grid_ms:>8.3f} {pairs_ms / grid_ms:>7.1f}x  {default}{'' if same else '  MISMATCH'}")
+    print("PASS" if ok else "FAIL")
+    sys.exit(0 if ok else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+import os, sys, time, shutil, tempfile, random
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import numpy as np
+import pygame
+import main as game
+from assetcache import AssetCache
+from bench_startup import make_assets
+
+FRAMES = 12  # per stand-in explosion folder
+
+def make_explosions(folder):
+    rng = np.random.default_rng(1)
+    for path, _, _ in game.ATLAS_FRAMES.values():
+        os.makedirs(os.path.join(folder, path), exist_ok=True)
+        for i in range(FRAMES):
+            pixels = rng.integers(0, 256, (256, 256, 4), dtype=np.uint8)
+            pygame.image.save(pygame.image.frombytes(pixels.tobytes(), (256, 256), "RGBA"), os.path.join(folder, path, f"{i:02d}.png"))
+
+def separate():
+    # The one-entry-per-file loads the atlas replaced, kept here as the baseline
+    out = {name: game.load_image(*args, convert=False) for name, args in game.ATLAS_IMAGES.items()}
+    out.update((name, game.load_explosion_folder(*args, convert=False)) for name, args in game.ATLAS_FRAMES.items())
+    return {name: game.convert_alpha_all(v) for name, v in out.items()}
+
+def atlased():
+    atlas = game.load_sprite_atlas().convert()
+    return dict(atlas.items())
+
+def timed_load(load, cache_dir):
+    game.asset_cache = AssetCache(cache_dir)
+    t0 = time.perf_counter()
+    items = load()
+    ms = (time.perf_counter() - t0) * 1000.0
+    game.asset_cache.save()
+    return ms, items
+
+def frame_ms(items, atlas, frames=400):
+    # 22 enemies, 200 bullets and 32 explosions stepping through their frames
+    rnd = random.Random(2)
+    screen = game.screen
+    enemies = [(items[f"enemy{rnd.randint(1, 4)}_img"], (rnd.randint(0, 1100), rnd.randint(40, 230))) for _ in range(22)]
+    bullets = [(items[f"bullet_e{rnd.randint(1, 4)}"], (rnd.randint(0, 1190), rnd.randint(0, 680))) for _ in range(200)]
+    booms = [(items[f"exp{rnd.randint(1, 4)}"], (rnd.randint(0, 1000), rnd.randint(0, 500)), rnd.randrange(FRAMES)) for _ in range(32)]
+    t0 = time.perf_counter()
+    for f in range(frames):
+        screen.blits(enemies, False)
+        screen.blits(bullets, False)
+        if atlas:
+            screen.blits([(strip.sheet, pos, strip.areas[(i + f) % len(strip)]) for strip, pos, i in booms], False)
+        else:
+            screen.blits([(frames_[(i + f) % len(frames_)], pos) for frames_, pos, i in booms], False)
+    return (time.perf_counter() - t0) / frames * 1000.0
+
+def main():
+    game.open_window()
+    folder = tempfile.mkdtemp(prefix="si_atlas_")
+    cwd = os.getcwd()
+    try:
+        make_assets(folder)
+        make_explosions(folder)
+        os.chdir(folder)
+        print(f"{len(game.ATLAS_IMAGES)} images + {len(game.ATLAS_FRAMES)}x{FRAMES} explosion frames")
+        print(f"{'':<10} {'cold ms':>8} {'warm ms':>8} {'surfaces':>9} {'frame ms':>9}")
+        for label, load, is_atlas in (("separate", separate, False), ("atlas", atlased, True)):
+            cache_dir = os.path.join(folder, f".cache_{label}")
+            cold, _ = timed_load(load, cache_dir)
+            warm, items = timed_load(load, cache_dir)
+            surfaces = 1 if is_atlas else sum(len(v) if isinstance(v, list) else 1 for v in items.values())
+            print(f"{label:<10} {cold:>8.1f} {warm:>8.1f} {surfaces:>9} {frame_ms(items, is_atlas):>9.3f}")
+    finally:
+        os.chdir(cwd)
+        game.asset_cache = AssetCache()
+        shutil.rmtree(folder, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import os, sys, time, random
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import numpy as np
+import pygame
+import main as game
+from headless import autopilot
+from bench_scenarios import SCENARIOS
+from audio import AudioManager
+
+SECONDS = 4.0  # per scenario, paced in real time so voices finish as they would in game
+
+class DirectAudio:
+    # The old behaviour, kept here as the baseline: Sound.play() straight from the update
+    def __init__(self, manager):
+        self.manager = manager
+        self.requested = self.played = 0
+
+    def play(self, name):
+        self.requested += 1
+        sound = self.manager.sound(self.manager.specs[name])
+        if sound and sound.play(): self.played += 1
+
+    def dispatch(self, now=None):
+        pass
+
+    def clear(self):
+        pass
+
+def stand_in(seconds=0.35):
+    # Silent effect for sounds whose files are missing, so every event has a voice to use
+    freq, size, channels = pygame.mixer.get_init()
+    return pygame.mixer.Sound(buffer=bytes(int(freq * seconds) * abs(size) // 8 * channels))
+
+def run(name, audio, seed=1):
+    setup, per_frame = SCENARIOS[name]
+    game.audio = audio
+    sim = game.GameSimulation(seed)
+    rnd = random.Random(seed)
+    if setup: setup(sim, rnd)
+    step_ms, busy = [], []
+    start = time.perf_counter()
+    for i in range(int(SECONDS * game.SIM_HZ)):
+        sim.player.inv = 1.0
+        if per_frame: per_frame(sim, rnd, i)
+        keys, shoot = autopilot(sim)
+        t0 = time.perf_counter()
+        sim.step(game.SIM_DT, keys, shoot)
+        step_ms.append((time.perf_counter() - t0) * 1000.0)
+        audio.dispatch()
+        busy.append(sum(pygame.mixer.Channel(c).get_busy() for c in range(pygame.mixer.get_num_channels())))
+        # Pace to real time
+        wait = start + (i + 1) * game.SIM_DT - time.perf_counter()
+        if wait > 0: time.sleep(wait)
+    pygame.mixer.stop()
+    return np.array(step_ms), max(busy)
+
+def main():
+    game.assets.wait()
+    if not pygame.mixer.get_init():
+        print("no mixer available")
+        return
+    pygame.mixer.set_num_channels(game.audio.max_voices)  # same mixer for both modes
+    silent = stand_in()
+    resolve = lambda name: game.assets[name] or silent
+    print(f"{'scenario':<16} {'mode':<8} {'requests':>8} {'mixer':>6} {'merged':>6} {'dropped':>7} {'stolen':>6} {'voices':>6} {'step p99 ms':>11}")
+    for name in ("late_waves", "rapid_fire", "mass_explosions"):
+        managed = AudioManager(resolve, game.audio.max_voices)
+        for event, spec in game.audio.specs.items():
+            managed.add(event, spec.assets, spec.priority, spec.max_voices, spec.window)
+        direct = DirectAudio(managed)
+        for mode, audio in (("direct", direct), ("managed", managed)):
+            step_ms, voices = run(name, audio)
+            s = managed.stats() if audio is managed else {"requested": direct.requested, "played": direct.played,
+                                                           "coalesced": 0, "dropped": direct.requested - direct.played, "stolen": 0}
+            print(f"{name:<16} {mode:<8} {s['requested']:>8} {s['played']:>6} {s['coalesced']:>6} {s['dropped']:>7} {s['stolen']:>6} "
+                  f"{voices:>6} {np.percentile(step_ms, 99):>11.3f}")
+
+if __name__ == "__main__":
+    main()
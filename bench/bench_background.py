@@ -0,0 +1,54 @@
+import os, sys, time, random
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from background import Background, build_vignette
+
+SCREEN_W, SCREEN_H = 1200, 700
+
+def build_star_layer(density=90, alpha=(40,120)):
+    # The full-screen SRCALPHA star layer the compositor replaced
+    s = pygame.Surface((SCREEN_W, SCREEN_H), pygame.SRCALPHA)
+    for _ in range(density):
+        x = random.randint(0, SCREEN_W-2); y = random.randint(0, SCREEN_H-2)
+        pygame.draw.circle(s, (255,255,255, random.randint(*alpha)), (x,y), random.randint(1,2))
+    return s
+
+def old_frame(screen, base, s1, s2, vignette, p1, p2, ox, oy):
+    screen.blit(base, (ox//3, oy//3))
+    screen.blit(s1, (-p1 + ox, 0+oy)); screen.blit(s1, (-p1 + SCREEN_W + ox, 0+oy))
+    screen.blit(s2.copy(), (-p2 + ox, 0+oy)); screen.blit(s2.copy(), (-p2 + SCREEN_W + ox, 0+oy))
+    screen.blit(vignette, (0,0))
+
+def new_frame(screen, bg, ox, oy):
+    bg.draw(screen, ox, oy)
+    bg.draw_vignette(screen)
+
+def timed(fn, frames=120):
+    start = time.perf_counter()
+    for i in range(frames): fn(i)
+    return (time.perf_counter() - start) / frames * 1000.0
+
+def main():
+    random.seed(9)
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_W, SCREEN_H))
+    # Same fallback image load_image would hand over when the background PNG is missing
+    base = pygame.Surface((SCREEN_W, SCREEN_H), pygame.SRCALPHA)
+    base.fill((225, 225, 235, 230))
+    s1 = build_star_layer(100, (40,120)); s2 = build_star_layer(60, (20,80))
+    vignette = build_vignette(SCREEN_W, SCREEN_H)
+    bg = Background(base, SCREEN_W, SCREEN_H)
+
+    shakes = [(0, 0), (6, -4)]
+    for ox, oy in shakes:
+        old_ms = timed(lambda i: old_frame(screen, base, s1, s2, vignette, i * 0.75 % SCREEN_W, i * 1.9 % SCREEN_W, ox, oy))
+        new_ms = timed(lambda i: (bg.scroll(1/60), new_frame(screen, bg, ox, oy)))
+        print(f"shake ({ox:>2},{oy:>2}): old {old_ms:.3f} ms  new {new_ms:.3f} ms  ({old_ms / new_ms:.1f}x)")
+    old_ms = timed(lambda i: (screen.blit(base, (0,0)), screen.blit(vignette, (0,0))))
+    new_ms = timed(lambda i: bg.draw_static(screen))
+    print(f"static screen:   old {old_ms:.3f} ms  new {new_ms:.3f} ms  ({old_ms / new_ms:.1f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+import os, sys, time, random
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+from bullets import BulletPool
+
+SCREEN_W, SCREEN_H = 1200, 700
+
+class SpriteBullet(pygame.sprite.Sprite):
+    # The per-sprite bullet the pool replaced, kept here as the baseline
+    def __init__(self, x, y, img, vy, friendly=True):
+        super().__init__()
+        self.image = img
+        self.rect = self.image.get_rect(center=(x,y))
+        self.vy = vy
+        self.friendly = friendly
+    def update(self, dt):
+        self.rect.y += int(self.vy * dt)
+        if self.rect.bottom < -60 or self.rect.top > SCREEN_H + 60:
+            self.kill()
+
+def enemy_rects(n):
+    return [pygame.Rect(random.randint(0, SCREEN_W - 48), random.randint(40, 230), 48, 48) for _ in range(n)]
+
+def spawn_positions(n):
+    return [(random.randint(0, SCREEN_W), random.randint(0, SCREEN_H), random.random() < 0.7) for _ in range(n)]
+
+def sprite_frame(group, spawns, n, img, enemies, player_rect, dt):
+    for x, y, friendly in spawns.refill(n - len(group)):
+        group.add(SpriteBullet(x, y, img, -880 if friendly else 400, friendly))
+    for b in list(group): b.update(dt)
+    hits = 0
+    for b in [x for x in group if x.friendly]:
+        if [e for e in enemies if e.colliderect(b.rect)]:
+            b.kill(); hits += 1
+    for b in [x for x in group if not x.friendly]:
+        if player_rect.colliderect(b.rect):
+            b.kill(); hits += 1
+    return hits
+
+def pool_frame(pool, spawns, n, img, enemies, player_rect, dt):
+    # As GameSimulation.collide: the enemy and player queries in one sweep
+    for x, y, friendly in spawns.refill(n - len(pool)):
+        pool.spawn(x, y, img, -880 if friendly else 400, friendly)
+    pool.update(dt)
+    hits = 0
+    enemy_hits, player_hits = pool.collide([(enemies, True), ([player_rect], False)])
+    for slot, _ in enemy_hits + player_hits:
+        pool.kill(slot); hits += 1
+    pool.compact()
+    return hits
+
+class Spawns:
+    # Random bullets, 70% the player's, handed out in turn to top up the live count
+    def __init__(self, n):
+        self.positions = spawn_positions(n)
+        self.next = 0
+    def refill(self, k):
+        out = []
+        for _ in range(max(0, k)):
+            out.append(self.positions[self.next])
+            self.next = (self.next + 1) % len(self.positions)
+        return out
+
+def timed(frame, *args, frames=200, runs=5):
+    # Best of a few runs: a short frame is easily swamped by the rest of the machine
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        for _ in range(frames): frame(*args)
+        best = min(best, time.perf_counter() - start)
+    return best / frames * 1000.0
+
+def main():
+    random.seed(3)
+    img = pygame.Surface((10, 24))
+    enemies = enemy_rects(22)
+    player_rect = pygame.Rect(SCREEN_W//2 - 42, SCREEN_H - 112, 84, 84)
+    print(f"{'bullets':>8} {'sprites ms':>11} {'pool ms':>9} {'speedup':>8}")
+    for n in (50, 100, 200, 1000, 4000):
+        # Both are topped up to n live bullets before every frame; late waves peak at 50-60
+        group, pool = pygame.sprite.Group(), BulletPool(SCREEN_H)
+        for frame, target in ((sprite_frame, group), (pool_frame, pool)):
+            timed(frame, target, Spawns(4 * n), n, img, enemies, player_rect, 1/60, frames=60, runs=1)
+        sprite_ms = timed(sprite_frame, group, Spawns(4 * n), n, img, enemies, player_rect, 1/60)
+        pool_ms = timed(pool_frame, pool, Spawns(4 * n), n, img, enemies, player_rect, 1/60)
+        print(f"{n:>8} {sprite_ms:>11.3f} {pool_ms:>9.3f} {sprite_ms / pool_ms:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
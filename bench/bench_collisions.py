@@ -0,0 +1,49 @@
+import os, sys, time, random
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pygame
+from bullets import BulletPool
+from spatial import SpatialHash
+
+SCREEN_W, SCREEN_H = 1200, 700
+
+def naive_pass(bullets, rects):
+    # The per-pair loop the broadphase replaced: every bullet against every rect
+    hits = 0
+    for b in bullets:
+        hits += len([r for r in rects if r.colliderect(b)])
+    return hits
+
+def pool_pass(pool, rects):
+    return sum(len(hit) for _, hit in pool.hit_lists(rects, friendly=True))
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat): result = fn()
+    return (time.perf_counter() - start) / repeat * 1000.0, result
+
+def main(repeat=50):
+    random.seed(7)
+    img = pygame.Surface((10, 24))
+    print(f"{'bullets':>8} {'rects':>6} {'naive ms':>9} {'all-pairs ms':>13} {'grid ms':>8} {'speedup':>8}")
+    for n_bullets, n_rects in ((30, 8), (90, 22), (300, 22), (600, 100), (2000, 300), (500, 800)):
+        pool = BulletPool(SCREEN_H)
+        for _ in range(n_bullets):
+            pool.spawn(random.randint(0, SCREEN_W), random.randint(0, SCREEN_H), img, vy=-880)
+        pool.update(1 / 60)
+        rects = [pygame.Rect(random.randint(0, SCREEN_W - 48), random.randint(0, SCREEN_H - 48), 48, 48) for _ in range(n_rects)]
+        boxes = np.array([(r.left, r.top, r.right, r.bottom) for r in rects])
+        # The swept boxes, as Rects, for the loop
+        swept = [pygame.Rect(l, t, r - l, b - t) for l, t, r, b in pool.paths()[0].T.tolist()]
+        naive_ms, _ = timed(lambda: naive_pass(swept, rects), repeat)
+        pool.grid = SpatialHash(linear_max=float("inf"))
+        dense_ms, dense_hits = timed(lambda: pool_pass(pool, boxes), repeat)
+        pool.grid = SpatialHash(linear_max=0)
+        grid_ms, grid_hits = timed(lambda: pool_pass(pool, boxes), repeat)
+        assert dense_hits == grid_hits
+        print(f"{n_bullets:>8} {n_rects:>6} {naive_ms:>9.3f} {dense_ms:>13.3f} {grid_ms:>8.3f} {dense_ms / grid_ms:>7.1f}x")
+    print(f"default grid switch: above {SpatialHash().linear_max} bullet x rect pairs")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+import os, sys, time, random
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import main as game
+from bullets import BulletPool
+from enemies import EnemyManager
+
+class LoopEnemy:
+    # The per-enemy update/try_shoot the manager replaced, kept here as the baseline
+    def __init__(self, kind, rnd):
+        self.kind = kind
+        self.rect = kind.img.get_rect(topleft=(rnd.randint(0, 1100), rnd.randint(40, 230)))
+        self.x = self.px = float(self.rect.x)
+        self.vx = rnd.choice([-1,1]) * (kind.speed + rnd.uniform(-30,30))
+        self.shoot_t = rnd.uniform(*kind.shoot_rng)
+        self.alive = True
+    def update(self, dt):
+        if not self.alive: return
+        self.px = self.x
+        self.x += self.vx * dt
+        right = game.SCREEN_W - self.rect.width
+        if self.x <= 0:
+            self.x = -self.x
+            self.vx = abs(self.vx)
+        elif self.x >= right:
+            self.x = 2 * right - self.x
+            self.vx = -abs(self.vx)
+        self.rect.x = self.x
+    def try_shoot(self, dt, bullets, rnd):
+        if not self.alive: return
+        self.shoot_t -= dt
+        if self.shoot_t <= 0:
+            self.shoot_t = rnd.uniform(*self.kind.shoot_rng)
+            bullets.spawn(self.rect.centerx, self.rect.bottom-6, self.kind.bullet_img, vy=400, friendly=False)
+
+class BatchEnemy:
+    # Just what EnemyManager needs from an enemy
+    __slots__ = ("kind", "rect", "image", "manager", "slot", "token")
+    def __init__(self, kind, rnd):
+        self.kind = kind
+        self.image = kind.img
+        self.rect = kind.img.get_rect(topleft=(rnd.randint(0, 1100), rnd.randint(40, 230)))
+
+def loop_step(enemies, bullets, rnd, dt):
+    for e in enemies:
+        e.update(dt)
+        e.try_shoot(dt, bullets, rnd)
+
+def batch_step(manager, bullets, rnd, dt):
+    manager.update(dt)
+    for e in manager.due():
+        bullets.spawn(e.rect.centerx, e.rect.bottom-6, e.kind.bullet_img, vy=400, friendly=False)
+        manager.schedule(e, rnd.uniform(*e.kind.shoot_rng))
+
+def timed(step, target, steps=600):
+    bullets = BulletPool(game.SCREEN_H)
+    rnd = random.Random(1)
+    shots = 0
+    start = time.perf_counter()
+    for _ in range(steps):
+        step(target, bullets, rnd, game.SIM_DT)
+        shots += bullets.count
+        bullets.clear()
+    return (time.perf_counter() - start) / steps * 1000.0, shots / steps
+
+def recycling(steps=3000, seed=2):
+    # Pooled enemies come straight back for the next wave: every step the manager must
+    # hold exactly one slot per live enemy (a stale slot would be drawn as a ghost)
+    from headless import autopilot
+    ok = True
+    for mode in ("free", "formation"):
+        sim = game.GameSimulation(seed)
+        sim.enemies.mode = mode
+        bad = 0
+        for i in range(steps):
+            keys, shoot = autopilot(sim)
+            sim.step(game.SIM_DT, keys, shoot)
+            if sim.game_over: sim.reset()
+            # Read the slots as the next update/blit_list would keep them, without compacting
+            live = [e for e in sim.enemies.enemies if e.manager is sim.enemies]
+            if len(live) != len(sim.enemy_group) or set(live) != set(sim.enemy_group): bad += 1
+        print(f"{mode:>9}: {bad} of {steps} steps with slots out of step with the live enemies")
+        ok &= bad == 0
+        sim.reset()  # hand the sprites back to the pools
+    return ok
+
+def main():
+    game.assets.wait()
+    ok = recycling()
+    kind = game.enemy_kind(1, 16)
+    print(f"{'enemies':>8} {'loop ms':>8} {'free ms':>8} {'formation ms':>12} {'shots/step':>10}")
+    for n in (22, 100, 500, 2000):
+        rnd = random.Random(0)
+        loop = [LoopEnemy(kind, rnd) for _ in range(n)]
+        times = [timed(loop_step, loop)]
+        for mode in ("free", "formation"):
+            rnd = random.Random(0)
+            manager = EnemyManager(game.SCREEN_W, game.FORMATION_FLOOR, mode)
+            for _ in range(n):
+                manager.add(BatchEnemy(kind, rnd), rnd.choice([-1,1]) * kind.speed, rnd.uniform(*kind.shoot_rng))
+            if mode == "formation": manager.arrange()
+            times.append(timed(batch_step, manager))
+        print(f"{n:>8} {times[0][0]:>8.3f} {times[1][0]:>8.3f} {times[2][0]:>12.3f} {times[1][1]:>10.2f}")
+    print("PASS" if ok else "FAIL")
+    sys.exit(0 if ok else 1)
+
+if __name__ == "__main__":
+    main()
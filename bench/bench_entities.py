@@ -0,0 +1,91 @@
+import os, sys, time, tracemalloc
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+import main as game
+from entities import EntityGroup
+
+class SpriteEnemy(pygame.sprite.DirtySprite):
+    # The Sprite-based Enemy the slotted entity replaced, kept here as the baseline
+    def __init__(self, img, bullet_img, explosion_frames, spawn_rect, speed=140, shoot_cool=(0.9, 2.2), score=70):
+        super().__init__()
+        self.dirty = 2
+        self._layer = 1
+        self.image = img
+        self.base_img = img
+        self.rect = self.image.get_rect()
+        self.spawn_rect = spawn_rect
+        self.speed = speed
+        self.shoot_rng = shoot_cool
+        self.bullet_img = bullet_img
+        self.exp_frames = explosion_frames
+        self.score_val = score
+        rng = game.rng.spawn
+        self.rect.x = rng.randint(spawn_rect.left, spawn_rect.right - self.rect.width)
+        self.rect.y = rng.randint(spawn_rect.top, spawn_rect.bottom)
+        self.vx = rng.choice([-1,1]) * (speed + rng.uniform(-30,30))
+        self.shoot_t = rng.uniform(*shoot_cool)
+        self.alive = True
+
+class SpriteExplosion(pygame.sprite.DirtySprite):
+    def __init__(self, frames, center, fps=34):
+        super().__init__()
+        self.dirty = 2
+        self._layer = 2
+        self.frames = frames
+        self.index = 0
+        self.timer = 0.0
+        self.frame_time = 1.0 / fps
+        self.image = self.frames[0]
+        self.rect = self.image.get_rect(center=center)
+
+class SpritePowerUp(pygame.sprite.DirtySprite):
+    def __init__(self, center):
+        super().__init__()
+        self.dirty = 2
+        self._layer = 3
+        self.type = game.rng.powerup.choice(("heal", "rapid", "shield"))
+        self.image = game.surf_cache.get(("powerup", self.type), lambda: game.PowerUp.build_image(self))
+        self.rect = self.image.get_rect(center=center)
+        self.vy = 140
+        self.t = 9.0
+
+def memory_per_entity(build, n=5000):
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    items = [build() for _ in range(n)]
+    used = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+    del items
+    return used / n
+
+def churn_rate(build, group, n=20000):
+    # Entities constructed, added to a group and killed per second
+    start = time.perf_counter()
+    for _ in range(n):
+        e = build()
+        group.add(e)
+        e.kill()
+    return n / (time.perf_counter() - start)
+
+def main():
+    game.assets.wait()
+    kind = game.enemy_kind(1, 1)
+    frames = game.assets["exp1"]
+    cases = [
+        ("Enemy", lambda: SpriteEnemy(kind.img, kind.bullet_img, kind.exp_frames, game.spawn_rect, kind.speed, kind.shoot_rng, kind.score),
+                  lambda: game.Enemy(kind)),
+        ("Explosion", lambda: SpriteExplosion(frames, (100, 100)), lambda: game.Explosion(frames, (100, 100))),
+        ("PowerUp", lambda: SpritePowerUp((100, 100)), lambda: game.PowerUp((100, 100))),
+    ]
+    print(f"{'entity':<10} {'sprite B':>9} {'slotted B':>9} {'sprite /s':>10} {'slotted /s':>10} {'pooled /s':>10}")
+    for name, old, new in cases:
+        pool = game.pools[name.lower()]
+        pooled = lambda: pool.acquire(*({"Enemy": (kind,), "Explosion": (frames, (100, 100)), "PowerUp": ((100, 100),)}[name]))
+        print(f"{name:<10} {memory_per_entity(old):>9.0f} {memory_per_entity(new):>9.0f} "
+              f"{churn_rate(old, pygame.sprite.Group()):>10.0f} {churn_rate(new, EntityGroup()):>10.0f} {churn_rate(pooled, EntityGroup()):>10.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+import os, sys, time, random
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+import main as game
+import headless
+from bullets import BulletPool
+from masks import MaskCache
+from profiler import FrameProfiler
+
+def ship(size, angle):
+    # A rotated triangle on a transparent surface, shaped like the ship sprites
+    base = pygame.Surface((size, size), pygame.SRCALPHA)
+    pygame.draw.polygon(base, (200, 200, 255), [(size // 2, 4), (size - 6, size - 8), (6, size - 8)])
+    return pygame.transform.rotate(base, angle)
+
+def bullet():
+    img = pygame.Surface((10, 24), pygame.SRCALPHA)
+    pygame.draw.ellipse(img, (255, 220, 120), img.get_rect().inflate(-4, 0))
+    return img
+
+def narrowphase(pairs=20000):
+    # Random bullet/ship pairs whose rects overlap: how many the masks turn down
+    # and what a test costs once the masks are cached
+    rnd = random.Random(5)
+    ships = [ship(s, a) for s in (48, 64, 80) for a in (0, 15, 30, 45)]  # scaled and rotated variants
+    img = bullet()
+    masks = MaskCache()
+    pool = BulletPool(700)
+    cases = []
+    for _ in range(pairs):
+        target = rnd.choice(ships)
+        rect = target.get_rect(topleft=(300, 300))
+        x = rnd.uniform(rect.left - 4, rect.right + 4)
+        y = rnd.uniform(rect.top - 11, rect.bottom + 11)
+        slot = pool.spawn(x, y, img, -880)
+        pool.px[slot] = x; pool.py[slot] = y + 880 / 60
+        cases.append((slot, target, rect))
+    left, top, right, bottom = pool.bounds()
+    cases = [(s, t, r) for s, t, r in cases if left[s] < r.right and right[s] > r.left and top[s] < r.bottom and bottom[s] > r.top]
+    for s, t, r in cases[:50]: masks.bullet(pool, s, t, r)  # build the masks first
+    masks.reset_stats()
+    start = time.perf_counter()
+    for s, t, r in cases: masks.bullet(pool, s, t, r)
+    us = (time.perf_counter() - start) / len(cases) * 1e6
+    stats = masks.stats()
+    print(f"{len(cases)} rect-overlapping bullet/ship pairs over {len(ships)} ship variants ({stats['masks']} masks cached)")
+    print(f"  masks rejected {stats['rejects']} ({stats['rejects'] / stats['tests']:.0%}), {us:.2f} us per test")
+
+def in_game(frames=6000):
+    # Whole-simulation cost with the narrowphase off and on (the 'masks' profiler scope)
+    for on in (False, True):
+        game.MASK_COLLISIONS = on
+        game.profiler = FrameProfiler(window=frames, enabled=True)
+        sim, elapsed = headless.run(frames, game.SIM_DT, seed=4)
+        s = {r["scope"]: r for r in game.profiler.summary()}
+        masks = s["masks"]["mean"] if "masks" in s else 0.0
+        print(f"  masks {'on ' if on else 'off'}: {frames / elapsed:>6.0f} steps/s, collide {s['collide']['mean']:.3f} ms, "
+              f"masks {masks:.3f} ms per frame, score {sim.player.target_score}")
+
+def main():
+    game.assets.wait()
+    narrowphase()
+    print("headless autopilot run:")
+    in_game()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+import os, sys, time, random
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from particles import ParticleSystem
+
+SCREEN_W, SCREEN_H = 1200, 700
+
+class SpriteParticle(pygame.sprite.Sprite):
+    # The per-sprite particle the ParticleSystem replaced, kept here as the baseline
+    def __init__(self, pos, color, life=0.45, gravity=380, velocity_range=(-150,150,-240,-20)):
+        super().__init__()
+        self.image = pygame.Surface((3,3), pygame.SRCALPHA)
+        self.image.fill(color)
+        self.rect = self.image.get_rect(center=pos)
+        self.vx = random.uniform(velocity_range[0], velocity_range[1])
+        self.vy = random.uniform(velocity_range[2], velocity_range[3])
+        self.g = gravity
+        self.life = life
+        self.max_life = life
+    def update(self, dt):
+        self.life -= dt
+        if self.life <= 0:
+            self.kill(); return
+        self.vy += self.g * dt
+        self.rect.x += int(self.vx * dt)
+        self.rect.y += int(self.vy * dt)
+        self.image.set_alpha(int(255 * max(0, self.life/self.max_life)))
+
+def sprite_frame(screen, group, bursts):
+    for pos in bursts:
+        for _ in range(16): group.add(SpriteParticle(pos, (255, 170, 60), life=30.0))
+    group.update(1/60)
+    for p in group: screen.blit(p.image, p.rect)
+
+def system_frame(screen, system, bursts):
+    for pos in bursts:
+        system.emit(pos, (255, 170, 60), 16, life=30.0)
+    system.update(1/60)
+    system.draw(screen)
+
+def timed(frame, *args, frames=60, runs=3):
+    # Best of a few runs, as in bench_bullets
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        for _ in range(frames): frame(*args)
+        best = min(best, time.perf_counter() - start)
+    return best / frames * 1000.0
+
+def main(budget_ms=16.0):
+    random.seed(5)
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_W, SCREEN_H))
+    print(f"{'particles':>10} {'sprites ms':>11} {'system ms':>10} {'speedup':>8}")
+    for n in (1000, 5000, 20000):
+        bursts = [(random.randint(0, SCREEN_W), random.randint(0, SCREEN_H)) for _ in range(n // 16)]
+        group = pygame.sprite.Group()
+        system = ParticleSystem(capacity=n)
+        # One warm-up frame fills both to n live particles; the timed frames then
+        # recycle n//16 bursts per frame (sprites allocate, the system reuses slots)
+        sprite_frame(screen, group, bursts); system_frame(screen, system, bursts)
+        refill = bursts[:max(1, len(bursts) // 30)]
+        sprite_ms = timed(sprite_frame, screen, group, refill, frames=20)
+        system_ms = timed(system_frame, screen, system, refill, frames=20)
+        print(f"{n:>10} {sprite_ms:>11.3f} {system_ms:>10.3f} {sprite_ms / system_ms:>7.1f}x")
+    # The largest load has to fit a 60 FPS frame
+    print("PASS" if system_ms < budget_ms else "FAIL", f"{n} particles in {system_ms:.1f} ms (budget {budget_ms:.0f} ms)")
+
+if __name__ == "__main__":
+    main()
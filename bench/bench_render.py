@@ -0,0 +1,77 @@
+import os, sys, time, random
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import numpy as np
+import pygame
+import main as game
+from headless import autopilot
+from bench_scenarios import SCENARIOS
+
+def old_sprites(surf, sim, ox, oy):
+    # The per-sprite loops with rect.move() the draw lists replaced, kept here as the baseline
+    blits = 0
+    for a in sim.asteroid_group:
+        surf.blit(a.image, a.rect.move(ox, oy)); blits += 1
+    if sim.wave_active:
+        for e in sim.enemy_group:
+            surf.blit(e.image, e.rect.move(ox, oy)); blits += 1
+    sim.bullets.draw(surf, ox, oy); blits += len(sim.bullets)
+    for fx in sim.effects_group:
+        surf.blit(fx.frames[fx.index], fx.rect.move(ox, oy)); blits += 1
+    sim.particles.draw(surf, ox, oy); blits += len(sim.particles)
+    for p in sim.powerups_group:
+        glow = game.glow_ellipse((p.rect.width+18, p.rect.height+18), (240,240,255,70))
+        surf.blit(glow, glow.get_rect(center=p.rect.center).move(ox, oy))
+        surf.blit(p.image, p.rect.move(ox, oy)); blits += 2
+    player = sim.player
+    glow_alpha = game.alpha_bucket(30 + 20 * abs(game.math.sin(pygame.time.get_ticks() / 600)), 4)
+    hull = game.surf_cache.items.get(("hull_glow", player.image.get_size(), glow_alpha))
+    if hull is not None:
+        surf.blit(hull, player.rect.move(ox, oy)); blits += 1
+    surf.blit(player.image, player.rect.move(ox, oy)); blits += 1
+    return blits
+
+def new_sprites(surf, sim, ox, oy):
+    dl = game.draw_list
+    game.queue_sprites(dl, sim, ox, oy)
+    dl.submit(surf)
+    blits = dl.blits
+    dl.draw_calls = dl.blits = 0
+    return blits
+
+def run(name, frames=600, seed=1):
+    setup, per_frame = SCENARIOS[name]
+    sim = game.GameSimulation(seed)
+    rnd = random.Random(seed)
+    if setup: setup(sim, rnd)
+    screen = game.screen
+    times = {"old": [], "new": []}
+    counts = []
+    for i in range(frames):
+        sim.player.inv = 1.0
+        if per_frame: per_frame(sim, rnd, i)
+        keys, shoot = autopilot(sim)
+        sim.step(game.SIM_DT, keys, shoot)
+        ox, oy = rnd.randint(-4, 4), rnd.randint(-4, 4)  # shake is applied every frame here
+        for label, fn in (("old", old_sprites), ("new", new_sprites)):
+            t0 = time.perf_counter()
+            n = fn(screen, sim, ox, oy)
+            times[label].append((time.perf_counter() - t0) * 1000.0)
+        counts.append(n)
+    sim.reset()
+    return {k: np.array(v) for k, v in times.items()}, np.mean(counts)
+
+def main():
+    game.open_window()
+    game.assets.wait()
+    print(f"{'scenario':<16} {'blits':>6} {'old ms':>7} {'new ms':>7} {'old p99':>8} {'new p99':>8}")
+    for name in SCENARIOS:
+        times, blits = run(name)
+        print(f"{name:<16} {blits:>6.0f} {times['old'].mean():>7.3f} {times['new'].mean():>7.3f} "
+              f"{np.percentile(times['old'], 99):>8.3f} {np.percentile(times['new'], 99):>8.3f}")
+    print(f"draw calls per frame: {len(game.draw_list.order)} at most (one per layer), fblits: {hasattr(game.screen, 'fblits')}")
+
+if __name__ == "__main__":
+    main()
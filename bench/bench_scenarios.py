@@ -0,0 +1,151 @@
+import os, sys, gc, json, time, random, argparse
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import numpy as np
+import pygame
+import main as game
+from headless import autopilot
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scenarios_baseline.json")
+
+# ---------------- SCENARIOS ----------------
+# Each scenario gets a fresh seeded simulation: setup(sim, rnd) once, then
+# frame(sim, rnd, i) before every step. The player is made invulnerable so a
+# run never ends in game over.
+def late_waves_setup(sim, rnd):
+    # Wave 16+: spawn_wave is at its 22-enemy cap and the fastest shot cadence
+    sim.wave = 16
+    sim.wave_cooldown = 0
+
+def rapid_fire_setup(sim, rnd):
+    late_waves_setup(sim, rnd)
+
+def rapid_fire_frame(sim, rnd, i):
+    sim.player.rapid = sim.player.rapid_max
+
+def explosions_frame(sim, rnd, i):
+    # Every half second blow up the whole wave (plus an extra particle burst each) and respawn it
+    if i % 30 or not sim.wave_active: return
+    for e in list(sim.enemy_group):
+        e.explode(sim.effects_group, sim.particles)
+        sim.particles.emit(e.rect.center, (255, 240, 200), 64, life=0.8)
+        e.kill()
+    sim.spawn_wave(22, sim.wave)
+
+def powerup_flood_frame(sim, rnd, i):
+    for _ in range(4):
+        sim.powerups_group.add(game.powerup_pool.acquire((rnd.randint(20, game.SCREEN_W - 20), rnd.randint(130, 400))))
+
+def asteroid_storm_frame(sim, rnd, i):
+    # Rocks pouring in on top of a late wave until a few hundred are on screen at once
+    # (each large one the autopilot shoots splits in two, and each half in two again)
+    sim.asteroid_spawner.rate, sim.asteroid_spawner.limit, sim.asteroid_spawner.burst = 90.0, 400, 4.0
+
+SCENARIOS = {
+    "late_waves": (late_waves_setup, None),
+    "rapid_fire": (rapid_fire_setup, rapid_fire_frame),
+    "mass_explosions": (late_waves_setup, explosions_frame),
+    "powerup_flood": (None, powerup_flood_frame),
+    "asteroid_storm": (late_waves_setup, asteroid_storm_frame),
+}
+
+def run_scenario(name, frames=900, warmup=60, seed=1):
+    setup, per_frame = SCENARIOS[name]
+    sim = game.GameSimulation(seed)
+    rnd = random.Random(seed)
+    if setup: setup(sim, rnd)
+    screen = game.screen
+    caches = (game.surf_cache, game.text_cache)
+    times = []
+    peaks = {"enemies": 0, "bullets": 0, "effects": 0, "particles": 0, "powerups": 0, "asteroids": 0}
+    for i in range(warmup + frames):
+        if i == warmup:
+            for c in caches: c.reset_stats()
+            gc0 = gc.get_stats()[0]["collections"]
+            blocks = sys.getallocatedblocks()
+            start = time.perf_counter()
+        t0 = time.perf_counter()
+        sim.player.inv = 1.0
+        if per_frame: per_frame(sim, rnd, i)
+        keys, shoot = autopilot(sim)
+        sim.step(game.SIM_DT, keys, shoot)
+        game.draw_game(screen, sim)
+        pygame.display.flip()
+        if i >= warmup:
+            times.append((time.perf_counter() - t0) * 1000.0)
+            for key, n in (("enemies", len(sim.enemy_group)), ("bullets", len(sim.bullets)), ("effects", len(sim.effects_group)),
+                           ("particles", len(sim.particles)), ("powerups", len(sim.powerups_group)),
+                           ("asteroids", len(sim.asteroid_group))):
+                if n > peaks[key]: peaks[key] = n
+    elapsed = time.perf_counter() - start
+    times = np.array(times)
+    result = {
+        "fps": frames / elapsed,
+        "p50_ms": float(np.percentile(times, 50)),
+        "p99_ms": float(np.percentile(times, 99)),
+        "peak": peaks,
+        # Surfaces built by the caches, GC passes and net memory blocks over the timed frames
+        "surface_allocs": sum(c.allocations for c in caches),
+        "gc_gen0": gc.get_stats()[0]["collections"] - gc0,
+        "blocks_delta": sys.getallocatedblocks() - blocks,
+        "wave": sim.wave,
+        "pool_high_water": {name: p.high_water for name, p in game.pools.items()},
+    }
+    sim.reset()  # hand this run's sprites back to the pools
+    return result
+
+# ---------------- BASELINE ----------------
+def regressions(result, base, tolerance):
+    # Slower than the stored baseline by more than tolerance on fps or p99
+    flags = []
+    if result["fps"] < base["fps"] * (1 - tolerance):
+        flags.append(f"fps {result['fps']:.0f} < {base['fps']:.0f}")
+    if result["p99_ms"] > base["p99_ms"] * (1 + tolerance):
+        flags.append(f"p99 {result['p99_ms']:.2f} > {base['p99_ms']:.2f} ms")
+    return flags
+
+def main():
+    parser = argparse.ArgumentParser(description="Stress scenarios for the game loop (dummy SDL drivers).")
+    parser.add_argument("scenarios", nargs="*", default=list(SCENARIOS), help=f"any of {', '.join(SCENARIOS)}")
+    parser.add_argument("--frames", type=int, default=900)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown before flagging (0.25 = 25%%; runs vary ~10%%)")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--update-baseline", action="store_true", help="store these results as the new baseline")
+    args = parser.parse_args()
+
+    game.open_window()
+    game.assets.wait()
+    try:
+        with open(args.baseline) as f: baseline = json.load(f)
+    except (OSError, ValueError):
+        baseline = {}
+
+    print(f"{'scenario':<16} {'fps':>7} {'p50 ms':>7} {'p99 ms':>7} {'enemy':>5} {'bullet':>6} {'fx':>4} {'parts':>6} {'pwr':>5} {'rock':>5} {'surf':>4} {'gc0':>5} {'blocks':>7}  vs baseline")
+    results = {}
+    failed = False
+    for name in args.scenarios:
+        r = results[name] = run_scenario(name, args.frames, seed=args.seed)
+        p = r["peak"]
+        base = baseline.get(name)
+        if base is None: verdict = "no baseline"
+        else:
+            flags = regressions(r, base, args.tolerance)
+            failed |= bool(flags)
+            verdict = "REGRESSION: " + ", ".join(flags) if flags else f"ok ({r['fps'] / base['fps'] - 1:+.0%} fps)"
+        print(f"{name:<16} {r['fps']:>7.0f} {r['p50_ms']:>7.2f} {r['p99_ms']:>7.2f} {p['enemies']:>5} {p['bullets']:>6} {p['effects']:>4} "
+              f"{p['particles']:>6} {p['powerups']:>5} {p.get('asteroids', 0):>5} {r['surface_allocs']:>4} {r['gc_gen0']:>5} {r['blocks_delta']:>7}  {verdict}")
+
+    print(f"pools: {game.pool_report()}")
+
+    if args.update_baseline:
+        baseline.update(results)
+        with open(args.baseline, "w") as f: json.dump(baseline, f, indent=1)
+        print(f"baseline written to {args.baseline}")
+        return True
+    return not failed
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,57 @@
+import os, sys, time, shutil, tempfile, subprocess
+import numpy as np
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+import pygame
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN = os.path.join(ROOT, "main.py")
+
+# Stand-ins for the sprite files main.py loads (the real art is not shipped in the repo)
+ASSETS = {
+    "freepik__upload__31851.png": (1920, 1080),
+    "PNG/Example/03.png": (168, 168), "PNG/Bullets/12.png": (24, 48), "PNG/Flame/11.png": (64, 64),
+    "11.png": (24, 48), "09.png": (24, 48), "04.png": (24, 48), "02.png": (24, 48),
+    "Ship6/Ship6-ezgif.com-rotate.png": (512, 512), "Ship4-ezgif.com-rotate.png": (512, 512),
+    "Ship3-ezgif.com-rotate.png": (512, 512), "Ship5-ezgif.com-rotate.png": (512, 512),
+    "Setofcolorfulasteroidsofdifferentshapestexturesandsize-ezgif.com-crop.jpg": (1024, 768),
+}
+
+def make_assets(folder):
+    rng = np.random.default_rng(0)
+    for rel, (w, h) in ASSETS.items():
+        path = os.path.join(folder, rel)
+        os.makedirs(os.path.dirname(path) or folder, exist_ok=True)
+        pixels = rng.integers(0, 256, (h, w, 4), dtype=np.uint8)
+        pygame.image.save(pygame.image.frombytes(pixels.tobytes(), (w, h), "RGBA"), path)
+    # The sound files are in the repo, so the real ones are used
+    for fn in os.listdir(ROOT):
+        if fn.lower().endswith((".mp3", ".wav")): shutil.copy(os.path.join(ROOT, fn), folder)
+
+def launch(folder):
+    # Wall time from process spawn to exit once the background loads are done,
+    # plus main.py's own first-frame/ready lines and per-asset table
+    start = time.perf_counter()
+    out = subprocess.run([sys.executable, MAIN, "--startup-report"], cwd=folder, capture_output=True, text=True, check=True).stdout
+    wall = (time.perf_counter() - start) * 1000.0
+    lines = out.splitlines()
+    first = [i for i, line in enumerate(lines) if line.startswith("first menu frame")]
+    return wall, lines[first[-1]:] if first else []
+
+def main(runs=3):
+    folder = tempfile.mkdtemp(prefix="si_startup_")
+    try:
+        make_assets(folder)
+        for label, clear in (("cold cache", True), ("warm cache", False)):
+            walls = []
+            for _ in range(runs):
+                if clear: shutil.rmtree(os.path.join(folder, ".asset_cache"), ignore_errors=True)
+                wall, report = launch(folder)
+                walls.append(wall)
+            print(f"{label}: process start -> all assets ready {min(walls):.0f} ms (best of {runs})")
+            print("\n".join("  " + line for line in report))
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import os, sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+import main as game
+
+RATES = (30, 60, 144, 1000)  # 1000 stands in for an uncapped loop
+SECONDS = 3.0
+
+def truncated(v, rate, start=0):
+    # The old rect.x += int(v * dt) integration, kept here as the baseline
+    pos = start
+    for _ in range(int(SECONDS * rate)):
+        pos += int(v / rate)
+    return pos
+
+def enemy_x(rate):
+    game.rng.seed(1)
+    kind = game.enemy_kind(1, 1)
+    enemies = game.EnemyManager(game.SCREEN_W, game.FORMATION_FLOOR)
+    enemies.add(game.Enemy(kind), kind.speed, 1.0)
+    for _ in range(int(SECONDS * rate)):
+        enemies.update(1.0 / rate)
+    return enemies.x[0]
+
+def powerup_y(rate):
+    game.rng.seed(1)
+    p = game.PowerUp((600, 100))
+    for _ in range(int(SECONDS * rate)):
+        p.update(1.0 / rate)
+    return p.y
+
+def player_x(rate, seconds=0.5):
+    sim = game.GameSimulation(1)
+    player = sim.player
+    right = game.KeyState([pygame.K_RIGHT])
+    for _ in range(int(seconds * rate)):
+        player.update(1.0 / rate, right)
+    return player.x
+
+def main():
+    game.assets.wait()
+    print(f"position after {SECONDS:.0f}s of simulated time (player: 0.5s) at each update rate")
+    print(f"{'':<22}" + "".join(f"{r:>10} Hz" for r in RATES))
+    rows = [
+        ("enemy x", enemy_x),
+        ("power-up y", powerup_y),
+        ("player x", player_x),
+        ("old int(v*dt), 140/s", lambda r: truncated(140, r)),
+        ("old int(v*dt), 420/s", lambda r: truncated(420, r)),
+    ]
+    for label, fn in rows:
+        values = [fn(r) for r in RATES]
+        spread = max(values) - min(values)
+        print(f"{label:<22}" + "".join(f"{v:>13.2f}" for v in values) + f"   spread {spread:.2f} px")
+
+if __name__ == "__main__":
+    main()
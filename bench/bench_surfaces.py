@@ -0,0 +1,29 @@
+import os, sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import main as game
+from headless import autopilot
+
+def main(warmup=2400, frames=1200):
+    # Render the game headless and check the surface and text caches stop allocating once warm
+    game.open_window()
+    sim = game.GameSimulation(11)
+    for i in range(warmup + frames):
+        if i == warmup:
+            game.surf_cache.reset_stats(); game.text_cache.reset_stats()
+        keys, shoot = autopilot(sim)
+        sim.step(game.SIM_DT, keys, shoot)
+        if sim.game_over: sim.reset()
+        game.draw_game(game.screen, sim)
+    allocations = 0
+    for name, cache in (("surfaces", game.surf_cache), ("text", game.text_cache)):
+        stats = cache.stats()
+        allocations += stats["allocations"]
+        print(f"{name} steady state over {frames} frames: " + ", ".join(f"{k}={v}" for k, v in stats.items()))
+    print("PASS: no surfaces allocated" if allocations == 0 else "FAIL: hot loop still allocates surfaces")
+    return allocations == 0
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,46 @@
+import os, sys, time, random
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pygame
+from bullets import BulletPool
+
+SCREEN_W, SCREEN_H = 1200, 700
+# Timing only; tests/test_swept.py checks the hits against a sub-stepped reference
+
+def static_hit_lists(pool, rects, friendly):
+    # The end-of-move overlap test the swept one replaced, kept here as the baseline
+    n = pool.count
+    if not n or not rects: return []
+    left, top, right, bottom = pool.bounds()
+    side = np.flatnonzero(pool.alive[:n] & (pool.friendly[:n] == friendly))
+    if not len(side): return []
+    r = np.array([(t.left, t.top, t.right, t.bottom) for t in rects])
+    m = ((left[side, None] < r[None, :, 2]) & (right[side, None] > r[None, :, 0]) &
+         (top[side, None] < r[None, :, 3]) & (bottom[side, None] > r[None, :, 1]))
+    rows = np.flatnonzero(m.any(axis=1))
+    return [(int(side[row]), np.flatnonzero(m[row]).tolist()) for row in rows]
+
+def timing(img, n=1000, frames=200):
+    rnd = random.Random(3)
+    enemies = [pygame.Rect(rnd.randint(0, SCREEN_W - 48), rnd.randint(40, 230), 48, 48) for _ in range(22)]
+    pool = BulletPool(SCREEN_H)
+    for _ in range(n):
+        f = rnd.random() < 0.7
+        pool.spawn(rnd.randint(0, SCREEN_W), rnd.randint(0, SCREEN_H), img, -880 if f else 400, f)
+    pool.update(1 / 60)
+    out = []
+    for fn in (static_hit_lists, BulletPool.hit_lists):
+        start = time.perf_counter()
+        for _ in range(frames): fn(pool, enemies, True)
+        out.append((time.perf_counter() - start) / frames * 1000.0)
+    return out
+
+def main():
+    img = pygame.Surface((10, 24))
+    for n in (200, 1000, 4000):
+        static_ms, swept_ms = timing(img, n)
+        print(f"{n:>5} bullets x 22 enemies: end-position {static_ms:.3f} ms, swept {swept_ms:.3f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+from bisect import bisect_right
+from itertools import accumulate, chain
+import numpy as np
+from pygame import Rect
+from spatial import SpatialHash
+
+def rect_array(rects):
+    # M x 4 (left, top, right, bottom) array of a list of Rects; arrays pass through
+    if isinstance(rects, np.ndarray): return rects
+    r = np.fromiter(chain.from_iterable(rects), np.intp, 4 * len(rects)).reshape(-1, 4)
+    r[:, 2:] += r[:, :2]
+    return r
+
+# ---------------- BULLET POOL ----------------
+class BulletPool:
+    # Structure-of-arrays storage for every bullet in flight. Bullets occupy slots
+    # [0, count) in spawn order, killed ones until compact() drops them; movement,
+    # off-screen culling and swept AABB tests are single NumPy passes instead of
+    # one Sprite/Rect per bullet.
+    #
+    # The per-slot floats share one array, a row per field (FIELDS; x, y etc. are
+    # views of its rows), so a step costs the same handful of array operations
+    # whether 20 bullets are in flight or 2000, and collide() answers the player,
+    # enemy and asteroid queries with one sweep.
+    FIELDS = ("x", "y", "px", "py", "vx", "vy", "hw", "hh", "w", "h")  # px, py: position before the last update
+
+    def __init__(self, screen_h, capacity=512, margin=60, small_max=120):
+        self.screen_h = screen_h
+        self.margin = margin
+        self.small_max = small_max # up to this many bullets collide() against Rect lists uses touching()
+        self.count = 0
+        self.box = None   # layout() and paths() results, see there
+        self.path = None
+        self.dead = False # a slot was killed or culled since the last compact()
+        self.grid = SpatialHash() # broadphase for sweep()
+        self.allocate(capacity)
+
+        # Registered bullet images; sizes are copied into the slots at spawn
+        self.images = []
+        self.image_ids = {}
+        self.sizes = []
+
+    def allocate(self, capacity):
+        old = self.count
+        arrays = {
+            "state": np.zeros((len(self.FIELDS), capacity)),
+            "friendly": np.zeros(capacity, bool),
+            "img": np.zeros(capacity, np.int16),
+            "alive": np.zeros(capacity, bool),
+        }
+        for name, arr in arrays.items():
+            if old: arr[..., :old] = getattr(self, name)[..., :old]
+            setattr(self, name, arr)
+        for i, name in enumerate(self.FIELDS):
+            setattr(self, name, self.state[i])
+        self.capacity = capacity
+
+    def __len__(self):
+        return int(np.count_nonzero(self.alive[:self.count]))
+
+    def image_index(self, img):
+        i = self.image_ids.get(id(img))
+        if i is None:
+            i = self.image_ids[id(img)] = len(self.images)
+            self.images.append(img)
+            self.sizes.append(img.get_size())
+        return i
+
+    def spawn(self, x, y, img, vy, friendly=True, vx=0.0):
+        # Same arguments as the old Bullet sprite: (x, y) is the bullet's center
+        if self.count == self.capacity:
+            self.allocate(self.capacity * 2)
+        i = self.count
+        k = self.image_index(img)
+        w, h = self.sizes[k]
+        self.state[:, i] = (x, y, x, y, vx, vy, w // 2, h // 2, w, h)
+        self.friendly[i] = friendly
+        self.img[i] = k
+        self.alive[i] = True
+        self.count += 1
+        self.box = self.path = None
+        return i
+
+    def kill(self, i):
+        self.alive[i] = False
+        self.dead = True
+
+    def kill_side(self, friendly):
+        n = self.count
+        self.alive[:n] &= self.friendly[:n] != friendly
+        self.dead = True
+
+    def clear(self):
+        self.alive[:self.count] = False
+        self.count = 0
+        self.box = self.path = None
+        self.dead = False
+
+    def compact(self):
+        # Drop dead slots, keeping the survivors in spawn order; the cached layout()
+        # is cut down with the slots. Put off while the dead are under a quarter of
+        # the slots in use: until then they cost the array passes less than moving
+        # every slot down each step would.
+        if not self.dead: return
+        n = self.count
+        keep = self.alive[:n]
+        k = int(np.count_nonzero(keep))
+        if 4 * (n - k) < n and k: return
+        self.dead = False
+        if k == n: return
+        if self.box is not None: self.box = self.box[:, keep]
+        self.path = None
+        for arr in (self.state, self.friendly, self.img):
+            arr[..., :k] = arr[..., :n][..., keep]
+        self.alive[:k] = True
+        self.alive[k:n] = False
+        self.count = k
+
+    def update(self, dt):
+        n = self.count
+        if not n: return
+        s = self.state[:, :n]
+        s[2:4] = s[0:2]
+        s[0:2] += s[4:6] * dt
+        box = self.box = self.layout()
+        self.path = None
+        # Killed once off the top or bottom by more than margin; like kill(), the
+        # slot stays until compact(), which the caller runs once after collide()
+        lo, hi = -self.margin, self.screen_h + self.margin
+        if box[3].min() < lo or box[1].max() > hi:
+            self.alive[:n] &= (box[3] >= lo) & (box[1] <= hi)
+            self.dead = True
+
+    def layout(self):
+        # 4 x n left, top, right, bottom of every slot, matching Surface.get_rect(center=...)
+        s = self.state[:, :self.count]
+        box = np.empty((4, self.count))
+        np.floor(s[0:2], out=box[:2])
+        box[:2] -= s[6:8]
+        np.add(box[:2], s[8:10], out=box[2:])
+        return box
+
+    def bounds(self):
+        # The layout() boxes; update() works them out once per step and they are
+        # kept until the next spawn/move
+        if self.box is None: self.box = self.layout()
+        return self.box
+
+    def paths(self):
+        # 4 x n box covering each slot's whole last move, and the 2 x n left, top it
+        # started from; cached like bounds()
+        if self.path is None:
+            box = self.bounds()
+            s = self.state[:, :self.count]
+            start = np.floor(s[2:4])
+            start -= s[6:8]
+            swept = np.empty_like(box)
+            np.minimum(start, box[:2], out=swept[:2])
+            np.maximum(start, box[:2], out=swept[2:])
+            swept[2:] += s[8:10]
+            self.path = (swept, start)
+        return self.path
+
+    def sweep(self, r, target):
+        # Swept AABB test of every live bullet, each moving from its previous to its
+        # current box, against the rects r (4 x M left, top, right, bottom); rect j
+        # only takes bullets whose friendly flag is target[j]. Returns (slots, rect
+        # columns, entry times in [0, 1]) of the touching pairs, by slot; at any dt
+        # the result is what sub-stepping would find. The entry times are None
+        # when the broadphase pairs are already the answer, see exact().
+        swept = self.paths()[0]
+        # Broadphase: the box covering the whole move against the rects, through the grid
+        rows, cols = self.grid.pairs(swept, r, self.friendly[:self.count], target)
+        if self.dead and len(rows):
+            live = self.alive[rows]
+            rows = rows[live]; cols = cols[live]
+        if not len(rows) or self.exact(rows): return rows, cols, None
+        return self.narrow(rows, cols, r[:, cols])
+
+    def touching(self, queries):
+        # sweep() for collide() queries that are all lists of Rects, in pygame's own
+        # Rect.collidelistall: the swept boxes within the union of a query's rects,
+        # then each of those against the rects. For a few bullets that beats the
+        # fixed cost of the array passes and of turning the Rects into an array.
+        # Columns run through the queries' rects in order.
+        n = self.count
+        swept = self.paths()[0]
+        boxes = list(map(Rect, *swept[:2].tolist(), *(swept[2:] - swept[:2]).tolist()))
+        friendly = self.friendly[:n].tolist()
+        live = self.alive[:n].tolist()
+        pairs = []
+        first = 0
+        for rects, side in queries:
+            if rects:
+                for i in rects[0].unionall(rects).collidelistall(boxes):
+                    if friendly[i] == side and live[i]:
+                        pairs += [(i, first + j) for j in boxes[i].collidelistall(rects)]
+            first += len(rects)
+        if not pairs: return np.zeros(0, np.intp), np.zeros(0, np.intp), None
+        pairs.sort()
+        rows, cols = np.array(pairs, np.intp).T
+        if self.exact(rows): return rows, cols, None
+        rects = [rect for q, _ in queries for rect in q]
+        return self.narrow(rows, cols, rect_array([rects[j] for j in cols.tolist()]).T)
+
+    def exact(self, rows):
+        # A bullet with no sideways speed moves its box straight up or down, which
+        # covers exactly its swept box: the broadphase pairs (rows ordered by slot)
+        # are then the answer, unless a bullet touched several rects to be ordered
+        return not (self.vx[rows].any() or (rows[1:] == rows[:-1]).any())
+
+    def narrow(self, rows, cols, r):
+        # Narrowphase of sweep() on broadphase pairs, r holding each pair's rect
+        # (4 x K): slab test of the top-left corner's path against the rect grown by
+        # the bullet size; the box overlaps while left is in (L - w, R) and top in (T - h, B)
+        a = self.paths()[1][:, rows]
+        d = self.box[:2, rows] - a
+        lo = r[:2] - self.state[8:10, rows]; hi = r[2:]
+        moving = d != 0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ta = (lo - a) / d; tb = (hi - a) / d
+        enter = np.where(moving, np.minimum(ta, tb), 0.0).max(axis=0, initial=0.0)
+        leave = np.where(moving, np.maximum(ta, tb), 1.0).min(axis=0, initial=1.0)
+        # Still along an axis: overlapping throughout or never
+        leave[(~moving & ((a <= lo) | (a >= hi))).any(axis=0)] = -1.0
+        touch = (enter < leave) & (leave > 0)
+        return rows[touch], cols[touch], enter[touch]
+
+    def collide(self, queries):
+        # hit_lists() for several (rects, friendly) queries from one sweep: one list
+        # per query, [(slot, [rect indices])] for every live bullet of that side that
+        # touched any of its rects during the last move. Each index list is ordered
+        # by when along the move the bullet reached the rect, so callers can stop at
+        # the first one it struck. rects may also be an M x 4 (left, top, right,
+        # bottom) array already.
+        out = [[] for _ in queries]
+        sizes = [len(rects) for rects, _ in queries]
+        if not self.count or not any(sizes): return out
+        if self.count <= self.small_max and not any(isinstance(rects, np.ndarray) for rects, _ in queries):
+            rows, cols, enter = self.touching(queries)
+        else:
+            r = np.concatenate([rect_array(rects) for rects, _ in queries if len(rects)]).T
+            rows, cols, enter = self.sweep(r, np.repeat([friendly for _, friendly in queries], sizes))
+        if not len(rows): return out
+        if enter is not None:
+            order = np.lexsort((cols, enter, rows))  # same order whichever broadphase ran
+            rows = rows[order]; cols = cols[order]
+        # Pairs come by slot, so each query's list does too
+        ends = list(accumulate(sizes))
+        for row, col in zip(rows.tolist(), cols.tolist()):
+            q = bisect_right(ends, col)
+            hits = out[q]
+            col -= ends[q] - sizes[q]
+            if hits and hits[-1][0] == row: hits[-1][1].append(col)
+            else: hits.append((row, [col]))
+        return out
+
+    def hit_lists(self, rects, friendly):
+        # collide() for one query
+        return self.collide([(rects, friendly)])[0]
+
+    def hits(self, rect, friendly):
+        # Slots of live bullets of one side that touched rect during the last move, in spawn order
+        return [slot for slot, _ in self.collide([([rect], friendly)])[0]]
+
+    def blit_list(self, ox=0, oy=0, alpha=1.0):
+        # (surface, pos) pairs for a batched blit; alpha < 1 places the bullets
+        # between the previous and the current positions
+        n = self.count
+        if not n: return []
+        if alpha < 1.0:
+            s = self.state[:, :n]
+            pos = np.floor(s[2:4] + (s[0:2] - s[2:4]) * alpha) - s[6:8]
+        else:
+            pos = self.bounds()
+        img = self.img[:n]
+        if self.dead:  # slots compact() has not dropped yet
+            live = np.flatnonzero(self.alive[:n])
+            pos = pos[:, live]; img = img[live]
+        return list(zip(map(self.images.__getitem__, img.tolist()),
+                        zip((pos[0] + ox).astype(int).tolist(), (pos[1] + oy).astype(int).tolist())))
+
+    def draw(self, surf, ox=0, oy=0, doreturn=False, alpha=1.0):
+        # With doreturn the blitted rects come back for dirty-rect presentation
+        seq = self.blit_list(ox, oy, alpha)
+        if not seq: return []
+        return surf.blits(seq, doreturn) or []
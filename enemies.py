@@ -0,0 +1,172 @@
+import heapq
+import numpy as np
+
+# ---------------- ENEMY MANAGER ----------------
+class EnemyManager:
+    # Movement and shot timing for the live wave. Positions and velocities sit in
+    # arrays (slot order = order added), moved for all enemies in one NumPy pass
+    # and copied to the rects afterwards. Shots come from a min-heap of next-fire
+    # times, so a step only touches the enemies that actually fire.
+    #
+    # mode "free": each enemy drifts sideways and bounces off the screen edges.
+    # mode "formation": the wave is laid out as a grid that steps sideways as one
+    # block, drops a row and reverses at an edge, stepping faster as it thins out.
+    FORMATION_COLS = 11
+    FORMATION_GAP = (16, 14)
+    FORMATION_STEP = 14       # px per tick
+    FORMATION_DROP = 26       # px per edge hit
+    FORMATION_INTERVAL = 0.45 # s per tick with the whole wave alive
+    FORMATION_MIN_INTERVAL = 0.05
+
+    def __init__(self, screen_w, floor, mode="free", capacity=32):
+        self.screen_w = screen_w
+        self.floor = floor  # formations stop dropping here
+        self.mode = mode
+        self.enemies = []
+        self.allocate(capacity)
+        self.clear()
+
+    def allocate(self, capacity):
+        old = len(self.enemies)
+        for name in ("x", "px", "y", "vx", "w", "next_t"):
+            arr = np.zeros(capacity)
+            if old: arr[:old] = getattr(self, name)[:old]
+            setattr(self, name, arr)
+        self.capacity = capacity
+
+    def clear(self):
+        for e in self.enemies: e.manager = None
+        self.enemies = []
+        self.heap = []
+        self.time = 0.0
+        self.seq = 0
+        self.dead = False
+        self.direction = 1.0
+        self.tick_t = 0.0
+        self.formed = 0
+
+    def __len__(self):
+        return len(self.enemies)
+
+    def add(self, e, vx, first_shot):
+        # e.rect holds its spawn position; first_shot is the delay (s) to its first shot.
+        # Killed slots go first: a pooled enemy can come straight back, and its old
+        # slot would otherwise look live again.
+        if self.dead: self.compact()
+        n = len(self.enemies)
+        if n == self.capacity: self.allocate(self.capacity * 2)
+        e.manager = self
+        e.slot = n
+        self.enemies.append(e)
+        self.x[n] = self.px[n] = e.rect.x
+        self.y[n] = e.rect.y
+        self.vx[n] = vx
+        self.w[n] = e.rect.width
+        self.schedule(e, first_shot)
+
+    def remove(self, e):
+        # Dropped from the arrays at the start of the next update
+        e.manager = None
+        self.dead = True
+
+    def compact(self):
+        keep = [i for i, e in enumerate(self.enemies) if e.manager is self]
+        k = len(keep)
+        for name in ("x", "px", "y", "vx", "w", "next_t"):
+            arr = getattr(self, name)
+            arr[:k] = arr[keep]
+        self.enemies = [self.enemies[i] for i in keep]
+        for i, e in enumerate(self.enemies): e.slot = i
+        self.dead = False
+
+    def schedule(self, e, delay):
+        t = self.next_t[e.slot] = self.time + delay
+        self.seq += 1
+        e.token = self.seq
+        heapq.heappush(self.heap, (t, self.seq, e))
+
+    def due(self):
+        # Enemies whose next shot time has passed, earliest first; the caller fires
+        # and schedules the next one. Entries of killed or recycled enemies are stale
+        # (their token moved on) and are dropped as they surface.
+        heap = self.heap
+        out = []
+        while heap and heap[0][0] <= self.time:
+            _, seq, e = heapq.heappop(heap)
+            if e.manager is self and e.token == seq: out.append(e)
+        return out
+
+    def arrange(self):
+        # Lay the current enemies out as a formation grid, top centre
+        n = len(self.enemies)
+        if not n: return
+        cols = min(n, self.FORMATION_COLS)
+        cw = self.w[:n].max() + self.FORMATION_GAP[0]
+        ch = max(e.rect.height for e in self.enemies) + self.FORMATION_GAP[1]
+        i = np.arange(n)
+        left = (self.screen_w - cols * cw + self.FORMATION_GAP[0]) / 2
+        self.x[:n] = self.px[:n] = np.floor(left + (i % cols) * cw)
+        self.y[:n] = 40 + (i // cols) * ch
+        self.direction = 1.0
+        self.tick_t = self.FORMATION_INTERVAL
+        self.formed = n
+        self.sync()
+
+    def update(self, dt):
+        if self.dead: self.compact()
+        self.time += dt
+        n = len(self.enemies)
+        if not n: return
+        x = self.x[:n]
+        self.px[:n] = x
+        if self.mode == "formation":
+            # The rects only change on a tick
+            if self.step_formation(dt, n): self.sync()
+            return
+        # Float positions reflected off the edges by the overshoot, so the path
+        # is the same whatever dt the steps come in
+        vx = self.vx[:n]
+        right = self.screen_w - self.w[:n]
+        x += vx * dt
+        lo = x <= 0
+        hi = x >= right
+        x[lo] = -x[lo]; vx[lo] = np.abs(vx[lo])
+        x[hi] = 2 * right[hi] - x[hi]; vx[hi] = -np.abs(vx[hi])
+        self.sync()
+
+    def step_formation(self, dt, n):
+        self.tick_t -= dt
+        if self.tick_t > 0: return False
+        interval = self.FORMATION_INTERVAL * n / max(self.formed, n)
+        self.tick_t += max(self.FORMATION_MIN_INTERVAL, interval)
+        x = self.x[:n]
+        moved = x + self.direction * self.FORMATION_STEP
+        if (moved < 0).any() or (moved > self.screen_w - self.w[:n]).any():
+            y = self.y[:n]
+            y += min(self.FORMATION_DROP, max(0.0, self.floor - y.max()))
+            self.direction = -self.direction
+        else:
+            x[:] = moved
+        return True
+
+    def sync(self):
+        # Copy positions to the rects (collisions and drawing read those)
+        n = len(self.enemies)
+        for e, x, y in zip(self.enemies, self.x[:n].tolist(), self.y[:n].tolist()):
+            e.rect.x = x; e.rect.y = y
+
+    def blit_list(self, ox=0, oy=0, alpha=1.0):
+        # (image, pos) per enemy, alpha < 1 drawn between the previous and current step
+        if self.dead: self.compact()
+        n = len(self.enemies)
+        if not n: return []
+        # From the rects, so sprites sit where they collide (pygame rounds the float x)
+        if alpha >= 1.0: return [(e.image, (e.rect.x + ox, e.rect.y + oy)) for e in self.enemies]
+        dx = np.round((self.px[:n] - self.x[:n]) * (1.0 - alpha)).astype(int) + ox
+        return [(e.image, (e.rect.x + x, e.rect.y + oy)) for e, x in zip(self.enemies, dx.tolist())]
+
+    def state(self):
+        # Bytes of the movement and shot state, for replay hashes
+        if self.dead: self.compact()
+        n = len(self.enemies)
+        return b"".join(arr[:n].tobytes() for arr in (self.x, self.y, self.vx, self.next_t))
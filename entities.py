@@ -0,0 +1,56 @@
+# ---------------- ENTITIES ----------------
+class Entity:
+    # Slotted base for the short-lived game objects (enemies, explosions, power-ups).
+    # Unlike pygame.sprite.Sprite there is no per-instance __dict__ or set of groups:
+    # an entity sits in at most one EntityGroup and, when pooled, goes back to its
+    # SpritePool on kill().
+    __slots__ = ("image", "rect", "group", "pool", "pooled")
+
+    def __init__(self):
+        self.group = None
+        self.pool = None
+        self.pooled = False  # sitting in the pool's free list
+
+    def kill(self):
+        if self.group is not None: self.group.remove(self)
+        if self.pool is not None: self.pool.release(self)
+
+    def update(self, dt):
+        pass
+
+class EntityGroup:
+    # Insertion-ordered set of entities with the slice of the pygame Group API the
+    # game uses; iterating takes a snapshot, so entities may be killed mid-loop
+    def __init__(self):
+        self.items = {}
+
+    def add(self, *entities):
+        for e in entities:
+            if e.group is self: continue
+            if e.group is not None: e.group.remove(e)
+            e.group = self
+            self.items[e] = None
+
+    def remove(self, e):
+        if e.group is self:
+            del self.items[e]
+            e.group = None
+
+    def empty(self):
+        for e in self.items: e.group = None
+        self.items.clear()
+
+    def update(self, dt):
+        for e in list(self.items): e.update(dt)
+
+    def __iter__(self):
+        return iter(list(self.items))
+
+    def __len__(self):
+        return len(self.items)
+
+    def __bool__(self):
+        return bool(self.items)
+
+    def __contains__(self, e):
+        return e in self.items
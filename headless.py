@@ -0,0 +1,90 @@
+import os, sys, time, argparse
+# Run the game logic without a window or audio device
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+import main as game
+from replay import InputLog, key_mask
+
+def autopilot(sim):
+    # Chase the closest enemy horizontally and fire whenever the gun is ready
+    player = sim.player
+    pressed = []
+    if sim.enemy_group:
+        target = min(sim.enemy_group, key=lambda e: abs(e.rect.centerx - player.rect.centerx))
+        if target.rect.centerx < player.rect.centerx - 8: pressed.append(pygame.K_LEFT)
+        elif target.rect.centerx > player.rect.centerx + 8: pressed.append(pygame.K_RIGHT)
+    return game.KeyState(pressed), player.can_shoot()
+
+def run(frames=6000, dt=game.SIM_DT, seed=1, restart=True, log=None):
+    # With a log the autopilot's inputs are recorded too (dt should be 1 / log.hz)
+    sim = game.GameSimulation(seed)
+    start = time.perf_counter()
+    profiler = game.profiler
+    for _ in range(frames):
+        profiler.begin_frame()
+        keys, shoot = autopilot(sim)
+        sim.step(dt, keys, shoot)
+        if log is not None: log.append(key_mask(keys, shoot))
+        profiler.end_frame()
+        if sim.game_over:
+            if not restart: break
+            sim.reset(sim.seed + 1)
+    elapsed = time.perf_counter() - start
+    if log is not None: log.finish(sim)
+    return sim, elapsed
+
+def replay(log):
+    # Step a recorded session as fast as possible
+    sim = game.GameSimulation(log.seed)
+    sim.pixel_perfect = log.mask_collisions
+    sim.enemies.mode = "formation" if log.formation else "free"
+    start = time.perf_counter()
+    profiler = game.profiler
+    for dt, keys, shoot in log:
+        profiler.begin_frame()
+        sim.step(dt, keys, shoot)
+        profiler.end_frame()
+    return sim, time.perf_counter() - start
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Step the game simulation headless with a fixed dt.")
+    parser.add_argument("--frames", type=int, default=6000)
+    parser.add_argument("--fps", type=int, default=game.SIM_HZ, help="simulation rate (dt = 1/fps)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--profile", action="store_true", help="print per-subsystem timings")
+    parser.add_argument("--profile-out", help="also export them (.csv or .json)")
+    parser.add_argument("--record", metavar="PATH", help="record the autopilot's inputs (one session, stops at game over)")
+    parser.add_argument("--replay", metavar="PATH", help="replay an input log from main.py/headless.py --record")
+    parser.add_argument("--formation", action="store_true",
+                        help="waves march as a grid (read by main.py; recorded in the log, so replays need not pass it)")
+    parser.add_argument("--mask-collisions", action="store_true",
+                        help="confirm rect hits with pixel masks (read by main.py; recorded in the log, so replays need not pass it)")
+    args = parser.parse_args()
+    game.profiler.enabled = args.profile or bool(args.profile_out)
+
+    status = 0
+    if args.replay:
+        log = InputLog.load(args.replay)
+        sim, elapsed = replay(log)
+        frames = len(log)
+    else:
+        log = InputLog(args.seed, args.fps, game.MASK_COLLISIONS, game.FORMATION) if args.record else None
+        sim, elapsed = run(args.frames, 1.0 / args.fps, args.seed, restart=log is None, log=log)
+        frames = len(log) if log is not None else args.frames
+        if log is not None: log.save(args.record)
+    print(f"{frames} frames in {elapsed:.2f}s ({frames / elapsed:.0f} frames/s)")
+    print(f"wave {sim.wave}, score {sim.player.target_score}, lives {sim.player.lives}, state {sim.state_hash().hex()}")
+    print(f"pools: {game.pool_report()}")
+    if sim.pixel_perfect:
+        stats = game.mask_cache.stats()
+        print(f"masks: {stats['masks']} cached ({stats['evictions']} evicted), {stats['tests']} tests, {stats['rejects']} rect hits rejected")
+    if args.replay:
+        match = sim.player.target_score == log.score and sim.state_hash() == log.digest
+        print(f"recorded score {log.score}, state {log.digest.hex()}: {'MATCH' if match else 'MISMATCH'}")
+        status = 0 if match else 1
+    if game.profiler.enabled:
+        print(game.profiler.report())
+        if args.profile_out: game.profiler.export(args.profile_out)
+    sys.exit(status)
@@ -1,50 +1,103 @@
-import pygame, random, math, os, sys
+import time
+STARTUP_T0 = time.perf_counter()
+
+import pygame, random, math, sys, hashlib
+import numpy as np
+from bullets import BulletPool
+from particles import ParticleSystem
+from surfcache import SurfaceCache, TextCache, alpha_bucket
+from background import Background
+from assetcache import AssetCache, AssetManager, convert_alpha_all
+from profiler import FrameProfiler
+from replay import GameRNG, InputLog, key_mask
+from pools import SpritePool
+from entities import Entity, EntityGroup
+from masks import MaskCache
+from audio import AudioManager
+from render import DrawList
+from atlas import TextureAtlas
+from enemies import EnemyManager
+from asteroids import AsteroidField, AsteroidSpawner, slice_sheet, fallback_rocks, rotation_frames
 pygame.init()
 
 # ---------------- SETTINGS ----------------
 SCREEN_W, SCREEN_H = 1200, 700
 FPS = 60
+# The simulation always advances in fixed steps of SIM_DT (python main.py --sim-hz 120);
+# rendering runs at up to FPS and interpolates between the last two steps
+SIM_HZ = int(sys.argv[sys.argv.index("--sim-hz") + 1]) if "--sim-hz" in sys.argv else FPS
+SIM_DT = 1.0 / SIM_HZ
+MAX_STEPS = 5 # per rendered frame; past this the game slows down instead of spiralling
 TITLE = "Space Invaders"
 
-screen = pygame.display.set_mode((SCREEN_W, SCREEN_H))
-pygame.display.set_caption(TITLE)
-try:
-    icon = pygame.image.load("3d-box.png")
-    pygame.display.set_icon(icon)
-except:
-    pass
-
+screen = None # the window, opened by main() (see open_window) so importing needs no display
 clock = pygame.time.Clock()
 
+# Generated glows, overlays and HUD shapes are built once and reused from here
+surf_cache = SurfaceCache(256)
+text_cache = TextCache(128)
+# Per-subsystem frame timings: F3 toggles the overlay, F4 exports (--profile starts enabled)
+profiler = FrameProfiler(enabled="--profile" in sys.argv)
+# Pixel masks per unique image for the optional narrowphase (--mask-collisions, F5 toggles
+# except while recording)
+mask_cache = MaskCache()
+MASK_COLLISIONS = "--mask-collisions" in sys.argv
+# Gameplay randomness, one seeded stream per subsystem (reseeded by GameSimulation.reset)
+rng = GameRNG()
+
+def glow_ellipse(size, color):
+    def build():
+        glow = pygame.Surface(size, pygame.SRCALPHA)
+        pygame.draw.ellipse(glow, color, glow.get_rect())
+        return glow
+    return surf_cache.get(("ellipse", size, color), build)
+
 # ---------------- SAFE LOAD HELPERS ----------------
-def load_image(path, scale=1.0, fallback_size=(64,64), tint=None):
+# Decoded and scaled sprites are kept in .asset_cache/ between launches
+asset_cache = AssetCache()
+# Only what the menu needs loads up front; everything else is registered lazy and
+# streamed in on a worker thread while the menu runs (see the ASSETS section)
+assets = AssetManager()
+
+def decode_image(path, scale=1.0, tint=None, size=None, convert=True):
+    img = pygame.image.load(path)
+    if convert and pygame.display.get_surface(): img = img.convert_alpha()
+    if size:
+        img = pygame.transform.smoothscale(img, size)
+    elif scale != 1.0:
+        img = pygame.transform.smoothscale(img, (int(img.get_width()*scale), int(img.get_height()*scale)))
+    if tint:
+        tmp = img.copy()
+        tmp.fill(tint, special_flags=pygame.BLEND_RGBA_MULT)
+        return tmp
+    return img
+
+def load_image(path, scale=1.0, fallback_size=(64,64), tint=None, size=None, convert=True, cache=True):
+    # convert=False leaves display conversion to the caller (worker-thread loads);
+    # cache=False skips the per-image cache entry (the atlas caches its members as a whole)
     try:
-        img = pygame.image.load(path).convert_alpha()
-        if scale != 1.0:
-            img = pygame.transform.smoothscale(img, (int(img.get_width()*scale), int(img.get_height()*scale)))
-        if tint:
-            tmp = img.copy()
-            tmp.fill(tint, special_flags=pygame.BLEND_RGBA_MULT)
-            return tmp
-        return img
+        if not cache: return decode_image(path, scale, tint, size, convert)
+        key = f"image:{path}:{scale}:{tint}:{size}"
+        return asset_cache.load(key, [path], lambda: [decode_image(path, scale, tint, size, convert)], convert=convert)[0]
     except:
         surf = pygame.Surface(fallback_size, pygame.SRCALPHA)
         surf.fill((225, 225, 235, 230))
         pygame.draw.rect(surf, (70, 80, 100), surf.get_rect(), 2)
         return surf
 
-def load_explosion_folder(folder_path, scale=0.6, fallback_color=(255,140,0)):
-    frames = []
-    if os.path.isdir(folder_path):
-        for fn in sorted(os.listdir(folder_path)):
-            if fn.lower().endswith(".png"):
-                try:
-                    img = pygame.image.load(os.path.join(folder_path, fn)).convert_alpha()
-                    if scale != 1.0:
-                        img = pygame.transform.smoothscale(img, (int(img.get_width()*scale), int(img.get_height()*scale)))
-                    frames.append(img)
-                except:
-                    pass
+def load_explosion_folder(folder_path, scale=0.6, fallback_color=(255,140,0), convert=True, cache=True):
+    key = f"frames:{folder_path}:{scale}"
+    paths = asset_cache.folder_sources(key, folder_path)
+    def build():
+        frames = []
+        for path in paths:
+            try:
+                frames.append(decode_image(path, scale, convert=convert))
+            except:
+                pass
+        return frames
+    if not cache: frames = build()
+    else: frames = asset_cache.load(key, paths, build, folder=folder_path, convert=convert) if paths else []
     if not frames:
         for r in range(8, 72, 7):
             surf = pygame.Surface((140,140), pygame.SRCALPHA)
@@ -54,8 +107,9 @@ def load_explosion_folder(folder_path, scale=0.6, fallback_color=(255,140,0)):
     return frames
 
 def try_sound(path):
+    # Effects come back from .asset_cache/ as raw PCM after the first launch
     try:
-        return pygame.mixer.Sound(path)
+        return asset_cache.load_sound(path)
     except:
         return None
 
@@ -77,91 +131,71 @@ class ScreenShake:
         if self.t <= 0: return (0,0)
         k = self.t
         amp = int(self.intensity * k * 0.9)
-        return (random.randint(-amp, amp), random.randint(-amp, amp))
+        return (rng.shake.randint(-amp, amp), rng.shake.randint(-amp, amp))
 
 shake = ScreenShake()
 
 # ---------------- BACKGROUND ----------------
-bg_base = load_image("freepik__upload__31851.png", 1.0, (SCREEN_W, SCREEN_H))
-bg_base = pygame.transform.smoothscale(bg_base, (SCREEN_W, SCREEN_H))
-
-def build_star_layer(density=90, alpha=(40,120)):
-    s = pygame.Surface((SCREEN_W, SCREEN_H), pygame.SRCALPHA)
-    for _ in range(density):
-        x = random.randint(0, SCREEN_W-2); y = random.randint(0, SCREEN_H-2)
-        pygame.draw.circle(s, (255,255,255, random.randint(*alpha)), (x,y), random.randint(1,2))
-    return s
-
-bg_layer1 = build_star_layer(100, (40,120))
-bg_layer2 = build_star_layer(60, (20,80))
-p1 = 0.0; p2 = 0.0
-
-vignette = pygame.Surface((SCREEN_W, SCREEN_H), pygame.SRCALPHA)
-for i in range(220):
-    c = max(0, 160 - i)
-    pygame.draw.rect(vignette, (0,0,0, int(c*0.25)), (i, i, SCREEN_W-2*i, SCREEN_H-2*i), 2)
+assets.add("bg_base", lambda: load_image("freepik__upload__31851.png", 1.0, (SCREEN_W, SCREEN_H), size=(SCREEN_W, SCREEN_H)))
+background = Background(assets["bg_base"], SCREEN_W, SCREEN_H)
 
 # ---------------- SOUNDS ----------------
-hit_snd = try_sound("sfx_hit.wav")
-boom_snd = try_sound("sfx_boom.wav")
-power_snd = try_sound("sfx_power.wav")
-player_bullet_snd = try_sound("Untitled video - Made with Clipchamp (2).mp3")
-enemy_bullet_snd = try_sound("Enemy1Blaster.mp3")
-enemy2_bullet_snd = try_sound("Enemy2Blaster.mp3")
-enemy3_bullet_snd = try_sound("Enemy3Blasters.mp3")
-enemy4_bullet_snd = try_sound("Enemy4Blasters.mp3")
-powerup_collect_snd = try_sound("power-up-type-1-230548.mp3")
-
-try:
-    pygame.mixer.music.load("spaceship-arcade-shooter-game-background-soundtrack-318508.mp3")
-    pygame.mixer.music.set_volume(0.6)
-    pygame.mixer.music.play(-1)
-except pygame.error:
-    print("Could not load or play background music.")
-    pass
+# Sounds are only needed once the game starts, so they all stream in on the asset thread.
+# The soundtrack is streamed by mixer.music; only the short effects are decoded into memory.
+def load_music():
+    try:
+        pygame.mixer.music.load("spaceship-arcade-shooter-game-background-soundtrack-318508.mp3")
+        return True
+    except pygame.error:
+        print("Could not load or play background music.")
+        return False
+
+def play_music(loaded):
+    if loaded:
+        pygame.mixer.music.set_volume(0.6)
+        pygame.mixer.music.play(-1)
+    return loaded
+
+assets.add("music", load_music, lazy=True, post=play_music)
+for name, path in (("hit_snd", "sfx_hit.wav"), ("boom_snd", "sfx_boom.wav"), ("power_snd", "sfx_power.wav"),
+                   ("player_bullet_snd", "Untitled video - Made with Clipchamp (2).mp3"),
+                   ("enemy_bullet_snd", "Enemy1Blaster.mp3"), ("enemy2_bullet_snd", "Enemy2Blaster.mp3"),
+                   ("enemy3_bullet_snd", "Enemy3Blasters.mp3"), ("enemy4_bullet_snd", "Enemy4Blasters.mp3"),
+                   ("powerup_collect_snd", "power-up-type-1-230548.mp3")):
+    assets.add(name, lambda path=path: try_sound(path), lazy=True)
+
+# Gameplay code asks for sounds by event name; the main loop dispatches them to the
+# mixer once per frame (see audio.py). name: assets to try, priority, voices, window (s)
+audio = AudioManager(lambda name: assets[name], max_voices=12)
+for name, sources, priority, voices, window in (
+        ("powerup", ("powerup_collect_snd", "power_snd"), 4, 1, 0.10),
+        ("boom", "boom_snd", 3, 3, 0.06),
+        ("hit", "hit_snd", 2, 2, 0.05),
+        ("player_shot", "player_bullet_snd", 1, 2, 0.04),
+        ("enemy1_shot", "enemy_bullet_snd", 0, 2, 0.10),
+        ("enemy2_shot", "enemy2_bullet_snd", 0, 2, 0.10),
+        ("enemy3_shot", "enemy3_bullet_snd", 0, 2, 0.10),
+        ("enemy4_shot", "enemy4_bullet_snd", 0, 2, 0.10)):
+    audio.add(name, sources, priority, voices, window)
 
 # ---------------- SPRITES ----------------
-class Bullet(pygame.sprite.Sprite):
-    def __init__(self, x, y, img, vy, friendly=True):
-        super().__init__()
-        self.image = img
-        self.rect = self.image.get_rect(center=(x,y))
-        self.vy = vy
-        self.friendly = friendly
-    def update(self, dt):
-        self.rect.y += int(self.vy * dt)
-        if self.rect.bottom < -60 or self.rect.top > SCREEN_H + 60:
-            self.kill()
-
-class Particle(pygame.sprite.Sprite):
-    def __init__(self, pos, color, life=0.45, gravity=380, velocity_range=(-150,150,-240,-20)):
-        super().__init__()
-        self.image = pygame.Surface((3,3), pygame.SRCALPHA)
-        self.image.fill(color)
-        self.rect = self.image.get_rect(center=pos)
-        self.vx = random.uniform(velocity_range[0], velocity_range[1])
-        self.vy = random.uniform(velocity_range[2], velocity_range[3])
-        self.g = gravity
-        self.life = life
-        self.max_life = life
-    def update(self, dt):
-        self.life -= dt
-        if self.life <= 0:
-            self.kill(); return
-        self.vy += self.g * dt
-        self.rect.x += int(self.vx * dt)
-        self.rect.y += int(self.vy * dt)
-        self.image.set_alpha(int(255 * max(0, self.life/self.max_life)))
-
-class Explosion(pygame.sprite.Sprite):
+class Explosion(Entity):
+    # Animates by moving its source area over the atlas sheet (frames is a FrameStrip);
+    # image stays the whole sheet and is drawn as (image, pos, area)
+    __slots__ = ("frames", "area", "index", "timer", "frame_time")
     def __init__(self, frames, center, fps=34):
         super().__init__()
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self.setup(frames, center, fps)
+    def setup(self, frames, center, fps=34):
         self.frames = frames
         self.index = 0
         self.timer = 0.0
         self.frame_time = 1.0 / fps
-        self.image = self.frames[0]
-        self.rect = self.image.get_rect(center=center)
+        self.image = frames.sheet
+        self.area = frames.areas[0]
+        self.rect.size = self.area.size
+        self.rect.center = center
     def update(self, dt):
         self.timer += dt
         while self.timer >= self.frame_time:
@@ -170,8 +204,9 @@ class Explosion(pygame.sprite.Sprite):
             if self.index >= len(self.frames):
                 self.kill(); return
             c = self.rect.center
-            self.image = self.frames[self.index]
-            self.rect = self.image.get_rect(center=c)
+            self.area = self.frames.areas[self.index]
+            self.rect.size = self.area.size
+            self.rect.center = c
 
 class Player(pygame.sprite.Sprite):
     def __init__(self, img, bullet_img, exhaust_img):
@@ -179,6 +214,7 @@ class Player(pygame.sprite.Sprite):
         self.base_img = img
         self.image = self.base_img.copy()
         self.rect = self.image.get_rect(midbottom=(SCREEN_W//2, SCREEN_H-28))
+        self.x = self.px = float(self.rect.x) # sub-pixel position (and the previous step's); rect follows it rounded
         self.bullet_img = bullet_img
         self.exhaust_img = exhaust_img
         self.speed = 420
@@ -202,8 +238,9 @@ class Player(pygame.sprite.Sprite):
 
     def update(self, dt, keys):
         dx = (keys[pygame.K_RIGHT] or keys[pygame.K_d]) - (keys[pygame.K_LEFT] or keys[pygame.K_a])
-        self.rect.x += int(dx * self.speed * dt)
-        self.rect.x = max(0, min(SCREEN_W - self.rect.width, self.rect.x))
+        self.px = self.x
+        self.x = max(0, min(SCREEN_W - self.rect.width, self.x + dx * self.speed * dt))
+        self.rect.x = self.x
 
         if self.cool > 0: self.cool -= dt
         if self.inv > 0: self.inv -= dt
@@ -219,30 +256,33 @@ class Player(pygame.sprite.Sprite):
         
         # Flashing white on hit
         if self.flash > 0:
-            self.image = self.base_img.copy()
-            overlay = pygame.Surface(self.image.get_size(), pygame.SRCALPHA)
-            overlay.fill((255,255,255,120))
-            self.image.blit(overlay, (0,0))
+            self.image = surf_cache.get(("flash", id(self.base_img)), self.build_flash)
         else:
             self.image = self.base_img
         
         if self.score < self.target_score:
             self.score += min(50, self.target_score - self.score)
 
+    def build_flash(self):
+        img = self.base_img.copy()
+        overlay = pygame.Surface(img.get_size(), pygame.SRCALPHA)
+        overlay.fill((255,255,255,120))
+        img.blit(overlay, (0,0))
+        return img
+
     def can_shoot(self): return self.cool <= 0
-    def shoot(self, group):
+    def shoot(self, bullets):
         if not self.can_shoot(): return
         cd = 0.09 if self.rapid>0 else self.cooldown
         self.cool = cd
         bx, by = self.rect.centerx, self.rect.top+10
         if self.rapid>0:
             for ox in (-12, 0, 12):
-                group.add(Bullet(bx+ox, by, self.bullet_img, vy=-880, friendly=True))
+                bullets.spawn(bx+ox, by, self.bullet_img, vy=-880, friendly=True)
         else:
-            group.add(Bullet(bx, by, self.bullet_img, vy=-880, friendly=True))
+            bullets.spawn(bx, by, self.bullet_img, vy=-880, friendly=True)
 
-        if player_bullet_snd:
-            player_bullet_snd.play()
+        audio.play("player_shot")
     
     def hit(self):
         if self.inv > 0 or self.shield > 0: return False
@@ -253,74 +293,94 @@ class Player(pygame.sprite.Sprite):
         shake.add(7, 0.22)
         return self.lives <= 0
 
-class Enemy(pygame.sprite.Sprite):
-    def __init__(self, img, bullet_img, explosion_frames, spawn_rect, speed=140, shoot_cool=(0.9, 2.2), score=70):
-        super().__init__()
-        self.image = img
-        self.base_img = img
-        self.rect = self.image.get_rect()
-        self.spawn_rect = spawn_rect
-        self.speed = speed
-        self.shoot_rng = shoot_cool
+class EnemyKind:
+    # Everything enemies of one type and tier share, held once instead of per enemy
+    __slots__ = ("img", "bullet_img", "shot_snd", "exp_frames", "speed", "shoot_rng", "score")
+    def __init__(self, img, bullet_img, shot_snd, exp_frames, speed, shoot_rng, score):
+        self.img = img
         self.bullet_img = bullet_img
-        self.exp_frames = explosion_frames
-        self.score_val = score
-        self.alive = True
+        self.shot_snd = shot_snd # audio event name
+        self.exp_frames = exp_frames
+        self.speed = speed
+        self.shoot_rng = shoot_rng
+        self.score = score
+
+class Enemy(Entity):
+    # Moved and told when to fire by the simulation's EnemyManager (enemies.py)
+    __slots__ = ("kind", "alive", "manager", "slot", "token")
+    def __init__(self, kind):
+        super().__init__()
+        self.rect = kind.img.get_rect()
+        self.manager = None
+        self.setup(kind)
+    def setup(self, kind):
+        self.kind = kind
+        self.image = kind.img
+        self.rect.size = self.image.get_size()
         self.respawn()
     def respawn(self):
-        self.rect.x = random.randint(self.spawn_rect.left, self.spawn_rect.right - self.rect.width)
-        self.rect.y = random.randint(self.spawn_rect.top, self.spawn_rect.bottom)
-        self.vx = random.choice([-1,1]) * (self.speed + random.uniform(-30,30))
-        self.shoot_t = random.uniform(*self.shoot_rng)
+        self.rect.x = rng.spawn.randint(spawn_rect.left, spawn_rect.right - self.rect.width)
+        self.rect.y = rng.spawn.randint(spawn_rect.top, spawn_rect.bottom)
         self.alive = True
-    def update(self, dt):
-        if not self.alive: return
-        self.rect.x += int(self.vx * dt)
-        if self.rect.left <= 0:
-            self.vx = abs(self.vx)
-        elif self.rect.right >= SCREEN_W:
-            self.vx = -abs(self.vx)
-    def try_shoot(self, dt, group):
-        if not self.alive: return
-        self.shoot_t -= dt
-        if self.shoot_t <= 0:
-            self.shoot_t = random.uniform(*self.shoot_rng)
-            group.add(Bullet(self.rect.centerx, self.rect.bottom-6, self.bullet_img, vy=400, friendly=False))
-
-            if self.bullet_img == bullet_e1 and enemy_bullet_snd:
-                enemy_bullet_snd.play()
-            elif self.bullet_img == bullet_e2 and enemy2_bullet_snd:
-                enemy2_bullet_snd.play()
-            elif self.bullet_img == bullet_e3 and enemy3_bullet_snd:
-                enemy3_bullet_snd.play()
-            elif self.bullet_img == bullet_e4 and enemy4_bullet_snd:
-                enemy4_bullet_snd.play()
+    def kill(self):
+        if self.manager is not None: self.manager.remove(self)
+        super().kill()
+    def shoot(self, bullets):
+        kind = self.kind
+        bullets.spawn(self.rect.centerx, self.rect.bottom-6, kind.bullet_img, vy=400, friendly=False)
+        audio.play(kind.shot_snd)
 
     def explode(self, effects, particles):
         self.alive = False
-        effects.add(Explosion(self.exp_frames, self.rect.center, fps=40))
-        for _ in range(16):
-            particles.add(Particle(self.rect.center, (255, 170, 60)))
-        if boom_snd: boom_snd.play()
+        effects.add(explosion_pool.acquire(self.kind.exp_frames, self.rect.center, fps=40))
+        particles.emit(self.rect.center, (255, 170, 60), 16)
+        audio.play("boom")
         shake.add(11, 0.25)
 
-class PowerUp(pygame.sprite.Sprite):
+class PowerUp(Entity):
+    __slots__ = ("type", "y", "py", "vy", "t")
     TYPES = ("heal", "rapid", "shield")
     def __init__(self, center):
         super().__init__()
-        self.type = random.choice(PowerUp.TYPES)
-        color = {"heal":(90,240,120), "rapid":(120,170,255), "shield":(255,220,120)}[self.type]
-        self.image = pygame.Surface((26,26), pygame.SRCALPHA)
-        pygame.draw.circle(self.image, color, (13,13), 13)
-        pygame.draw.circle(self.image, (255,255,255,100), (13,13), 10, 2)
+        self.setup(center)
+    def setup(self, center):
+        self.type = rng.powerup.choice(PowerUp.TYPES)
+        self.image = surf_cache.get(("powerup", self.type), self.build_image)
         self.rect = self.image.get_rect(center=center)
+        self.y = self.py = float(self.rect.y)
         self.vy = 140
         self.t = 9.0
+    def build_image(self):
+        color = {"heal":(90,240,120), "rapid":(120,170,255), "shield":(255,220,120)}[self.type]
+        img = pygame.Surface((26,26), pygame.SRCALPHA)
+        pygame.draw.circle(img, color, (13,13), 13)
+        pygame.draw.circle(img, (255,255,255,100), (13,13), 10, 2)
+        return img
     def update(self, dt):
-        self.rect.y += int(self.vy * dt)
+        self.py = self.y
+        self.y += self.vy * dt
+        self.rect.y = self.y
         self.t -= dt
         if self.t <= 0 or self.rect.top > SCREEN_H: self.kill()
 
+class Asteroid(Entity):
+    # Moved, spun and given its rotation frame by the simulation's AsteroidField (asteroids.py)
+    __slots__ = ("size", "variant", "field", "slot", "token")
+    def __init__(self, size, variant):
+        super().__init__()
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self.field = None
+        self.setup(size, variant)
+    def setup(self, size, variant):
+        self.size = size # index into ASTEROID_SIZES, 0 = large
+        self.variant = variant
+    def kill(self):
+        if self.field is not None: self.field.remove(self)
+        super().kill()
+    def shatter(self, particles):
+        self.kill()
+        particles.emit(self.rect.center, (170, 150, 130), 6 + 4 * (2 - self.size), life=0.5)
+
 def apply_powerup(player, t):
     if t == "heal":
         player.lives = min(7, player.lives + 1)
@@ -328,70 +388,419 @@ def apply_powerup(player, t):
         player.rapid = player.rapid_max
     elif t == "shield":
         player.shield = player.shield_max
-    if powerup_collect_snd:
-        powerup_collect_snd.play()
-    elif power_snd:
-        power_snd.play()
+    audio.play("powerup")
 
 # ---------------- ASSETS ----------------
-player_img = load_image("PNG/Example/03.png", 0.5, (84,84))
-player_bullet_img = load_image("PNG/Bullets/12.png", 0.6, (10,24))
-player_exhaust_img = load_image("PNG/Flame/11.png", 0.4, (20,20))
-
-bullet_e1 = load_image("11.png", 0.7, (12,24))
-bullet_e2 = load_image("09.png", 0.7, (12,24))
-bullet_e3 = load_image("04.png", 0.7, (12,24))
-bullet_e4 = load_image("02.png", 0.7, (12,24))
-
-enemy1_img = load_image("Ship6/Ship6-ezgif.com-rotate.png", 0.6, (80,80))
-enemy2_img = load_image("Ship4-ezgif.com-rotate.png", 0.6, (80,80))
-enemy3_img = load_image("Ship3-ezgif.com-rotate.png", 0.6, (80,80))
-enemy4_img = load_image("Ship5-ezgif.com-rotate.png", 0.6, (80,80))
-
-exp1 = load_explosion_folder(r"C:\Users\d1mas\Desktop\Game2\Ship6_Explosion", 0.6, (255,130,80))
-exp2 = load_explosion_folder(r"C:\Users\d1mas\Desktop\Game2\Ship4_Explosion", 0.6, (120,255,210))
-exp3 = load_explosion_folder(r"C:\Users\d1mas\Desktop\Game2\Ship3_Explosion", 0.6, (255,90,170))
-exp4 = load_explosion_folder(r"C:\Users\d1mas\Desktop\Game2\Ship5_Explosion", 0.6, (255,245,120))
-
-asteroid_atlas = load_image("Setofcolorfulasteroidsofdifferentshapestexturesandsize-ezgif.com-crop.jpg", 1.0, (180,140))
-
-# ---------------- GROUPS ----------------
-all_sprites = pygame.sprite.LayeredUpdates()
-player_group = pygame.sprite.GroupSingle()
-enemy_group = pygame.sprite.Group()
-bullet_group = pygame.sprite.Group()
-effects_group = pygame.sprite.Group()
-particles_group = pygame.sprite.Group()
-powerups_group = pygame.sprite.Group()
-asteroid_group = pygame.sprite.Group()
-
-player = Player(player_img, player_bullet_img, player_exhaust_img)
-player_group.add(player)
-all_sprites.add(player)
+# The menu rocket needs these two right away
+assets.add("player_img", lambda: load_image("PNG/Example/03.png", 0.5, (84,84)))
+assets.add("player_exhaust_img", lambda: load_image("PNG/Flame/11.png", 0.4, (20,20)))
+
+# Bullets, enemy ships and explosion frames are packed into one atlas sheet (atlas.py):
+# the cache keeps the packed sheet, so a warm start reads one file instead of one
+# per image/frame, and the game draws them all from the same surface
+ATLAS_IMAGES = {
+    "player_bullet_img": ("PNG/Bullets/12.png", 0.6, (10,24)),
+    "bullet_e1": ("11.png", 0.7, (12,24)),
+    "bullet_e2": ("09.png", 0.7, (12,24)),
+    "bullet_e3": ("04.png", 0.7, (12,24)),
+    "bullet_e4": ("02.png", 0.7, (12,24)),
+    "enemy1_img": ("Ship6/Ship6-ezgif.com-rotate.png", 0.6, (80,80)),
+    "enemy2_img": ("Ship4-ezgif.com-rotate.png", 0.6, (80,80)),
+    "enemy3_img": ("Ship3-ezgif.com-rotate.png", 0.6, (80,80)),
+    "enemy4_img": ("Ship5-ezgif.com-rotate.png", 0.6, (80,80)),
+}
+ATLAS_FRAMES = {
+    "exp1": (r"C:\Users\d1mas\Desktop\Game2\Ship6_Explosion", 0.6, (255,130,80)),
+    "exp2": (r"C:\Users\d1mas\Desktop\Game2\Ship4_Explosion", 0.6, (120,255,210)),
+    "exp3": (r"C:\Users\d1mas\Desktop\Game2\Ship3_Explosion", 0.6, (255,90,170)),
+    "exp4": (r"C:\Users\d1mas\Desktop\Game2\Ship5_Explosion", 0.6, (255,245,120)),
+}
+
+def load_sprite_atlas():
+    paths = [path for path, _, _ in ATLAS_IMAGES.values()]
+    for name, (folder, scale, _) in ATLAS_FRAMES.items():
+        paths += asset_cache.folder_sources(f"frames:{folder}:{scale}", folder)
+    def build():
+        items = {name: load_image(*args, convert=False, cache=False) for name, args in ATLAS_IMAGES.items()}
+        items.update((name, load_explosion_folder(*args, convert=False, cache=False)) for name, args in ATLAS_FRAMES.items())
+        return TextureAtlas().pack(items)
+    return asset_cache.load_atlas("atlas:" + repr((ATLAS_IMAGES, ATLAS_FRAMES)), paths, build, convert=False)
+
+def publish_atlas(atlas):
+    # Main thread: one display conversion for the sheet, then every member by name
+    atlas.convert()
+    for name, value in atlas.items():
+        assets.publish(name, value)
+    return atlas
+
+assets.add("sprite_atlas", load_sprite_atlas, lazy=True, post=publish_atlas)
+
+# Asteroids are cut out of one sheet of rocks and pre-rotated at every size they come
+# in (asteroids.py), so they spin without a transform per frame; the cache keeps all
+# of the frames as one sheet
+ASTEROID_SHEET = ("Setofcolorfulasteroidsofdifferentshapestexturesandsize-ezgif.com-crop.jpg", 4, 3) # file, columns, rows
+ASTEROID_VARIANTS = 6 # rocks used from the sheet
+ASTEROID_ANGLES = 24  # rotation frames per rock and size
+# Per asteroid size, large to small: diameter (px), speed range (px/s), max spin (deg/s), score, pieces when shot
+ASTEROID_SIZES = ((84, (50, 90), 40, 15, 2), (50, (80, 130), 90, 25, 2), (28, (110, 170), 150, 40, 0))
+
+def load_asteroid_frames():
+    path, cols, rows = ASTEROID_SHEET
+    diameters = [size[0] for size in ASTEROID_SIZES]
+    def build():
+        try:
+            rocks = slice_sheet(decode_image(path, convert=False), cols, rows)
+        except (OSError, pygame.error):
+            rocks = []
+        rocks = rocks[:ASTEROID_VARIANTS] or fallback_rocks(ASTEROID_VARIANTS)
+        return [f for d in diameters for rock in rocks for f in rotation_frames(rock, d, ASTEROID_ANGLES)]
+    key = "asteroids:" + repr((ASTEROID_SHEET, ASTEROID_VARIANTS, diameters, ASTEROID_ANGLES))
+    flat = asset_cache.load(key, [path], build, convert=False)
+    # frames[size][variant] -> rotation frames
+    per_size = len(flat) // len(diameters)
+    return [[flat[i + j:i + j + ASTEROID_ANGLES] for j in range(0, per_size, ASTEROID_ANGLES)]
+            for i in range(0, len(flat), per_size)]
+
+def prepare_asteroid_frames(frames):
+    # Main thread: display conversion, then RLE, since the frames are never drawn on
+    # and their transparent corners make run-length blits about twice as fast
+    frames = convert_alpha_all(frames)
+    for per_size in frames:
+        for rock in per_size:
+            for f in rock: f.set_alpha(255, pygame.RLEACCEL)
+    return frames
 
-spawn_rect = pygame.Rect(0, 40, SCREEN_W, 190)
+assets.add("asteroid_frames", load_asteroid_frames, lazy=True, post=prepare_asteroid_frames)
+assets.add("asset_manifest", asset_cache.save, lazy=True)
+assets.start()
 
-def spawn_wave(num, tier=1):
-    for _ in range(num):
-        t = random.choice([1,2,3,4])
+# ---------------- SIMULATION ----------------
+spawn_rect = pygame.Rect(0, 40, SCREEN_W, 190)
+# python main.py --formation: waves march as a classic grid instead of drifting freely
+FORMATION = "--formation" in sys.argv
+FORMATION_FLOOR = SCREEN_H - 300 # formation rows stop dropping here
+
+# Killed enemies, explosions and power-ups go back to these pools and are reused
+enemy_pool = SpritePool(Enemy)
+explosion_pool = SpritePool(Explosion)
+powerup_pool = SpritePool(PowerUp)
+asteroid_pool = SpritePool(Asteroid)
+pools = {"enemy": enemy_pool, "explosion": explosion_pool, "powerup": powerup_pool, "asteroid": asteroid_pool}
+
+def prewarm_pools():
+    # A full wave, a screen of explosions, a few drops and a field of rocks; needs the loaded assets
+    enemy_pool.prewarm(22, enemy_kind(1, 1))
+    explosion_pool.prewarm(32, assets["exp1"], (0, 0))
+    powerup_pool.prewarm(8, (0, 0))
+    asteroid_pool.prewarm(24, 0, 0)
+
+def pool_report():
+    return ", ".join(f"{name} {p.high_water} peak/{p.created} built/{p.reused} reused" for name, p in pools.items())
+
+# Per enemy type: images, shot sound event and explosion frames, then speed bonus, cooldown reduction and score
+ENEMY_TYPES = {
+    1: ("enemy1_img", "bullet_e1", "enemy1_shot", "exp1", 0, 0.0, 60),
+    2: ("enemy2_img", "bullet_e2", "enemy2_shot", "exp2", 10, 0.05, 80),
+    3: ("enemy3_img", "bullet_e3", "enemy3_shot", "exp3", 20, 0.1, 95),
+    4: ("enemy4_img", "bullet_e4", "enemy4_shot", "exp4", 30, 0.15, 110),
+}
+enemy_kinds = {}
+
+def enemy_kind(t, tier):
+    kind = enemy_kinds.get((t, tier))
+    if kind is None:
+        img, bullet, shot_snd, exp, speed_bonus, cool_cut, score = ENEMY_TYPES[t]
         # Increase enemy speed and adjust shoot cooldown for higher tiers
         enemy_speed = 140 + 10 * tier
         shoot_cooldown_min = max(0.4, 0.9 - 0.05 * tier) # Min cooldown can't go below 0.4
         shoot_cooldown_max = max(1.0, 2.2 - 0.1 * tier) # Max cooldown can't go below 1.0
+        kind = enemy_kinds[(t, tier)] = EnemyKind(assets[img], assets[bullet], shot_snd, assets[exp], enemy_speed + speed_bonus,
+                                                  (shoot_cooldown_min - cool_cut, shoot_cooldown_max - cool_cut), score)
+    return kind
 
-        if t==1:
-            e=Enemy(enemy1_img, bullet_e1, exp1, spawn_rect, enemy_speed, (shoot_cooldown_min,shoot_cooldown_max), 60)
-        elif t==2:
-            e=Enemy(enemy2_img, bullet_e2, exp2, spawn_rect, enemy_speed + 10, (shoot_cooldown_min - 0.05, shoot_cooldown_max - 0.05), 80)
-        elif t==3:
-            e=Enemy(enemy3_img, bullet_e3, exp3, spawn_rect, enemy_speed + 20, (shoot_cooldown_min - 0.1, shoot_cooldown_max - 0.1), 95)
-        else: # t==4
-            e=Enemy(enemy4_img, bullet_e4, exp4, spawn_rect, enemy_speed + 30, (shoot_cooldown_min - 0.15, shoot_cooldown_max - 0.15), 110)
-        enemy_group.add(e); all_sprites.add(e)
+def spawn_wave(group, manager, num, tier=1):
+    for _ in range(num):
+        kind = enemy_kind(rng.spawn.choice([1,2,3,4]), tier)
+        e = enemy_pool.acquire(kind)
+        group.add(e)
+        vx = rng.spawn.choice([-1,1]) * (kind.speed + rng.spawn.uniform(-30,30))
+        manager.add(e, vx, rng.spawn.uniform(*kind.shoot_rng))
+    if manager.mode == "formation": manager.arrange()
+
+def spawn_asteroid(group, field, size, x, y, vx, vy):
+    a = asteroid_pool.acquire(size, rng.asteroid.randrange(field.variants(size)))
+    group.add(a)
+    spin = ASTEROID_SIZES[size][2]
+    field.add(a, x, y, vx, vy, rng.asteroid.uniform(0, 360), rng.asteroid.uniform(-spin, spin))
+    return a
+
+def asteroid_rate(wave):
+    # Large rocks per second during a wave and the most on screen at once; none on wave 1
+    if wave < 2: return 0.0, 0
+    return min(0.08 + 0.03 * wave, 0.6), min(2 + wave // 2, 10)
+
+class KeyState:
+    # Stand-in for pygame.key.get_pressed() when the simulation is driven without a window
+    def __init__(self, pressed=()):
+        self.pressed = set(pressed)
+    def __getitem__(self, key):
+        return key in self.pressed
+
+class GameSimulation:
+    # Owns all gameplay state and advances it without touching the display,
+    # so it can be stepped headless (SDL dummy driver) as fast as the CPU allows.
+    def __init__(self, seed=0):
+        self.seed = seed
+        self.player_group = pygame.sprite.GroupSingle()
+        self.enemy_group = EntityGroup()
+        # Batched movement and shot scheduling for enemy_group (--formation for grid stepping)
+        self.enemies = EnemyManager(SCREEN_W, FORMATION_FLOOR, "formation" if FORMATION else "free")
+        self.bullets = BulletPool(SCREEN_H)
+        self.effects_group = EntityGroup()
+        self.particles = ParticleSystem()
+        self.powerups_group = EntityGroup()
+        self.asteroid_group = EntityGroup()
+        # Batched movement and spin for asteroid_group; its box arrays go straight into
+        # the BulletPool's broadphase and the player test (see asteroids.py)
+        self.asteroid_field = AsteroidField(assets["asteroid_frames"], pygame.Rect(0, 0, SCREEN_W, SCREEN_H))
+        self.asteroid_spawner = AsteroidSpawner()
+        # Rect hits are confirmed against pixel masks when set (see masks.py)
+        self.pixel_perfect = MASK_COLLISIONS
+
+        self.player = Player(assets["player_img"], assets["player_bullet_img"], assets["player_exhaust_img"])
+        self.player_group.add(self.player)
+        prewarm_pools()
+        self.reset()
+
+    def reset(self, seed=None):
+        # Same seed + same inputs -> same game, see replay.py
+        if seed is not None: self.seed = seed
+        rng.seed(self.seed)
+        self.particles.rng = np.random.default_rng(self.seed)
+        for g in (self.enemy_group, self.effects_group, self.powerups_group, self.asteroid_group):
+            for s in list(g): s.kill()
+        self.enemies.clear()
+        self.asteroid_field.clear()
+        self.asteroid_spawner.reset()
+        self.bullets.clear()
+        self.particles.clear()
+        audio.clear() # nothing the last game asked for plays in this one
+        player = self.player
+        player.rect.midbottom = (SCREEN_W//2, SCREEN_H-28)
+        player.x = player.px = float(player.rect.x)
+        player.image = player.base_img
+        player.lives = 5
+        player.score = 0
+        player.target_score = 0
+        player.cool = player.inv = player.flash = player.rapid = player.shield = 0
+        player.damage_spark_timer = player.hull_glow_t = player.engine_t = 0
+        player.is_shooting = False
+        self.wave = 1
+        self.wave_cooldown = 2.0
+        self.wave_active = False
+        self.game_over = False
+        self.frame = 0
+
+    def spawn_wave(self, num, tier=1):
+        spawn_wave(self.enemy_group, self.enemies, num, tier)
+
+    def step(self, dt=SIM_DT, keys=None, shoot_pressed=False):
+        if self.game_over: return
+        if keys is None: keys = KeyState()
+        self.frame += 1
+        player = self.player
+        enemy_group, bullets = self.enemy_group, self.bullets
+
+        with profiler.scope("player"):
+            player.update(dt, keys)
+            if shoot_pressed:
+                player.shoot(bullets)
+
+        if not self.wave_active:
+            self.wave_cooldown -= dt
+            if self.wave_cooldown <= 0:
+                for e in list(enemy_group): e.kill()
+                bullets.clear()
+
+                self.spawn_wave(min(6 + self.wave, 22), self.wave)
+                self.asteroid_spawner.rate, self.asteroid_spawner.limit = asteroid_rate(self.wave)
+                self.wave_active = True
+                self.wave_cooldown = 0
+
+        if self.wave_active:
+            with profiler.scope("enemies"):
+                enemies = self.enemies
+                enemies.update(dt)
+                for e in enemies.due():
+                    e.shoot(bullets)
+                    enemies.schedule(e, rng.enemy.uniform(*e.kind.shoot_rng))
+
+        with profiler.scope("asteroids"):
+            field = self.asteroid_field
+            for a in field.update(dt): a.kill()
+            if self.wave_active:
+                for _ in range(self.asteroid_spawner.update(dt, len(field))):
+                    self.spawn_asteroid()
+
+        with profiler.scope("bullets"):
+            bullets.update(dt)
+
+        with profiler.scope("effects"):
+            self.effects_group.update(dt)
+            self.particles.update(dt)
+            self.powerups_group.update(dt)
+
+        with profiler.scope("collide"):
+            self.collide()
+
+        if self.wave_active and not enemy_group:
+            self.wave += 1
+            self.wave_active = False
+            self.wave_cooldown = 3.0
+            bullets.kill_side(friendly=True)
+
+        self.emit_ship_particles()
+        shake.update(dt)
+
+    def spawn_asteroid(self, size=0):
+        # A rock drifting in from above the top edge
+        d, speed = ASTEROID_SIZES[size][:2]
+        r = rng.asteroid
+        v = r.uniform(*speed)
+        heading = math.radians(r.uniform(-25, 25))
+        return spawn_asteroid(self.asteroid_group, self.asteroid_field, size, r.uniform(d, SCREEN_W - d), -d,
+                              v * math.sin(heading), v * math.cos(heading))
+
+    def split_asteroid(self, a):
+        # A shot rock breaks into smaller ones fanning out downwards from where it was
+        pieces = ASTEROID_SIZES[a.size][4]
+        if not pieces: return
+        size = a.size + 1
+        speed = ASTEROID_SIZES[size][1]
+        cx, cy = a.rect.center
+        r = rng.asteroid
+        arc = 140.0 / pieces
+        for i in range(pieces):
+            heading = math.radians(r.uniform(20 + i * arc, 20 + (i + 1) * arc))
+            v = r.uniform(*speed)
+            spawn_asteroid(self.asteroid_group, self.asteroid_field, size, cx, cy, v * math.cos(heading), v * math.sin(heading))
+
+    def pixel_hit(self, test, *args):
+        # Mask narrowphase after a rect hit; always true with pixel_perfect off.
+        # Timed as its own profiler scope to show what enabling it costs.
+        if not self.pixel_perfect: return True
+        with profiler.scope("masks"):
+            return test(*args)
+
+    def collide(self):
+        player = self.player
+        bullets = self.bullets
+        masks = mask_cache
+        field = self.asteroid_field
+
+        # Every bullet query of the step in one sweep: enemies and rocks take the
+        # player's shots, the player takes the enemies'
+        enemies = [e for e in self.enemy_group if e.alive] if self.wave_active else []
+        boxes = field.boxes() if field else []
+        # Tokens too: a shot rock goes back to the pool and may come straight back
+        # as one of its own pieces, which must not count as the rock in boxes
+        asteroids = [(a, a.token) for a in field.asteroids]
+        enemy_hits, rock_hits, player_hits = bullets.collide(
+            [([e.rect for e in enemies], True), (boxes, True), ([player.rect], False)])
+
+        if enemies:
+            for slot, hit_idx in enemy_hits:
+                # The first live enemy along the bullet's path takes the hit
+                e = next((enemies[j] for j in hit_idx if enemies[j].alive and
+                          self.pixel_hit(masks.bullet, bullets, slot, enemies[j].image, enemies[j].rect)), None)
+                if e is not None:
+                    bullets.kill(slot)
+                    e.explode(self.effects_group, self.particles)
+                    e.kill()
+                    player.target_score += e.kind.score
+                    if rng.powerup.random() < 0.16:
+                        p = powerup_pool.acquire(e.rect.center)
+                        self.powerups_group.add(p)
+                    audio.play("hit")
+
+        if asteroids:
+            for slot, hit_idx in rock_hits:
+                if not bullets.alive[slot]: continue # spent on an enemy
+                # Same as enemies: the first rock along the path still alive
+                a = next((a for a, token in (asteroids[j] for j in hit_idx) if a.field is field and a.token == token and
+                          self.pixel_hit(masks.bullet, bullets, slot, a.image, a.rect)), None)
+                if a is not None:
+                    bullets.kill(slot)
+                    player.target_score += ASTEROID_SIZES[a.size][3]
+                    a.shatter(self.particles)
+                    self.split_asteroid(a)
+                    audio.play("hit")
+
+        for slot, _ in player_hits:
+            # A raised shield is the whole rect, so only the bare ship gets the pixel test
+            if player.shield <= 0 and not self.pixel_hit(masks.bullet, bullets, slot, player.image, player.rect): continue
+            bullets.kill(slot)
+            if player.hit():
+                self.game_over = True
+                break
+        bullets.compact()
 
-wave = 1
-wave_cooldown = 2.0
-wave_active = False
+        for a in field.overlapping(player.rect):
+            if a.field is not field or not self.pixel_hit(masks.sprites, player, a): continue
+            a.shatter(self.particles)
+            if player.hit():
+                self.game_over = True
+                break
+
+        for p in list(self.powerups_group):
+            if player.rect.colliderect(p.rect) and self.pixel_hit(masks.sprites, player, p):
+                apply_powerup(player, p.type)
+                p.kill()
+
+    def state_hash(self):
+        # SHA-1 over the gameplay state (not visuals) for replay comparisons
+        p = self.player
+        h = hashlib.sha1(repr((self.frame, self.wave, self.wave_active, self.wave_cooldown, self.game_over,
+                               tuple(p.rect), p.lives, p.target_score, p.cool, p.inv, p.rapid, p.shield)).encode())
+        for group in (self.enemy_group, self.powerups_group, self.asteroid_group):
+            h.update(repr([tuple(s.rect) for s in group]).encode())
+        h.update(self.enemies.state())
+        h.update(self.asteroid_field.state())
+        # Live bullets only: the pool keeps a few dead slots until it compacts
+        n = self.bullets.count
+        live = self.bullets.alive[:n]
+        for arr in (self.bullets.x, self.bullets.y, self.bullets.friendly, self.bullets.alive):
+            h.update(arr[:n][live].tobytes())
+        return h.digest()
+
+    def emit_ship_particles(self):
+        player = self.player
+        # Engine Trails with Afterburners
+        engine_color = (255, 120, 0) if player.is_shooting else (120, 200, 255)
+        if player.engine_t > 0.05:
+            player.engine_t = 0
+            self.particles.emit(
+                pos=player.rect.midbottom,
+                color=engine_color,
+                life=0.2,
+                gravity=0,
+                velocity_range=(-30, 30, 100, 150)
+            )
+
+        # Damage Indicators (Sparks)
+        if player.damage_spark_timer > 0:
+            if rng.fx.random() < 0.35:
+                spark_pos = (
+                    player.rect.x + rng.fx.randint(0, player.rect.width),
+                    player.rect.y + rng.fx.randint(0, player.rect.height)
+                )
+                self.particles.emit(
+                    pos=spark_pos,
+                    color=(255, 255, 255),
+                    life=0.15,
+                    gravity=100,
+                    velocity_range=(-200, 200, -200, -20)
+                )
 
 # ---------------- UI ----------------
 font_sm = pygame.font.Font(None, 28)
@@ -407,23 +816,31 @@ font_menu_button = pygame.font.SysFont('Courier New', 36, bold=True)
 font_hud_label = pygame.font.SysFont('Courier New', 16, bold=True)
 font_hud_score = pygame.font.SysFont('Courier New', 32, bold=True)
 font_hud_wave = pygame.font.SysFont('Courier New', 24, bold=True)
+font_profiler = pygame.font.SysFont('Courier New', 15, bold=True)
 
 def draw_rounded_rect(surf, rect, color, radius=10, width=0):
     x,y,w,h = rect
-    shape = pygame.Surface((w,h), pygame.SRCALPHA)
-    pygame.draw.rect(shape, color, (radius,0,w-2*radius,h))
-    pygame.draw.rect(shape, color, (0,radius,w,h-2*radius))
-    pygame.draw.circle(shape, color, (radius, radius), radius)
-    pygame.draw.circle(shape, color, (w-radius, radius), radius)
-    pygame.draw.circle(shape, color, (radius, h-radius), radius)
-    pygame.draw.circle(shape, color, (w-radius, h-radius), radius)
+    def build():
+        shape = pygame.Surface((w,h), pygame.SRCALPHA)
+        pygame.draw.rect(shape, color, (radius,0,w-2*radius,h))
+        pygame.draw.rect(shape, color, (0,radius,w,h-2*radius))
+        pygame.draw.circle(shape, color, (radius, radius), radius)
+        pygame.draw.circle(shape, color, (w-radius, radius), radius)
+        pygame.draw.circle(shape, color, (radius, h-radius), radius)
+        pygame.draw.circle(shape, color, (w-radius, h-radius), radius)
+        return shape
+    shape = surf_cache.get(("rounded_rect", w, h, color, radius), build)
     surf.blit(shape, (x,y), special_flags=0)
 
-def draw_lives(surf, x, y, lives):
+def build_heart():
     heart_surf = pygame.Surface((28,28), pygame.SRCALPHA)
     pygame.draw.circle(heart_surf, (255,100,120, 200), (8,8), 8)
     pygame.draw.circle(heart_surf, (255,100,120, 200), (20,8), 8)
     pygame.draw.polygon(heart_surf, (255,100,120, 200), [(4,12),(24,12),(14,24)])
+    return heart_surf
+
+def draw_lives(surf, x, y, lives):
+    heart_surf = surf_cache.get(("heart",), build_heart)
     for i in range(lives):
         surf.blit(heart_surf, (x + i * 26, y))
         
@@ -442,7 +859,7 @@ def draw_powerup_bar(surf, y, label, current_time, max_time, color):
     pygame.draw.rect(surf, color, (bar_x, bar_y, fill_width, bar_height), border_radius=5)
     
     # Label
-    label_text = font_sm.render(label, True, (200, 200, 220))
+    label_text = text_cache.render(font_sm, label, (200, 200, 220))
     label_rect = label_text.get_rect(center=(SCREEN_W // 2, y + bar_height + 14))
     surf.blit(label_text, label_rect)
 
@@ -453,21 +870,20 @@ def draw_hud(surface, player, wave):
     pygame.draw.line(surface, (139, 92, 246), (0, 59), (SCREEN_W, 59), 2)
     
     # Left: Lives
-    lives_label = font_hud_label.render("LIVES", True, (167, 139, 250))
+    lives_label = text_cache.render(font_hud_label, "LIVES", (167, 139, 250))
     surface.blit(lives_label, (20, 10))
     draw_lives(surface, 20, 25, max(0, player.lives))
     
     # Center: Score
-    score_label = font_hud_label.render("SCORE", True, (167, 139, 250))
-    score_text = font_hud_score.render(f"{player.score:06d}", True, (59, 130, 246))
+    score_label = text_cache.render(font_hud_label, "SCORE", (167, 139, 250))
     score_rect_label = score_label.get_rect(center=(SCREEN_W//2, 18))
-    score_rect_value = score_text.get_rect(center=(SCREEN_W//2, 40))
     surface.blit(score_label, score_rect_label)
-    surface.blit(score_text, score_rect_value)
+    # The score animates toward target_score, so it is composed from cached digit glyphs
+    text_cache.draw_digits(surface, font_hud_score, f"{player.score:06d}", (59, 130, 246), (SCREEN_W//2, 40))
     
     # Right: Wave
-    wave_label = font_hud_label.render("WAVE", True, (167, 139, 250))
-    wave_text = font_hud_wave.render(f"{wave:02d}", True, (139, 92, 246))
+    wave_label = text_cache.render(font_hud_label, "WAVE", (167, 139, 250))
+    wave_text = text_cache.render(font_hud_wave, f"{wave:02d}", (139, 92, 246))
     surface.blit(wave_label, (SCREEN_W - wave_label.get_width() - 20, 18))
     surface.blit(wave_text, (SCREEN_W - wave_text.get_width() - 20, 36))
     
@@ -484,25 +900,21 @@ def draw_hud(surface, player, wave):
 
 def draw_menu_background():
     # Similar to the game loop background
-    global p1, p2
-    dt = 1.0/FPS
-    p1 = (p1 - 18 * dt) % SCREEN_W
-    p2 = (p2 - 45 * dt) % SCREEN_W
-    screen.blit(bg_base, (0,0))
-    s1 = bg_layer1; s2 = bg_layer2
-    screen.blit(s1, (-p1, 0)); screen.blit(s1, (-p1 + SCREEN_W, 0))
-    screen.blit(s2, (-p2, 0)); screen.blit(s2, (-p2 + SCREEN_W, 0))
+    background.scroll(1.0/FPS)
+    background.draw(screen)
 
 class MenuBullet(pygame.sprite.Sprite):
     def __init__(self, x, y, vy):
         super().__init__()
         self.size = 6
-        self.image = pygame.Surface((self.size, self.size), pygame.SRCALPHA)
+        self.image = surf_cache.get(("blank", self.size), lambda: pygame.Surface((self.size, self.size), pygame.SRCALPHA))
         self.rect = self.image.get_rect(center=(x, y))
+        self.y = float(self.rect.y)
         self.vy = vy
     
     def update(self, dt):
-        self.rect.y += self.vy * dt
+        self.y += self.vy * dt
+        self.rect.y = self.y
         if self.rect.bottom < 0:
             self.kill()
 
@@ -513,16 +925,21 @@ class MenuBullet(pygame.sprite.Sprite):
         # Create a glowing trail behind the bullet
         glow_alpha = 100
         for i in range(1, 4):
-            glow_surf = pygame.Surface((self.size + i*4, self.size + i*4), pygame.SRCALPHA)
-            pygame.draw.circle(glow_surf, (255, 255, 255, glow_alpha - i*20), (glow_surf.get_width() // 2, glow_surf.get_height() // 2), self.size // 2 + i*2)
+            glow_surf = surf_cache.get(("menu_glow", self.size, i), lambda: self.build_glow(i, glow_alpha))
             surface.blit(glow_surf, glow_surf.get_rect(center=self.rect.center))
 
+    def build_glow(self, i, glow_alpha):
+        glow_surf = pygame.Surface((self.size + i*4, self.size + i*4), pygame.SRCALPHA)
+        pygame.draw.circle(glow_surf, (255, 255, 255, glow_alpha - i*20), (glow_surf.get_width() // 2, glow_surf.get_height() // 2), self.size // 2 + i*2)
+        return glow_surf
+
 class PlayerRocket(pygame.sprite.Sprite):
     def __init__(self, img, exhaust_img):
         super().__init__()
         self.image = img
         self.exhaust_img = exhaust_img
         self.rect = self.image.get_rect(centerx=SCREEN_W//2, bottom=SCREEN_H+20)
+        self.y = float(self.rect.y)
         self.vy = -180
         self.exhaust_t = 0.0
         self.bullets = pygame.sprite.Group()
@@ -530,7 +947,8 @@ class PlayerRocket(pygame.sprite.Sprite):
         self.cool = self.shoot_cooldown
         
     def update(self, dt):
-        self.rect.y += self.vy * dt
+        self.y += self.vy * dt
+        self.rect.y = self.y
         self.exhaust_t += dt
         self.cool -= dt
         
@@ -541,7 +959,7 @@ class PlayerRocket(pygame.sprite.Sprite):
         self.bullets.update(dt)
 
         if self.rect.bottom < 0:
-            self.rect.y = SCREEN_H + 20
+            self.y = self.rect.y = SCREEN_H + 20
             self.bullets.empty()
             
     def draw(self, surface):
@@ -552,6 +970,23 @@ class PlayerRocket(pygame.sprite.Sprite):
         surface.blit(self.exhaust_img, exhaust_rect)
         self.bullets.draw(surface)
 
+startup_reported = False
+
+def report_startup():
+    # python main.py --startup-report: print the time to the first menu frame, wait for
+    # the background loads, print when the game became ready plus a per-asset breakdown, and quit
+    global startup_reported
+    startup_reported = True
+    if "--startup-report" not in sys.argv: return
+    elapsed = (time.perf_counter() - STARTUP_T0) * 1000.0
+    print(f"first menu frame after {elapsed:.1f} ms")
+    assets.wait()
+    print(f"all assets ready after {(assets.ready_at - STARTUP_T0) * 1000.0:.1f} ms (asset cache: {asset_cache.hits} hits, {asset_cache.misses} misses)")
+    print(assets.report())
+    print(asset_cache.sound_report())
+    pygame.quit()
+    sys.exit(0)
+
 def start_menu():
     global game_state
     
@@ -567,7 +1002,7 @@ def start_menu():
     button_rect = pygame.Rect((SCREEN_W - button_w) / 2, button_y, button_w, button_h)
 
     # Initialize the rocket animation
-    rocket = PlayerRocket(player_img, player_exhaust_img)
+    rocket = PlayerRocket(assets["player_img"], assets["player_exhaust_img"])
 
     while game_state == "menu":
         dt = clock.tick(FPS) / 1000.0
@@ -591,12 +1026,12 @@ def start_menu():
         pygame.draw.rect(screen, (139, 92, 246), menu_rect, 2, border_radius=20)
         
         # Title text
-        title_text = font_menu_title.render("SPACE INVADERS", True, (139, 92, 246))
-        title_text.set_alpha(180 + int(75 * abs(math.sin(pygame.time.get_ticks()/1000)))) # pulsing alpha
+        pulse = alpha_bucket(180 + int(75 * abs(math.sin(pygame.time.get_ticks()/1000))), 4) # pulsing alpha
+        title_text = text_cache.render(font_menu_title, "SPACE INVADERS", (139, 92, 246), alpha=pulse)
         title_rect = title_text.get_rect(center=(SCREEN_W // 2, menu_rect.top + 80))
         screen.blit(title_text, title_rect)
 
-        sub_text = font_menu_sub.render("Defend Earth from the alien invasion!", True, (167, 139, 250))
+        sub_text = text_cache.render(font_menu_sub, "Defend Earth from the alien invasion!", (167, 139, 250))
         sub_rect = sub_text.get_rect(center=(SCREEN_W // 2, menu_rect.top + 130))
         screen.blit(sub_text, sub_rect)
         
@@ -608,247 +1043,329 @@ def start_menu():
         
         draw_rounded_rect(screen, button_rect, button_color, 10)
         
-        button_text = font_menu_button.render("START GAME", True, (255, 255, 255))
+        button_text = text_cache.render(font_menu_button, "START GAME", (255, 255, 255))
         button_text_rect = button_text.get_rect(center=button_rect.center)
         screen.blit(button_text, button_text_rect)
         
-        controls_text = font_menu_sub.render("Use ← → arrows to move, SPACE to shoot", True, (167, 139, 250))
+        controls_text = text_cache.render(font_menu_sub, "Use ← → arrows to move, SPACE to shoot", (167, 139, 250))
         controls_rect = controls_text.get_rect(center=(SCREEN_W // 2, menu_rect.bottom - 40))
         screen.blit(controls_text, controls_rect)
 
         pygame.display.flip()
+        assets.poll() # finalize background loads (display conversion, music) once they land
+        if not startup_reported:
+            report_startup()
 
 # ---------------- GAME STATE ----------------
 game_state = "menu" # Initial state: "menu", "game", "game_over"
-paused = False
-
-# ---------------- MAIN LOOP ----------------
-running = True
-while running:
-    dt = clock.tick(FPS) / 1000.0
-
-    if game_state == "menu":
-        start_menu()
-        continue
-    
-    shoot_pressed = False
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT: running = False
-        elif event.type == pygame.KEYDOWN:
-            if event.key in (pygame.K_ESCAPE, pygame.K_p):
-                paused = not paused
-            elif game_state == "game" and not paused and event.key in (pygame.K_SPACE, pygame.K_w, pygame.K_UP):
-                shoot_pressed = True
-            elif game_state == "game_over" and event.key == pygame.K_r:
-                game_state = "menu"
-                # Reset game variables
-                for g in (enemy_group, bullet_group, effects_group, particles_group, powerups_group, asteroid_group):
-                    for s in g: s.kill()
-                player.lives = 5
-                player.score = 0
-                player.target_score = 0
-                player.inv = player.flash = player.rapid = player.shield = 0
-                wave = 1
-                wave_cooldown = 2.0
-                wave_active = False
-
-    if paused:
-        screen.blit(bg_base, (0,0))
-        ptxt = font_big.render("PAUSED", True, (240,240,255))
-        screen.blit(ptxt, (SCREEN_W//2 - ptxt.get_width()//2, SCREEN_H//2 - 40))
-        pygame.display.flip()
-        continue
-
-    if game_state == "game_over":
-        screen.blit(bg_base, (0,0))
-        screen.blit(vignette, (0,0))
-        gtxt = font_big.render("GAME OVER", True, (255,80,80))
-        stxt = font_md.render("Press R to Restart", True, (235,240,255))
-        ftxt = font_md.render(f"Final Score: {player.score:,}", True, (235,240,255))
-        
-        # New "How to Play" section
-        how_to_play_title = font_md.render("How to Play:", True, (255, 255, 255))
-        how_to_play_text1 = font_sm.render("• Use ← and → arrows to move.", True, (200, 200, 220))
-        how_to_play_text2 = font_sm.render("• Press SPACE to shoot.", True, (200, 200, 220))
-        how_to_play_text3 = font_sm.render("• Press ESC or P to pause.", True, (200, 200, 220))
-        how_to_play_text4 = font_sm.render("• Power-ups: Heal (green), Rapid Fire (blue), Shield (yellow).", True, (200, 200, 220))
-
-        gtxt_rect = gtxt.get_rect(center=(SCREEN_W//2, SCREEN_H//2 - 120))
-        ftxt_rect = ftxt.get_rect(center=(SCREEN_W//2, SCREEN_H//2 - 60))
-        stxt_rect = stxt.get_rect(center=(SCREEN_W//2, SCREEN_H//2 - 20))
-        
-        htp_title_rect = how_to_play_title.get_rect(center=(SCREEN_W//2, SCREEN_H//2 + 40))
-        htp_text1_rect = how_to_play_text1.get_rect(center=(SCREEN_W//2, SCREEN_H//2 + 80))
-        htp_text2_rect = how_to_play_text2.get_rect(center=(SCREEN_W//2, SCREEN_H//2 + 105))
-        htp_text3_rect = how_to_play_text3.get_rect(center=(SCREEN_W//2, SCREEN_H//2 + 130))
-        htp_text4_rect = how_to_play_text4.get_rect(center=(SCREEN_W//2, SCREEN_H//2 + 155))
-        
-        screen.blit(gtxt, gtxt_rect)
-        screen.blit(ftxt, ftxt_rect)
-        screen.blit(stxt, stxt_rect)
-        screen.blit(how_to_play_title, htp_title_rect)
-        screen.blit(how_to_play_text1, htp_text1_rect)
-        screen.blit(how_to_play_text2, htp_text2_rect)
-        screen.blit(how_to_play_text3, htp_text3_rect)
-        screen.blit(how_to_play_text4, htp_text4_rect)
-
-        pygame.display.flip()
-        continue
-
-    p1 = (p1 - 18*dt) % SCREEN_W
-    p2 = (p2 - 45*dt) % SCREEN_W
-
-    keys = pygame.key.get_pressed()
-    player.update(dt, keys)
-    if shoot_pressed:
-        player.shoot(bullet_group)
-
-    if not wave_active:
-        wave_cooldown -= dt
-        if wave_cooldown <= 0:
-            for e in list(enemy_group): e.kill()
-            for b in list(bullet_group): b.kill()
-            
-            spawn_wave(min(6 + wave, 22), wave)
-            wave_active = True
-            wave_cooldown = 0
-
-    if wave_active:
-        for e in list(enemy_group):
-            e.update(dt)
-            e.try_shoot(dt, bullet_group)
-    
-    for b in list(bullet_group):
-        b.update(dt)
-
-    effects_group.update(dt)
-    particles_group.update(dt)
-    powerups_group.update(dt)
-    asteroid_group.update(dt)
-
-    for b in [x for x in bullet_group if x.friendly]:
-        if wave_active:
-            hits = [e for e in enemy_group if e.alive and e.rect.colliderect(b.rect)]
-            if hits:
-                b.kill()
-                for e in hits:
-                    e.explode(effects_group, particles_group)
-                    enemy_group.remove(e)
-                    player.target_score += e.score_val
-                    if random.random() < 0.16:
-                        p = PowerUp(e.rect.center)
-                        powerups_group.add(p)
-                if hit_snd: hit_snd.play()
-        for a in list(asteroid_group):
-            if a.rect.colliderect(b.rect):
-                b.kill()
-                a.kill()
-                player.target_score += 10
-                break
-
-    for b in [x for x in bullet_group if not x.friendly]:
-        if player.rect.colliderect(b.rect):
-            b.kill()
-            if player.hit():
-                game_state = "game_over"
-                break
 
-    for a in list(asteroid_group):
-        if player.rect.colliderect(a.rect):
-            a.kill()
-            if player.hit():
-                game_state = "game_over"
-                break
-
-    for p in list(powerups_group):
-        if player.rect.colliderect(p.rect):
-            apply_powerup(player, p.type)
-            p.kill()
-
-    if wave_active and not enemy_group:
-        wave += 1
-        wave_active = False
-        wave_cooldown = 3.0
-        for b in list(bullet_group):
-            if b.friendly: b.kill()
+# ---------------- RENDERING ----------------
+def draw_paused(surf):
+    background.draw_static(surf, vignette=False)
+    ptxt = text_cache.render(font_big, "PAUSED", (240,240,255))
+    surf.blit(ptxt, (SCREEN_W//2 - ptxt.get_width()//2, SCREEN_H//2 - 40))
+
+def draw_game_over(surf, player):
+    background.draw_static(surf)
+    gtxt = text_cache.render(font_big, "GAME OVER", (255,80,80))
+    stxt = text_cache.render(font_md, "Press R to Restart", (235,240,255))
+    ftxt = text_cache.render(font_md, f"Final Score: {player.score:,}", (235,240,255))
+
+    # New "How to Play" section
+    how_to_play_title = text_cache.render(font_md, "How to Play:", (255, 255, 255))
+    how_to_play_text1 = text_cache.render(font_sm, "• Use ← and → arrows to move.", (200, 200, 220))
+    how_to_play_text2 = text_cache.render(font_sm, "• Press SPACE to shoot.", (200, 200, 220))
+    how_to_play_text3 = text_cache.render(font_sm, "• Press ESC or P to pause.", (200, 200, 220))
+    how_to_play_text4 = text_cache.render(font_sm, "• Power-ups: Heal (green), Rapid Fire (blue), Shield (yellow).", (200, 200, 220))
+
+    gtxt_rect = gtxt.get_rect(center=(SCREEN_W//2, SCREEN_H//2 - 120))
+    ftxt_rect = ftxt.get_rect(center=(SCREEN_W//2, SCREEN_H//2 - 60))
+    stxt_rect = stxt.get_rect(center=(SCREEN_W//2, SCREEN_H//2 - 20))
+
+    htp_title_rect = how_to_play_title.get_rect(center=(SCREEN_W//2, SCREEN_H//2 + 40))
+    htp_text1_rect = how_to_play_text1.get_rect(center=(SCREEN_W//2, SCREEN_H//2 + 80))
+    htp_text2_rect = how_to_play_text2.get_rect(center=(SCREEN_W//2, SCREEN_H//2 + 105))
+    htp_text3_rect = how_to_play_text3.get_rect(center=(SCREEN_W//2, SCREEN_H//2 + 130))
+    htp_text4_rect = how_to_play_text4.get_rect(center=(SCREEN_W//2, SCREEN_H//2 + 155))
+
+    surf.blit(gtxt, gtxt_rect)
+    surf.blit(ftxt, ftxt_rect)
+    surf.blit(stxt, stxt_rect)
+    surf.blit(how_to_play_title, htp_title_rect)
+    surf.blit(how_to_play_text1, htp_text1_rect)
+    surf.blit(how_to_play_text2, htp_text2_rect)
+    surf.blit(how_to_play_text3, htp_text3_rect)
+    surf.blit(how_to_play_text4, htp_text4_rect)
+
+# Sprites are queued per layer and drawn with one blits/fblits call per layer (render.py)
+draw_list = DrawList(("asteroids", "enemies", "bullets", "effects", "particles", "powerups", "player"), areas=("effects",))
+
+def queue_ship(dl, player, ox=0, oy=0):
+    r = player.rect
+    if player.shield > 0:
+        glow = glow_ellipse((r.width+24, r.height+24), (130,200,255,85))
+        dl.add("player", glow, r.centerx - glow.get_width()//2 + ox, r.centery - glow.get_height()//2 + oy)
 
-    shake.update(dt)
+    # --- Player Ship Polish Drawing ---
+    # Engine trail and damage sparks are emitted by GameSimulation.emit_ship_particles
+
+    # Subtle Hull Lighting/Reflections
+    glow_alpha = alpha_bucket(30 + 20 * abs(math.sin(pygame.time.get_ticks() / 600)), 4)
+    def build_hull_glow():
+        glow_surf = pygame.Surface(player.image.get_size(), pygame.SRCALPHA)
+        pygame.draw.circle(glow_surf, (200, 220, 255, glow_alpha), (player.image.get_width()//2, player.image.get_height()//2), player.image.get_width()//2-10)
+        return glow_surf
+    glow_surf = surf_cache.get(("hull_glow", player.image.get_size(), glow_alpha), build_hull_glow)
+    dl.add("player", glow_surf, r.x + ox, r.y + oy)
+    dl.add("player", player.image, r.x + ox, r.y + oy)
+
+def queue_sprites(dl, sim, ox=0, oy=0, alpha=1.0, skip=()):
+    # Everything between the background and the HUD, in draw order; layers in skip are left out
+    k = 1.0 - alpha
+    if "asteroids" not in skip:
+        dl.extend("asteroids", sim.asteroid_field.blit_list(ox, oy, alpha))
+    if sim.wave_active:
+        dl.extend("enemies", sim.enemies.blit_list(ox, oy, alpha))
+    dl.extend("bullets", sim.bullets.blit_list(ox, oy, alpha))
+    dl.extend("effects", [(fx.image, (fx.rect.x + ox, fx.rect.y + oy), fx.area) for fx in sim.effects_group])
+    if "particles" not in skip:
+        dl.extend("particles", sim.particles.blit_list(ox, oy))
+    seq = dl.layers["powerups"]
+    glows = {}  # one glow per power-up size this frame
+    for p in sim.powerups_group:
+        r = p.rect
+        py = oy + round((p.py - p.y) * k)
+        glow = glows.get(r.size)
+        if glow is None:
+            glow = glows[r.size] = glow_ellipse((r.width+18, r.height+18), (240,240,255,70))
+        seq.append((glow, (r.centerx - (r.width+18)//2 + ox, r.centery - (r.height+18)//2 + py)))
+        seq.append((p.image, (r.x + ox, r.y + py)))
+    player = sim.player
+    queue_ship(dl, player, ox + round((player.px - player.x) * k), oy)
+
+def draw_wave_banner(surf, sim):
+    wave_text = text_cache.render(font_big, f"WAVE {sim.wave}", (255, 255, 255))
+    wave_rect = wave_text.get_rect(center=(SCREEN_W//2, SCREEN_H//2))
+    return surf.blit(wave_text, wave_rect)
+
+def draw_game(surf, sim, alpha=1.0):
+    # alpha: how far between the previous and the latest simulation step to draw
+    # movers (1 = latest); particles and explosions are drawn as stepped
+    player = sim.player
     ox, oy = shake.offset()
 
-    screen.blit(bg_base, (ox//3, oy//3))
-    s1 = bg_layer1; s2 = bg_layer2
-    screen.blit(s1, (-p1 + ox, 0+oy)); screen.blit(s1, (-p1 + SCREEN_W + ox, 0+oy))
-    screen.blit(s2.copy(), (-p2 + ox, 0+oy)); screen.blit(s2.copy(), (-p2 + SCREEN_W + ox, 0+oy))
-
-    for a in asteroid_group:
-        screen.blit(a.image, a.rect.move(ox, oy))
-
-    if wave_active:
-        for e in enemy_group:
-            screen.blit(e.image, e.rect.move(ox, oy))
-    for b in bullet_group:
-        screen.blit(b.image, b.rect.move(ox, oy))
-    for fx in effects_group:
-        screen.blit(fx.image, fx.rect.move(ox, oy))
-    for pr in particles_group:
-        screen.blit(pr.image, pr.rect.move(ox, oy))
-    for p in powerups_group:
-        glow = pygame.Surface((p.rect.width+18, p.rect.height+18), pygame.SRCALPHA)
-        pygame.draw.ellipse(glow, (240,240,255,70), glow.get_rect())
-        screen.blit(glow, glow.get_rect(center=p.rect.center).move(ox, oy))
-        screen.blit(p.image, p.rect.move(ox, oy))
+    with profiler.scope("background"):
+        background.draw(surf, ox, oy)
+
+    with profiler.scope("sprites"):
+        queue_sprites(draw_list, sim, ox, oy, alpha)
+        draw_list.submit(surf)
+        draw_list.report(profiler)
+    with profiler.scope("hud"):
+        draw_hud(surf, player, sim.wave)
+    with profiler.scope("background"):
+        background.draw_vignette(surf)
+
+    with profiler.scope("hud"):
+        if not sim.wave_active:
+            draw_wave_banner(surf, sim)
+
+def draw_profiler(surf):
+    # Profiler overlay, drawn outside the timed scopes; None while profiling is off
+    if profiler.enabled:
+        return profiler.draw_overlay(surf, font_profiler)
+
+# ---------------- DIRTY-RECT RENDERER ----------------
+class DirtyRenderer:
+    # Optional low-bandwidth presenter (python main.py --dirty-rects). Everything is
+    # drawn over the live background (Background.update_sky: base + scrolling stars,
+    # vignette on top); the rects covered by the draw layers, particles and the HUD
+    # are restored from it next frame along with the stars that moved, and only the
+    # changed regions are sent to display.update(). Shake falls back to a flip.
+    HUD_RECT = pygame.Rect(0, 0, SCREEN_W, 130)
 
-    if player.shield > 0:
-        glow = pygame.Surface((player.rect.width+24, player.rect.height+24), pygame.SRCALPHA)
-        pygame.draw.ellipse(glow, (130,200,255,85), glow.get_rect())
-        screen.blit(glow, glow.get_rect(center=player.rect.center).move(ox, oy))
-
-    # --- Player Ship Polish Drawing ---
-    
-    # 1. Engine Trails with Afterburners
-    engine_color = (255, 120, 0) if player.is_shooting else (120, 200, 255)
-    
-    if player.engine_t > 0.05:
-        player.engine_t = 0
-        particles_group.add(Particle(
-            pos=player.rect.midbottom,
-            color=engine_color,
-            life=0.2,
-            gravity=0,
-            velocity_range=(-30, 30, 100, 150)
-        ))
-        
-    # 2. Subtle Hull Lighting/Reflections
-    glow_alpha = 30 + 20 * abs(math.sin(pygame.time.get_ticks() / 600))
-    glow_surf = pygame.Surface(player.image.get_size(), pygame.SRCALPHA)
-    pygame.draw.circle(glow_surf, (200, 220, 255, glow_alpha), (player.image.get_width()//2, player.image.get_height()//2), player.image.get_width()//2-10)
-    screen.blit(glow_surf, player.rect.move(ox,oy))
-
-    # 3. Damage Indicators (Sparks)
-    if player.damage_spark_timer > 0:
-        if random.random() < 0.35:  
-            spark_pos = (
-                player.rect.x + random.randint(0, player.rect.width),
-                player.rect.y + random.randint(0, player.rect.height)
-            )
-            particles_group.add(Particle(
-                pos=spark_pos,
-                color=(255, 255, 255),
-                life=0.15,
-                gravity=100,
-                velocity_range=(-200, 200, -200, -20)
-            ))
-
-    screen.blit(player.image, player.rect.move(ox, oy))
-    draw_hud(screen, player, wave)
-    screen.blit(vignette, (0,0))
-    
-    if not wave_active:
-        wave_text = font_big.render(f"WAVE {wave}", True, (255, 255, 255))
-        wave_rect = wave_text.get_rect(center=(SCREEN_W//2, SCREEN_H//2))
-        screen.blit(wave_text, wave_rect)
+    def __init__(self):
+        self.extra = []  # rects drawn over last frame
+        self.full = True
+        self.rects_sent = 0
+
+    def invalidate(self):
+        self.full = True
+
+    def present(self, surf, sim):
+        ox, oy = shake.offset()
+        if ox or oy:
+            # Everything moves under shake; dirty tracking would cover the screen anyway
+            draw_game(surf, sim)
+            draw_profiler(surf)
+            with profiler.scope("flip"):
+                pygame.display.flip()
+            self.invalidate()
+            return
+
+        with profiler.scope("background"):
+            stars = background.update_sky()
+            if self.full:
+                self.extra = [surf.get_rect()]
+                self.full = False
+            # Restore what everything drawn last frame covered, and the stars that moved
+            restored = self.extra + stars
+            background.restore(surf, restored)
+
+        with profiler.scope("sprites"):
+            # Particles report one bounding rect
+            queue_sprites(draw_list, sim, skip=("particles",))
+            extra = draw_list.submit(surf, True, ("asteroids", "enemies", "bullets", "effects"))
+            extra += sim.particles.draw(surf, doreturn=True)
+            extra += draw_list.submit(surf, True, ("powerups", "player"))
+            draw_list.report(profiler)
+        with profiler.scope("hud"):
+            background.restore(surf, [self.HUD_RECT])
+            draw_hud(surf, sim.player, sim.wave)
+            extra.append(self.HUD_RECT)
+            if not sim.wave_active:
+                extra.append(draw_wave_banner(surf, sim))
+        overlay = draw_profiler(surf)
+        if overlay: extra.append(overlay)
+
+        self.extra = extra
+        dirty = restored + extra
+        self.rects_sent = len(dirty)
+        with profiler.scope("flip"):
+            pygame.display.update(dirty)
 
-    pygame.display.flip()
+# ---------------- MAIN LOOP ----------------
+def save_log(log, sim, path):
+    log.finish(sim)
+    log.save(path)
+    print(f"recorded {len(log)} steps at {log.hz} Hz (seed {log.seed}, score {log.score}) to {path}")
+
+def open_window():
+    # Only the game itself needs a window; GameSimulation, headless.py and the benches
+    # import this module without one. What loaded before it (the menu assets and the
+    # background) gets its display conversion here.
+    global screen
+    screen = pygame.display.set_mode((SCREEN_W, SCREEN_H))
+    pygame.display.set_caption(TITLE)
+    try:
+        icon = pygame.image.load("3d-box.png")
+        pygame.display.set_icon(icon)
+    except:
+        pass
+    for name in ("player_img", "player_exhaust_img"):
+        assets.publish(name, convert_alpha_all(assets[name]))
+    background.convert()
+    return screen
 
-pygame.quit()
-sys.exit()
\ No newline at end of file
+def main():
+    global game_state
+    open_window()
+    sim = None # built after the menu, once the background loads are in
+    paused = False
+    renderer = DirtyRenderer() if "--dirty-rects" in sys.argv else None
+    static_shown = None # pause/game-over screen already on display, nothing to redraw
+
+    profile_out = sys.argv[sys.argv.index("--profile-out") + 1] if "--profile-out" in sys.argv else "profile.json"
+    # --record PATH saves each session's inputs for headless.py --replay; --seed N fixes the seed
+    record_path = sys.argv[sys.argv.index("--record") + 1] if "--record" in sys.argv else None
+    seed = int(sys.argv[sys.argv.index("--seed") + 1]) if "--seed" in sys.argv else None
+    log = None
+    acc = 0.0 # real time not yet simulated
+    shoot_pending = False # a shot press waiting for the next simulation step
+
+    running = True
+    while running:
+        dt = clock.tick(FPS) / 1000.0
+        profiler.begin_frame()
+
+        if game_state == "menu":
+            start_menu()
+            if sim is None:
+                assets.wait() # ready barrier: nothing below spawns before every asset is loaded
+                sim = GameSimulation()
+            sim.reset(seed if seed is not None else random.randrange(2**32))
+            if record_path: log = InputLog(sim.seed, SIM_HZ, sim.pixel_perfect, sim.enemies.mode == "formation")
+            acc = 0.0
+            continue
+
+        shoot_pressed = False
+        with profiler.scope("input"):
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT: running = False
+                elif event.type == pygame.KEYDOWN:
+                    if event.key in (pygame.K_ESCAPE, pygame.K_p):
+                        paused = not paused
+                    elif event.key == pygame.K_F3:
+                        profiler.toggle()
+                        if renderer: renderer.invalidate()
+                    elif event.key == pygame.K_F4:
+                        profiler.export(profile_out)
+                        print(f"profile written to {profile_out}")
+                    elif event.key == pygame.K_F5 and log is not None:
+                        print("mask collisions are fixed while recording")
+                    elif event.key == pygame.K_F5 and sim is not None:
+                        sim.pixel_perfect = not sim.pixel_perfect
+                        print(f"mask collisions {'on' if sim.pixel_perfect else 'off'} ({len(mask_cache)} masks cached)")
+                    elif game_state == "game" and not paused and event.key in (pygame.K_SPACE, pygame.K_w, pygame.K_UP):
+                        shoot_pressed = True
+                    elif game_state == "game_over" and event.key == pygame.K_r:
+                        game_state = "menu"
+            keys = pygame.key.get_pressed()
+
+        if paused or game_state == "game_over":
+            # Static screens are presented once and then just idle on clock.tick
+            shown = "paused" if paused else ("game_over", sim.player.score)
+            if static_shown != shown:
+                if paused:
+                    audio.clear() # the effects stop with the game
+                    draw_paused(screen)
+                else: draw_game_over(screen, sim.player)
+                pygame.display.flip()
+                static_shown = shown
+                if renderer: renderer.invalidate()
+            acc = 0.0
+            shoot_pending = False
+            continue
+        static_shown = None
+
+        background.scroll(dt)
+
+        # Fixed-step simulation: run as many SIM_DT steps as real time allows, at
+        # most MAX_STEPS per rendered frame; time beyond that is dropped (slowdown)
+        acc += dt
+        shoot_pending |= shoot_pressed
+        steps = 0
+        while acc >= SIM_DT and not sim.game_over:
+            if steps == MAX_STEPS:
+                acc = 0.0
+                break
+            sim.step(SIM_DT, keys, shoot_pending)
+            if log is not None:
+                log.append(key_mask(keys, shoot_pending))
+            shoot_pending = False
+            acc -= SIM_DT
+            steps += 1
+        # Sounds the steps asked for reach the mixer here, outside the simulation
+        with profiler.scope("audio"):
+            audio.dispatch()
+        if sim.game_over:
+            game_state = "game_over"
+            if log is not None: save_log(log, sim, record_path)
+            log = None
+
+        if renderer:
+            renderer.present(screen, sim)
+        else:
+            draw_game(screen, sim, min(acc / SIM_DT, 1.0))
+            draw_profiler(screen)
+            with profiler.scope("flip"):
+                pygame.display.flip()
+        profiler.end_frame()
+
+    if log is not None: save_log(log, sim, record_path)
+    if "--profile-out" in sys.argv and profiler.frames:
+        profiler.export(profile_out)
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import math
+from collections import OrderedDict
+import pygame
+
+# ---------------- MASK CACHE ----------------
+class MaskCache:
+    # Pixel-accurate narrowphase for pairs whose rects already overlap. One
+    # pygame.mask.Mask per unique image, built on first use: every explosion frame,
+    # scaled variant and flash overlay is its own Surface and so its own entry.
+    # The Surface itself is the key, which keeps it alive while its mask is cached,
+    # so the cache is an LRU like SurfaceCache: images that stop showing up (a
+    # rescaled or regenerated set) are dropped instead of pinned for good.
+    def __init__(self, max_items=256):
+        self.max_items = max_items
+        self.masks = OrderedDict()
+        self.tests = 0
+        self.rejects = 0  # rect hits the masks turned down
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.masks)
+
+    def get(self, surf):
+        m = self.masks.get(surf)
+        if m is not None:
+            self.masks.move_to_end(surf)
+            return m
+        m = self.masks[surf] = pygame.mask.from_surface(surf)
+        if len(self.masks) > self.max_items:
+            self.masks.popitem(last=False)
+            self.evictions += 1
+        return m
+
+    def overlap(self, img_a, pos_a, img_b, pos_b):
+        self.tests += 1
+        offset = (pos_b[0] - pos_a[0], pos_b[1] - pos_a[1])
+        if self.get(img_a).overlap(self.get(img_b), offset) is not None: return True
+        self.rejects += 1
+        return False
+
+    def sprites(self, a, b):
+        return self.overlap(a.image, a.rect.topleft, b.image, b.rect.topleft)
+
+    def bullet(self, pool, slot, image, rect):
+        # A BulletPool slot against a sprite along the bullet's last move, sampled
+        # at least once per bullet width/height so no pixel of the path is skipped
+        img = pool.images[pool.img[slot]]
+        w, h = img.get_size()
+        x0, y0, x1, y1 = float(pool.px[slot]), float(pool.py[slot]), float(pool.x[slot]), float(pool.y[slot])
+        steps = max(1, math.ceil(max(abs(x1 - x0) / w, abs(y1 - y0) / h)))
+        target = self.get(image)
+        mask = self.get(img)
+        self.tests += 1
+        for k in range(steps + 1):
+            t = k / steps
+            left = math.floor(x0 + (x1 - x0) * t) - w // 2
+            top = math.floor(y0 + (y1 - y0) * t) - h // 2
+            if target.overlap(mask, (left - rect.x, top - rect.y)) is not None: return True
+        self.rejects += 1
+        return False
+
+    def reset_stats(self):
+        self.tests = self.rejects = self.evictions = 0
+
+    def stats(self):
+        return {"masks": len(self.masks), "tests": self.tests, "rejects": self.rejects, "evictions": self.evictions}
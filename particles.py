@@ -0,0 +1,115 @@
+import numpy as np
+import pygame
+
+# ---------------- PARTICLE SYSTEM ----------------
+class ParticleSystem:
+    # Array-backed particles in a fixed-size ring buffer: emitting past capacity
+    # reuses the oldest slot, so nothing is allocated per particle. Each color is
+    # drawn from a small set of pre-faded 3x3 tiles instead of a Surface per particle.
+    # The tiles are solid, so they carry surface alpha only (the top tier none):
+    # per-pixel alpha blits about half as fast and looks the same.
+    TIERS = 16
+    SIZE = 3
+
+    def __init__(self, capacity=16384, seed=None):
+        self.capacity = capacity
+        self.x = np.zeros(capacity); self.y = np.zeros(capacity)
+        self.vx = np.zeros(capacity); self.vy = np.zeros(capacity)
+        self.g = np.zeros(capacity)
+        self.life = np.zeros(capacity)
+        self.max_life = np.ones(capacity)
+        self.color = np.zeros(capacity, np.int16)
+        self.head = 0   # next slot to write
+        self.used = 0   # every live particle is in slots [0, used)
+        self.rng = np.random.default_rng(seed)
+
+        self.palette = {}
+        self.tiles = np.empty(0, object)  # palette index * TIERS + alpha tier -> Surface
+
+    def __len__(self):
+        return int(np.count_nonzero(self.life[:self.used] > 0))
+
+    def color_index(self, color):
+        c = self.palette.get(color)
+        if c is None:
+            c = self.palette[color] = len(self.palette)
+            tiles = np.empty(self.TIERS, object)
+            for t in range(self.TIERS):
+                tile = tiles[t] = pygame.Surface((self.SIZE, self.SIZE))
+                tile.fill(color)
+                if t < self.TIERS - 1: tile.set_alpha(int(255 * t / (self.TIERS - 1)))
+            self.tiles = np.concatenate((self.tiles, tiles))
+        return c
+
+    def emit(self, pos, color, count=1, life=0.45, gravity=380, velocity_range=(-150,150,-240,-20)):
+        # Same parameters as the old Particle sprite, plus how many to spawn at pos
+        count = min(count, self.capacity)
+        slots = (self.head + np.arange(count)) % self.capacity
+        self.head = (self.head + count) % self.capacity
+        self.used = max(self.used, int(slots.max()) + 1)
+        self.x[slots] = pos[0]; self.y[slots] = pos[1]
+        self.vx[slots] = self.rng.uniform(velocity_range[0], velocity_range[1], count)
+        self.vy[slots] = self.rng.uniform(velocity_range[2], velocity_range[3], count)
+        self.g[slots] = gravity
+        self.life[slots] = life
+        self.max_life[slots] = life
+        self.color[slots] = self.color_index(color)
+
+    def clear(self):
+        self.life[:self.used] = 0
+        self.head = self.used = 0
+
+    def update(self, dt):
+        # Dead slots inside [0, used) keep integrating too; they are skipped when
+        # drawing and that is cheaper than masking every array. used is then cut
+        # back to the last live slot, and the buffer starts over once all are dead.
+        n = self.used
+        if not n: return
+        life = self.life[:n]
+        life -= dt
+        live = np.flatnonzero(life > 0)
+        if not len(live):
+            self.head = self.used = 0
+            return
+        self.used = n = int(live[-1]) + 1
+        if self.head > n: self.head = n
+        self.vy[:n] += self.g[:n] * dt
+        self.x[:n] += self.vx[:n] * dt
+        self.y[:n] += self.vy[:n] * dt
+
+    def layout(self, ox=0, oy=0):
+        # (tile surfaces, xs, ys) of the live particles, or None when there are none
+        n = self.used
+        if not n: return None
+        idx = np.flatnonzero(self.life[:n] > 0)
+        if not len(idx): return None
+        if len(idx) == n: idx = slice(0, n)  # all live: views instead of copies
+        half = self.SIZE // 2
+        tier = np.ceil(self.life[idx] / self.max_life[idx] * (self.TIERS - 1)).astype(int)
+        tile = self.color[idx] * self.TIERS + np.clip(tier, 0, self.TIERS - 1)
+        xs = (np.floor(self.x[idx]) - half + ox).astype(int).tolist()
+        ys = (np.floor(self.y[idx]) - half + oy).astype(int).tolist()
+        return self.tiles[tile].tolist(), xs, ys
+
+    def blit_list(self, ox=0, oy=0):
+        # (surface, pos) pairs for a batched blit; zip/map build them in C
+        lay = self.layout(ox, oy)
+        if lay is None: return []
+        tiles, xs, ys = lay
+        return list(zip(tiles, zip(xs, ys)))
+
+    def draw(self, surf, ox=0, oy=0, doreturn=False):
+        # With doreturn a single bounding rect of everything drawn is returned, which
+        # keeps dirty-rect updates cheap even with thousands of particles
+        lay = self.layout(ox, oy)
+        if lay is None: return []
+        tiles, xs, ys = lay
+        # Streamed rather than listed: each pair is freed once blitted, so 10k+ of
+        # them never pile up for the garbage collector to walk
+        seq = zip(tiles, zip(xs, ys))
+        fblits = getattr(surf, "fblits", None)
+        if fblits: fblits(seq)
+        else: surf.blits(seq, False)
+        if not doreturn: return []
+        x0 = min(xs); y0 = min(ys)
+        return [pygame.Rect(x0, y0, max(xs) - x0 + self.SIZE, max(ys) - y0 + self.SIZE).clip(surf.get_rect())]
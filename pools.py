@@ -0,0 +1,47 @@
+# ---------------- SPRITE POOLS ----------------
+class SpritePool:
+    # Free list of dead entities of one class (see entities.py, whose kill() calls
+    # release()). acquire() re-initialises a free one through setup(), which takes
+    # the constructor's arguments, or constructs a new one when the list is empty.
+    def __init__(self, cls):
+        self.cls = cls
+        self.free = []
+        self.in_use = 0
+        self.high_water = 0
+        self.created = 0
+        self.reused = 0
+
+    def new(self, *args, **kwargs):
+        obj = self.cls(*args, **kwargs)
+        obj.pool = self
+        self.created += 1
+        return obj
+
+    def prewarm(self, count, *args, **kwargs):
+        # Build sprites up front until the pool owns count of them
+        while self.created < count:
+            obj = self.new(*args, **kwargs)
+            obj.pooled = True
+            self.free.append(obj)
+
+    def acquire(self, *args, **kwargs):
+        if self.free:
+            obj = self.free.pop()
+            obj.setup(*args, **kwargs)
+            self.reused += 1
+        else:
+            obj = self.new(*args, **kwargs)
+        obj.pooled = False
+        self.in_use += 1
+        if self.in_use > self.high_water: self.high_water = self.in_use
+        return obj
+
+    def release(self, obj):
+        if obj.pooled: return  # killed twice
+        obj.pooled = True
+        self.in_use -= 1
+        self.free.append(obj)
+
+    def stats(self):
+        return {"in_use": self.in_use, "free": len(self.free), "high_water": self.high_water,
+                "created": self.created, "reused": self.reused}
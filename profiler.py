@@ -0,0 +1,161 @@
+import time, json, csv
+from collections import deque
+import numpy as np
+import pygame
+
+# ---------------- FRAME PROFILER ----------------
+class NullScope:
+    def __enter__(self): return self
+    def __exit__(self, *exc): return False
+
+NULL_SCOPE = NullScope()
+
+class Scope:
+    # Reused for every entry of the same name; time adds up if a scope is entered
+    # several times in one frame (nesting a scope inside itself is not supported)
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.t0 = 0.0
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.add(self.name, (time.perf_counter() - self.t0) * 1000.0)
+        return False
+
+class FrameProfiler:
+    # Named per-frame timing scopes with a rolling window of samples per scope.
+    # While disabled scope() hands back one shared no-op context manager, so the
+    # instrumented code costs a method call and a with-block per scope.
+    PERCENTILES = (50, 95, 99)
+
+    def __init__(self, window=240, enabled=False, refresh=0.25):
+        self.enabled = enabled
+        self.window = window
+        self.refresh = refresh
+        self.scopes = {}
+        self.order = []      # scope names in first-seen order
+        self.current = {}    # name -> ms so far this frame
+        self.history = {}    # name -> deque of per-frame ms
+        self.counts = {}     # counter name -> total so far this frame
+        self.count_history = {}  # counter name -> deque of per-frame totals
+        self.frames = 0
+        self.frame_t0 = None
+        self.overlay = None
+        self.overlay_t = 0.0
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.frame_t0 = None
+        self.current.clear()
+        self.counts.clear()
+
+    def scope(self, name):
+        if not self.enabled: return NULL_SCOPE
+        s = self.scopes.get(name)
+        if s is None:
+            s = self.scopes[name] = Scope(self, name)
+        return s
+
+    def add(self, name, ms):
+        if name not in self.history:
+            self.history[name] = deque(maxlen=self.window)
+            self.order.append(name)
+        self.current[name] = self.current.get(name, 0.0) + ms
+
+    def count(self, name, n=1):
+        # Per-frame counters (draw calls, blits) reported next to the timings
+        if not self.enabled: return
+        if name not in self.count_history:
+            self.count_history[name] = deque(maxlen=self.window)
+        self.counts[name] = self.counts.get(name, 0) + n
+
+    def begin_frame(self):
+        # Anything recorded since the last end_frame() (menu, pause) is dropped
+        if not self.enabled: return
+        self.current.clear()
+        self.counts.clear()
+        self.frame_t0 = time.perf_counter()
+
+    def end_frame(self):
+        if not self.enabled or self.frame_t0 is None: return
+        self.add("frame", (time.perf_counter() - self.frame_t0) * 1000.0)
+        for name in self.order:
+            # Scopes skipped this frame count as 0 so percentiles stay per-frame
+            self.history[name].append(self.current.get(name, 0.0))
+        for name, hist in self.count_history.items():
+            hist.append(self.counts.get(name, 0))
+        self.current.clear()
+        self.counts.clear()
+        self.frame_t0 = None
+        self.frames += 1
+
+    def summary(self):
+        # [{scope, mean, p50, p95, p99, max}] in ms over the rolling window, "frame" first
+        rows = []
+        for name in sorted(self.order, key=lambda n: n != "frame"):
+            samples = np.fromiter(self.history[name], float)
+            if not len(samples): continue
+            row = {"scope": name, "mean": float(samples.mean())}
+            for p, v in zip(self.PERCENTILES, np.percentile(samples, self.PERCENTILES)):
+                row[f"p{p}"] = float(v)
+            row["max"] = float(samples.max())
+            rows.append(row)
+        return rows
+
+    def count_summary(self):
+        # [{counter, mean, max}] per frame over the rolling window
+        return [{"counter": name, "mean": float(np.mean(hist)), "max": int(max(hist))}
+                for name, hist in self.count_history.items() if hist]
+
+    def report(self):
+        lines = [f"{'scope':<12} {'mean':>7} {'p50':>7} {'p95':>7} {'p99':>7} {'max':>7}  ms over {min(self.frames, self.window)} frames"]
+        for r in self.summary():
+            lines.append(f"{r['scope']:<12} {r['mean']:>7.3f} {r['p50']:>7.3f} {r['p95']:>7.3f} {r['p99']:>7.3f} {r['max']:>7.3f}")
+        for r in self.count_summary():
+            lines.append(f"{r['counter']:<12} {r['mean']:>7.1f} {'':>23} {r['max']:>7}  per frame")
+        return "\n".join(lines)
+
+    def export_csv(self, path):
+        # One row per frame in the window, one column per scope
+        names = sorted(self.order, key=lambda n: n != "frame")
+        columns = [list(self.history[n]) for n in names]
+        counters = list(self.count_history)
+        columns += [list(self.count_history[n]) for n in counters]
+        with open(path, "w", newline="") as f:
+            w = csv.writer(f)
+            w.writerow(["frame"] + [f"{n}_ms" for n in names] + [n.replace(" ", "_") for n in counters])
+            first = self.frames - len(columns[0]) if columns else 0
+            for i, row in enumerate(zip(*columns)):
+                w.writerow([first + i] + [f"{v:.4f}" for v in row[:len(names)]] + list(row[len(names):]))
+
+    def export_json(self, path):
+        data = {"frames": self.frames, "window": self.window, "summary": self.summary(),
+                "samples": {n: [round(v, 4) for v in self.history[n]] for n in self.order},
+                "counters": self.count_summary(),
+                "counter_samples": {n: list(h) for n, h in self.count_history.items()}}
+        with open(path, "w") as f:
+            json.dump(data, f, indent=1)
+
+    def export(self, path):
+        if path.lower().endswith(".csv"): self.export_csv(path)
+        else: self.export_json(path)
+
+    def draw_overlay(self, surf, font, pos=(12, 140)):
+        # Table of rolling stats, re-rendered a few times a second rather than every
+        # frame; returns the rect it covered
+        now = time.perf_counter()
+        if self.overlay is None or now - self.overlay_t >= self.refresh:
+            self.overlay_t = now
+            lines = self.report().splitlines()
+            h = font.get_linesize()
+            w = max(font.size(l)[0] for l in lines) + 16
+            panel = pygame.Surface((w, h * len(lines) + 12), pygame.SRCALPHA)
+            panel.fill((0, 0, 0, 170))
+            for i, line in enumerate(lines):
+                panel.blit(font.render(line, True, (180, 255, 180)), (8, 6 + i * h))
+            self.overlay = panel
+        return surf.blit(self.overlay, pos)
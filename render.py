@@ -0,0 +1,45 @@
+# ---------------- DRAW LISTS ----------------
+class DrawList:
+    # One frame's sprites as per-layer (surface, (x, y)) sequences. The draw code
+    # fills the layers with plain position tuples, shake offset already added, so
+    # no Rect is allocated per sprite; submit() then hands each layer to a single
+    # fblits/blits call, in layer order. Layers named in areas hold (surface, pos,
+    # area) triples (atlas frames) and always go through blits. Draw calls and
+    # blits are counted for the profiler.
+    def __init__(self, layers, areas=()):
+        self.order = tuple(layers)
+        self.areas = set(areas)
+        self.layers = {name: [] for name in self.order}
+        self.draw_calls = 0
+        self.blits = 0
+
+    def add(self, layer, image, x, y):
+        self.layers[layer].append((image, (x, y)))
+
+    def extend(self, layer, seq):
+        self.layers[layer].extend(seq)
+
+    def clear(self):
+        for seq in self.layers.values(): seq.clear()
+
+    def submit(self, surf, doreturn=False, layers=None):
+        # Draw and empty the given layers (all by default); with doreturn the
+        # covered rects come back for dirty-rect presentation
+        rects = []
+        fblits = None if doreturn else getattr(surf, "fblits", None)
+        for name in layers or self.order:
+            seq = self.layers[name]
+            if not seq: continue
+            if fblits and name not in self.areas: fblits(seq)
+            elif doreturn: rects += surf.blits(seq)
+            else: surf.blits(seq, False)
+            self.draw_calls += 1
+            self.blits += len(seq)
+            seq.clear()
+        return rects
+
+    def report(self, profiler):
+        # Hand this frame's counts to the profiler and start over
+        profiler.count("draw calls", self.draw_calls)
+        profiler.count("blits", self.blits)
+        self.draw_calls = self.blits = 0
@@ -0,0 +1,98 @@
+import random, struct
+import pygame
+
+# ---------------- SEEDED RNG ----------------
+class GameRNG:
+    # One random.Random per subsystem, all derived from a single session seed, so
+    # e.g. an extra shake roll during rendering cannot shift where enemies spawn
+    STREAMS = ("spawn", "enemy", "powerup", "fx", "shake", "asteroid")
+
+    def __init__(self, seed=0):
+        self.seed(seed)
+
+    def seed(self, seed):
+        self.value = seed
+        for name in self.STREAMS:
+            setattr(self, name, random.Random(f"{seed}:{name}"))
+
+# ---------------- INPUT LOG ----------------
+# Keys the simulation reads, one bit each; bit 7 is the SPACE/W/UP keydown edge
+KEY_BITS = (pygame.K_LEFT, pygame.K_RIGHT, pygame.K_a, pygame.K_d, pygame.K_SPACE, pygame.K_w, pygame.K_UP)
+SHOOT_BIT = 1 << 7
+
+def key_mask(keys, shoot_pressed=False):
+    mask = SHOOT_BIT if shoot_pressed else 0
+    for i, k in enumerate(KEY_BITS):
+        if keys[k]: mask |= 1 << i
+    return mask
+
+class KeyMask:
+    # pygame.key.get_pressed() stand-in backed by a recorded bitmask
+    BITS = {k: 1 << i for i, k in enumerate(KEY_BITS)}
+
+    def __init__(self, mask):
+        self.mask = mask
+
+    def __getitem__(self, key):
+        return bool(self.mask & self.BITS.get(key, 0))
+
+class InputLog:
+    # Binary session recording: header (magic, version, seed, simulation rate,
+    # step count, option flags), then one key-bitmask byte per fixed simulation
+    # step, then the final score and state hash for replay checks. The flags hold
+    # the gameplay options a replay has to match (mask collisions, formation moves).
+    MAGIC = b"SIRL"
+    VERSION = 4
+    HEADER = struct.Struct("<4sBQHIB")
+    FOOTER = struct.Struct("<I20s")
+    MASK_COLLISIONS = 1
+    FORMATION = 2
+
+    def __init__(self, seed, hz=60, mask_collisions=False, formation=False):
+        self.seed = seed
+        self.hz = hz
+        self.mask_collisions = mask_collisions
+        self.formation = formation
+        self.data = bytearray()
+        self.count = 0
+        self.score = 0
+        self.digest = bytes(20)
+
+    def __len__(self):
+        return self.count
+
+    def append(self, mask):
+        self.data.append(mask)
+        self.count += 1
+
+    def __iter__(self):
+        # (dt seconds, KeyMask, shoot_pressed) per recorded step
+        dt = 1.0 / self.hz
+        for mask in self.data:
+            yield dt, KeyMask(mask), bool(mask & SHOOT_BIT)
+
+    def finish(self, sim):
+        self.score = sim.player.target_score
+        self.digest = sim.state_hash()
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            flags = (self.MASK_COLLISIONS if self.mask_collisions else 0) | (self.FORMATION if self.formation else 0)
+            f.write(self.HEADER.pack(self.MAGIC, self.VERSION, self.seed, self.hz, self.count, flags))
+            f.write(self.data)
+            f.write(self.FOOTER.pack(self.score, self.digest))
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            raw = f.read()
+        magic, version, seed, hz, count, flags = cls.HEADER.unpack_from(raw)
+        if magic != cls.MAGIC or version != cls.VERSION:
+            raise ValueError(f"{path}: not an input log (or an unsupported version)")
+        log = cls(seed, hz, bool(flags & cls.MASK_COLLISIONS), bool(flags & cls.FORMATION))
+        start = cls.HEADER.size
+        end = start + count
+        log.data = bytearray(raw[start:end])
+        log.count = count
+        log.score, log.digest = cls.FOOTER.unpack_from(raw, end)
+        return log
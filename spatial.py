@@ -0,0 +1,69 @@
+import numpy as np
+
+# ---------------- SPATIAL HASH ----------------
+class SpatialHash:
+    # Uniform grid broadphase over boxes held in arrays (left, top, right, bottom):
+    # the rects are bucketed by every cell they overlap, and each query box is only
+    # tested against the rects in the cells it touches. Built from scratch per call,
+    # all in NumPy: the grid covers the rects' cells (query cells outside it are
+    # clamped onto its edge) and is bucketed with one counting sort.
+    # Small sets (at most linear_max query x rect pairs) skip the bucketing and test
+    # every pair in one array comparison, which is cheaper than hashing a handful of boxes.
+    def __init__(self, cell_size=64, linear_max=32768):
+        self.cell_size = cell_size
+        self.linear_max = linear_max
+
+    def span(self, left, top, right, bottom):
+        # First and last cell column/row each box overlaps
+        cs = self.cell_size
+        x0 = np.floor_divide(left, cs).astype(np.intp); y0 = np.floor_divide(top, cs).astype(np.intp)
+        x1 = np.floor_divide(np.maximum(right - 1, left), cs).astype(np.intp)
+        y1 = np.floor_divide(np.maximum(bottom - 1, top), cs).astype(np.intp)
+        return x0, y0, x1, y1
+
+    def cells(self, x0, y0, x1, y1, rows):
+        # (box index, cell index) for every cell each box overlaps, in box order
+        nx = x1 - x0 + 1
+        count = nx * (y1 - y0 + 1)
+        idx = np.repeat(np.arange(len(count)), count)
+        k = np.arange(len(idx)) - np.repeat(np.cumsum(count) - count, count)
+        nx = nx[idx]
+        return idx, (x0[idx] + k % nx) * rows + y0[idx] + k // nx
+
+    def pairs(self, q, r, qkey=None, rkey=None):
+        # (query rows, rect columns) of every overlapping pair of a query box and a
+        # rect, q and r being 4 x N and 4 x M left, top, right, bottom arrays; ordered
+        # by row, within a row the order depends on the path. With keys, only pairs
+        # where qkey[row] == rkey[col] count.
+        ql, qt, qr, qb = q
+        rl, rt, rr, rb = r
+        if len(ql) * len(rl) <= self.linear_max:
+            # Columns first: bullets are narrow and move up and down the screen, so
+            # few pairs overlap across and the rest of the test runs on those alone
+            rows, cols = np.nonzero((ql[:, None] < rr) & (qr[:, None] > rl))
+            hit = (qt[rows] < rb[cols]) & (qb[rows] > rt[cols])
+            if qkey is not None: hit &= qkey[rows] == rkey[cols]
+            return rows[hit], cols[hit]
+        # Bucket the rects by cell; start/count of each cell's run in col
+        x0, y0, x1, y1 = self.span(rl, rt, rr, rb)
+        gx, gy = x0.min(), y0.min()
+        w, h = x1.max() - gx + 1, y1.max() - gy + 1
+        x0 -= gx; y0 -= gy; x1 -= gx; y1 -= gy
+        col, cell = self.cells(x0, y0, x1, y1, h)
+        col = col[np.argsort(cell)]
+        count = np.bincount(cell, minlength=w * h)
+        start = np.cumsum(count) - count
+        # Every cell of every query box, clamped onto the grid
+        qx0, qy0, qx1, qy1 = self.span(ql, qt, qr, qb)
+        qx0 = np.minimum(np.maximum(qx0 - gx, 0), w - 1); qx1 = np.minimum(np.maximum(qx1 - gx, 0), w - 1)
+        qy0 = np.minimum(np.maximum(qy0 - gy, 0), h - 1); qy1 = np.minimum(np.maximum(qy1 - gy, 0), h - 1)
+        row, cell = self.cells(qx0, qy0, qx1, qy1, h)
+        n = count[cell]
+        take = np.repeat(start[cell] - (np.cumsum(n) - n), n) + np.arange(int(n.sum()))
+        rows = np.repeat(row, n); cols = col[take]; cell = np.repeat(cell, n)
+        # Narrowphase on the candidates. A pair sharing several cells is kept only in
+        # the cell holding the top-left corner of their overlap, so it comes out once.
+        hit = ((ql[rows] < rr[cols]) & (qr[rows] > rl[cols]) & (qt[rows] < rb[cols]) & (qb[rows] > rt[cols]) &
+               (np.maximum(qx0[rows], x0[cols]) * h + np.maximum(qy0[rows], y0[cols]) == cell))
+        if qkey is not None: hit &= qkey[rows] == rkey[cols]
+        return rows[hit], cols[hit]
@@ -0,0 +1,88 @@
+from collections import OrderedDict
+
+# ---------------- SURFACE CACHE ----------------
+class SurfaceCache:
+    # LRU cache for generated surfaces (glows, overlays, HUD shapes). Keys are plain
+    # tuples such as ("glow", size, color, alpha); build() runs only on a miss.
+    def __init__(self, max_items=256):
+        self.max_items = max_items
+        self.items = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.allocations = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.items)
+
+    def get(self, key, build):
+        surf = self.items.get(key)
+        if surf is not None:
+            self.hits += 1
+            self.items.move_to_end(key)
+            return surf
+        self.misses += 1
+        surf = self.items[key] = build()
+        self.allocations += 1
+        if len(self.items) > self.max_items:
+            self.items.popitem(last=False)
+            self.evictions += 1
+        return surf
+
+    def clear(self):
+        self.items.clear()
+
+    def reset_stats(self):
+        self.hits = self.misses = self.allocations = self.evictions = 0
+
+    def stats(self):
+        return {"items": len(self.items), "hits": self.hits, "misses": self.misses,
+                "allocations": self.allocations, "evictions": self.evictions}
+
+def alpha_bucket(alpha, step=8):
+    # Quantize an animated alpha so a pulsing glow maps onto a few cached surfaces
+    return max(0, min(255, int(alpha) // step * step))
+
+# ---------------- TEXT CACHE ----------------
+class TextCache(SurfaceCache):
+    # Rendered strings keyed by (font, text, color, antialias). Numbers that change
+    # every frame are composed from a per-font digit atlas instead of re-rendered.
+    DIGITS = "0123456789"
+
+    def render(self, font, text, color, antialias=True, alpha=None):
+        # Fading text passes alpha (through alpha_bucket) rather than calling
+        # set_alpha on the result, which would change the shared cached surface
+        if alpha is None:
+            return self.get((font, text, color, antialias), lambda: font.render(text, antialias, color))
+        def build():
+            surf = font.render(text, antialias, color)
+            surf.set_alpha(alpha)
+            return surf
+        return self.get((font, text, color, antialias, alpha), build)
+
+    def digit_atlas(self, font, color, antialias=True):
+        # One surface holding 0-9 plus the source rect of each glyph inside it
+        def build():
+            atlas = font.render(self.DIGITS, antialias, color)
+            h = atlas.get_height()
+            areas = []
+            for i in range(len(self.DIGITS)):
+                x0 = font.size(self.DIGITS[:i])[0]
+                x1 = font.size(self.DIGITS[:i+1])[0]
+                areas.append((x0, 0, x1 - x0, h))
+            return atlas, areas
+        return self.get((font, self.DIGITS, color, antialias, "atlas"), build)
+
+    def draw_digits(self, surf, font, text, color, center, antialias=True):
+        # Blit a digit string centered at center using the atlas; returns the drawn width
+        atlas, areas = self.digit_atlas(font, color, antialias)
+        glyphs = [areas[ord(ch) - 48] for ch in text]
+        width = sum(a[2] for a in glyphs)
+        x = center[0] - width // 2
+        y = center[1] - atlas.get_height() // 2
+        seq = []
+        for area in glyphs:
+            seq.append((atlas, (x, y), area))
+            x += area[2]
+        surf.blits(seq, False)
+        return width